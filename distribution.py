@@ -6,6 +6,7 @@ parser.add_argument("--iter", help="number of iterations", default = 5, type=int
 parser.add_argument("--thread", help="index of thread", default = -1, type=int)
 parser.add_argument("--max_thread", help="maximum number of thread", default = 1, type=int)
 parser.add_argument("--scal", action='store_true')
+parser.add_argument("--series", help="with --scal: decompose every snapshot series in one run", action='store_true')
 
 args = parser.parse_args()
 
@@ -89,6 +90,17 @@ for dataset in dataset_list:
                 configurations.append((algo, dataset, 0, 4))
 
 
+if (args.scal and args.series):
+    # One run per series: the largest snapshot is loaded once, the others are decomposed from its cores
+    for name in sorted(set(dataset.rsplit('_', 1)[0] for dataset in dataset_list)):
+        cmd = "python -W ignore -u run.py" + \
+              " --dataset " + name + \
+              " --series " + str(sum(1 for dataset in dataset_list if dataset.rsplit('_', 1)[0] == name)) + \
+              " --iterations " + str(iterations)
+        print(cmd)
+        os.system(cmd)
+    quit()
+
 # print(len(configurations))
 # distributing among threads
 for i, configuration in enumerate(configurations):
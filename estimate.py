@@ -0,0 +1,25 @@
+import argparse
+import pandas as pd
+from hgDecompose.utils import get_binary_file, peak_memory_usage
+from hgDecompose.autoselect import summary_statistics, estimate, fit
+
+# Predicted wall time and peak memory of decomposition algorithms, from summary statistics of the binary dataset file
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-a", "--algo", help="algorithms to estimate (default: every algorithm with a cost model)", nargs='*', default=None)
+parser.add_argument("--history", help="csv of logged runs (run.py --record) the cost models are fitted against", default="data/output/run_history.csv", type=str)
+parser.add_argument("--sample", help="number of vertices whose neighbourhood size is sampled", default=1000, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+# peak memory of this interpreter (imports included) stands for the baseline of a run, in MB
+baseline_memory = peak_memory_usage()
+# the binary file is built by streaming the text dataset file if needed, the hypergraph is never loaded
+stats = summary_statistics(get_binary_file(args.dataset), sample_size=args.sample)
+if args.verbose:
+    print({key: value for key, value in stats.items() if not isinstance(value, list)})
+
+result = estimate(stats, algos=args.algo, models=fit(args.history), baseline_memory=baseline_memory)
+result = pd.DataFrame([{'dataset': args.dataset, 'algo': algo, 'predicted time (s)': time, 'predicted peak memory (MB)': memory}
+                       for algo, (time, memory) in result.items()])
+print(result.sort_values('predicted time (s)').to_string(index=False))
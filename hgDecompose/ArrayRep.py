@@ -0,0 +1,372 @@
+import numpy as np
+
+class HypergraphA:
+    """
+    Hypergraph class with array-based (CSR) incidence, used by the bucket-queue peeling engines.
+    Vertices are relabelled to 0..n-1 (in sorted order of their labels) and hyperedges to 0..m-1.
+    The incidence is stored in two compressed arrays:
+        1) e_ptr, e_nodes => members of hyperedge i are e_nodes[e_ptr[i]:e_ptr[i+1]]
+        2) v_ptr, v_edges => hyperedges incident on vertex j are v_edges[v_ptr[j]:v_ptr[j+1]]
+    init_nodes[j] is the original label of vertex j and e_ids[i] is the original id of hyperedge i.
+    The neighbourhood CSR (nbr_ptr, nbr_idx) is built on demand by compute_nbr_csr().
+    """
+    def __init__(self, _edgedict=None):
+        self.init_nodes = []  # index => vertex label
+        self.node_index = {}  # vertex label => index
+        self.e_ids = []  # index => hyperedge id
+        self.e_ptr = np.zeros(1, dtype=np.int64)
+        self.e_nodes = np.zeros(0, dtype=np.int64)
+        self.v_ptr = np.zeros(1, dtype=np.int64)
+        self.v_edges = np.zeros(0, dtype=np.int64)
+        self.nbr_ptr = None
+        self.nbr_idx = None
+        self.init_nbrsize = None
+        self.lub = None
+        if _edgedict is None or len(_edgedict) == 0:  # Returns an empty Hypergraph
+            return
+
+        labels = set()
+        for e in _edgedict.values():
+            labels.update(e)
+        self.init_nodes = sorted(labels)
+        self.node_index = {v: j for j, v in enumerate(self.init_nodes)}
+
+        e_ptr = [0]
+        e_nodes = []
+        for e_id, e in _edgedict.items():
+            self.e_ids.append(e_id)
+            e_nodes.extend(self.node_index[v] for v in dict.fromkeys(e))
+            e_ptr.append(len(e_nodes))
+        self.e_ptr = np.array(e_ptr, dtype=np.int64)
+        self.e_nodes = np.array(e_nodes, dtype=np.int64)
+        self.compute_vertex_csr()
+
+    def compute_vertex_csr(self):
+        """ Builds the vertex => incident hyperedges CSR from the hyperedge => members CSR. """
+        n = self.get_N()
+        edge_of_slot = np.repeat(np.arange(self.get_M(), dtype=np.int64), np.diff(self.e_ptr))
+        order = np.argsort(self.e_nodes, kind='stable')
+        self.v_edges = edge_of_slot[order]
+        self.v_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.e_nodes, minlength=n), out=self.v_ptr[1:])
+
+    def compute_nbr_csr(self):
+        """
+        Builds the neighbourhood CSR: neighbours of vertex j are nbr_idx[nbr_ptr[j]:nbr_ptr[j+1]] (sorted).
+        Overall complexity: O(sum over v of sum over e incident on v of |e|)
+        """
+        if self.nbr_ptr is not None:
+            return
+        e_ptr = self.e_ptr.tolist()
+        e_nodes = self.e_nodes.tolist()
+        v_ptr = self.v_ptr.tolist()
+        v_edges = self.v_edges.tolist()
+        nbr_ptr = [0]
+        nbr_idx = []
+        for j in range(self.get_N()):
+            nbr_j = set()
+            for e in v_edges[v_ptr[j]:v_ptr[j + 1]]:
+                nbr_j.update(e_nodes[e_ptr[e]:e_ptr[e + 1]])
+            nbr_j.discard(j)
+            nbr_idx.extend(sorted(nbr_j))
+            nbr_ptr.append(len(nbr_idx))
+        self.nbr_ptr = np.array(nbr_ptr, dtype=np.int64)
+        self.nbr_idx = np.array(nbr_idx, dtype=np.int64)
+        self.init_nbrsize = np.diff(self.nbr_ptr)
+
+    def compute_local_upperbound(self):
+        """ Local upper bound (lub) of every vertex => core number of the vertex in the clique-expansion graph """
+        self.compute_nbr_csr()
+        core, _ = bucket_peel(self.nbr_ptr, self.nbr_idx, self.init_nbrsize)
+        self.lub = np.array(core, dtype=np.int64)
+
+    def get_lub_dict(self):
+        """ Return lub keyed by vertex label """
+        if self.lub is None:
+            self.compute_local_upperbound()
+        return dict(zip(self.init_nodes, self.lub.tolist()))
+
+    def get_N(self):
+        """ Return num of vertices """
+        return len(self.init_nodes)
+
+    def get_M(self):
+        """ Return num of edges """
+        return len(self.e_ids)
+
+    def get_edge_byindex(self, i):
+        """ Return members (vertex indices) of the i-th hyperedge """
+        return self.e_nodes[self.e_ptr[i]:self.e_ptr[i + 1]]
+
+    def inc_edge_indices(self, j):
+        """ Return the indices of hyperedges incident on the j-th vertex """
+        return self.v_edges[self.v_ptr[j]:self.v_ptr[j + 1]]
+
+    def edge_eid_iterator(self):
+        """ returns: iterator of (e_id, list of vertex labels) """
+        for i, e_id in enumerate(self.e_ids):
+            yield (e_id, [self.init_nodes[j] for j in self.get_edge_byindex(i)])
+
+    def init_node_iterator(self):
+        for v in self.init_nodes:
+            yield v
+
+def to_arrayhg(H):
+    """ Returns an array-based copy of H (Hypergraph, HypergraphL or HypergraphA). """
+    if isinstance(H, HypergraphA):
+        return H
+    if hasattr(H, 'e_id_to_edge'):  # HypergraphL
+        return HypergraphA(H.e_id_to_edge)
+    _edgedict = {}
+    for e_id, e in H.edge_eid_iterator():
+        _edgedict[e_id] = e
+    return HypergraphA(_edgedict)
+
+def connected_components(A):
+    """
+    Labels the connected components of A with an array union-find (union by size, path halving).
+    Returns: (comp, num_comp) => comp[j] in [0, num_comp) is the component of vertex j. 
+    Components are numbered in order of their smallest vertex index.
+    """
+    assert isinstance(A, HypergraphA)
+    n = A.get_N()
+    parent = list(range(n))
+    size = [1] * n
+    e_ptr = A.e_ptr.tolist()
+    e_nodes = A.e_nodes.tolist()
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i in range(A.get_M()):
+        if e_ptr[i + 1] - e_ptr[i] < 2:
+            continue
+        r = find(e_nodes[e_ptr[i]])
+        for j in e_nodes[e_ptr[i] + 1:e_ptr[i + 1]]:
+            s = find(j)
+            if r != s:
+                if size[r] < size[s]:
+                    r, s = s, r
+                parent[s] = r
+                size[r] += size[s]
+
+    comp = [0] * n
+    root_to_comp = {}
+    for j in range(n):
+        r = find(j)
+        if r not in root_to_comp:
+            root_to_comp[r] = len(root_to_comp)
+        comp[j] = root_to_comp[r]
+    return comp, len(root_to_comp)
+
+def component_edgedicts(A, comp, num_comp):
+    """ Splits the hyperedges of A by component. Returns a list of edge dictionaries (e_id => tuple of vertex labels) """
+    e_ptr = A.e_ptr.tolist()
+    e_nodes = A.e_nodes.tolist()
+    edgedicts = [{} for _ in range(num_comp)]
+    for i, e_id in enumerate(A.e_ids):
+        members = e_nodes[e_ptr[i]:e_ptr[i + 1]]
+        if len(members):
+            edgedicts[comp[members[0]]][e_id] = tuple(A.init_nodes[j] for j in members)
+    return edgedicts
+
+def save_arrayhg(A, fname):
+    """
+    Writes A in the binary dataset format (.npz, uncompressed => every array can be memory-mapped, see ExternalRep):
+    CSR incidence (both directions), neighbourhood CSR and lub.
+    Vertex labels are stored as strings (every text dataset is read as strings).
+    """
+    assert isinstance(A, HypergraphA)
+    if A.lub is None:
+        A.compute_local_upperbound()
+    np.savez(fname,
+             init_nodes = np.array(A.init_nodes, dtype=str),
+             e_ids = np.array(A.e_ids, dtype=np.int64),
+             e_ptr = A.e_ptr,
+             e_nodes = A.e_nodes,
+             v_ptr = A.v_ptr,
+             v_edges = A.v_edges,
+             nbr_ptr = A.nbr_ptr,
+             nbr_idx = A.nbr_idx,
+             lub = A.lub)
+
+def load_arrayhg(fname):
+    """ Reads a HypergraphA written by save_arrayhg() """
+    A = HypergraphA()
+    with np.load(fname) as data:
+        A.init_nodes = data['init_nodes'].tolist()
+        A.node_index = {v: j for j, v in enumerate(A.init_nodes)}
+        A.e_ids = data['e_ids'].tolist()
+        A.e_ptr = data['e_ptr']
+        A.e_nodes = data['e_nodes']
+        A.nbr_ptr = data['nbr_ptr']
+        A.nbr_idx = data['nbr_idx']
+        A.lub = data['lub']
+        if 'v_edges' in data.files:
+            A.v_ptr = data['v_ptr']
+            A.v_edges = data['v_edges']
+        else: # written before the vertex CSR was stored
+            A.compute_vertex_csr()
+    A.init_nbrsize = np.diff(A.nbr_ptr)
+    return A
+
+def degree_peel(e_ptr, e_nodes, v_ptr, v_edges):
+    """
+    Array bucket-queue peeling of the degree core (strongly induced deletion) over the incidence CSRs.
+    When v is removed at level k, every alive hyperedge incident on v is deleted and each of its unprocessed members u
+    moves from bucket deg[u] to max(deg[u] - 1, k).
+    Returns: (core, order) => core[j] is the peeling level of vertex j, order is the removal order.
+    Overall complexity: O(n + m + sum of |e|)
+    """
+    e_ptr = _aslist(e_ptr)
+    e_nodes = _aslist(e_nodes)
+    v_ptr = _aslist(v_ptr)
+    v_edges = _aslist(v_edges)
+    n = len(v_ptr) - 1
+    if n <= 0:
+        return [], []
+    deg = [v_ptr[j + 1] - v_ptr[j] for j in range(n)]
+    alive = [True] * (len(e_ptr) - 1)
+    md = max(deg)
+    bucket_start = [0] * (md + 1)
+    for d in deg:
+        bucket_start[d] += 1
+    start = 0
+    for d in range(md + 1):
+        num = bucket_start[d]
+        bucket_start[d] = start
+        start += num
+    pos = [0] * n
+    vert = [0] * n
+    for v in range(n):
+        pos[v] = bucket_start[deg[v]]
+        vert[pos[v]] = v
+        bucket_start[deg[v]] += 1
+    for d in range(md, 0, -1):
+        bucket_start[d] = bucket_start[d - 1]
+    bucket_start[0] = 0
+
+    for i in range(n):
+        v = vert[i]
+        deg_v = deg[v]
+        for e in v_edges[v_ptr[v]:v_ptr[v + 1]]:
+            if not alive[e]:
+                continue
+            alive[e] = False
+            for u in e_nodes[e_ptr[e]:e_ptr[e + 1]]:
+                deg_u = deg[u]
+                if u != v and deg_u > deg_v:
+                    pos_u = pos[u]
+                    pos_w = bucket_start[deg_u]
+                    w = vert[pos_w]
+                    if u != w:
+                        pos[u] = pos_w
+                        vert[pos_u] = w
+                        pos[w] = pos_u
+                        vert[pos_w] = u
+                    bucket_start[deg_u] += 1
+                    deg[u] = deg_u - 1
+    return deg, vert
+
+def local_upper_bound(nodes, nbr):
+    """
+    Local upper bound of every vertex computed by array bucket-queue peeling.
+    nodes: list of vertex labels, nbr: dict (vertex label => neighbours).
+    Returns: dict (vertex label => lub)
+    """
+    index = {v: j for j, v in enumerate(nodes)}
+    nbr_ptr = [0]
+    nbr_idx = []
+    for v in nodes:
+        nbr_idx.extend(index[u] for u in nbr[v])
+        nbr_ptr.append(len(nbr_idx))
+    deg = [nbr_ptr[j + 1] - nbr_ptr[j] for j in range(len(nodes))]
+    core, _ = bucket_peel(nbr_ptr, nbr_idx, deg)
+    return dict(zip(nodes, core))
+
+def degree_core(nodes, inc_dict, e_indices, e_nodes):
+    """
+    Degree core of every vertex computed by array bucket-queue peeling (degree_peel), straight from the incidence of a
+    Hypergraph: only the two incidence CSRs (vertex and hyperedge indices, 2 * sum of |e| ints) are built, not a
+    HypergraphA copy.
+    nodes: list of vertex labels, inc_dict: dict (vertex label => incident hyperedge ids),
+    e_indices: dict (hyperedge id => (start, end) of its members in e_nodes).
+    Returns: dict (vertex label => degree core)
+    """
+    index = {v: j for j, v in enumerate(nodes)}
+    e_index = {}
+    e_ptr = [0]
+    e_idx = []
+    for e_id, (start, end) in e_indices.items():
+        e_index[e_id] = len(e_index)
+        e_idx.extend(index[v] for v in dict.fromkeys(e_nodes[start:end]))
+        e_ptr.append(len(e_idx))
+    v_ptr = [0]
+    v_edges = []
+    for v in nodes:
+        v_edges.extend(e_index[e_id] for e_id in inc_dict[v])
+        v_ptr.append(len(v_edges))
+    core, _ = degree_peel(e_ptr, e_idx, v_ptr, v_edges)
+    return dict(zip(nodes, core))
+
+def _aslist(a):
+    """ numpy arrays are converted to python lists before element-wise loops (indexing them is much slower) """
+    if isinstance(a, np.ndarray):
+        return a.tolist()
+    return list(a)
+
+def bucket_peel(nbr_ptr, nbr_idx, deg):
+    """
+    Array bucket-queue peeling (Batagelj & Zaversnik) over a neighbourhood CSR.
+    When v is removed at level k, every unprocessed neighbour u moves from bucket deg[u] to max(deg[u] - 1, k).
+    deg: initial number of neighbours of every vertex.
+    Returns: (core, order) => core[j] is the peeling level of vertex j, order is the removal order.
+    Overall complexity: O(n + sum over v of |N(v)|)
+    """
+    nbr_ptr = _aslist(nbr_ptr)
+    nbr_idx = _aslist(nbr_idx)
+    deg = [int(d) for d in _aslist(deg)]
+    n = len(deg)
+    if n == 0:
+        return [], []
+    md = max(deg)
+    # bucket_start[d] => starting position of bucket d in vert
+    bucket_start = [0] * (md + 1)
+    for d in deg:
+        bucket_start[d] += 1
+    start = 0
+    for d in range(md + 1):
+        num = bucket_start[d]
+        bucket_start[d] = start
+        start += num
+    pos = [0] * n  # pos[v] => position of v in vert
+    vert = [0] * n  # vertices sorted by current bucket
+    for v in range(n):
+        pos[v] = bucket_start[deg[v]]
+        vert[pos[v]] = v
+        bucket_start[deg[v]] += 1
+    for d in range(md, 0, -1):
+        bucket_start[d] = bucket_start[d - 1]
+    bucket_start[0] = 0
+
+    for i in range(n):
+        v = vert[i]
+        deg_v = deg[v]
+        for u in nbr_idx[nbr_ptr[v]:nbr_ptr[v + 1]]:
+            deg_u = deg[u]
+            if deg_u > deg_v:
+                # swap u with the first vertex of its bucket, then shrink the bucket from the left
+                pos_u = pos[u]
+                pos_w = bucket_start[deg_u]
+                w = vert[pos_w]
+                if u != w:
+                    pos[u] = pos_w
+                    vert[pos_u] = w
+                    pos[w] = pos_u
+                    vert[pos_w] = u
+                bucket_start[deg_u] += 1
+                deg[u] = deg_u - 1
+    return deg, vert
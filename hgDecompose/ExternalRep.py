@@ -0,0 +1,251 @@
+import struct
+import zipfile
+import numpy as np
+
+def mmap_npz(fname):
+    """
+    Memory-maps every array of an uncompressed .npz file (np.savez): nothing is read until it is sliced.
+    Returns: dict (array name => np.memmap)
+    """
+    arrays = {}
+    with zipfile.ZipFile(fname) as archive, open(fname, 'rb') as f:
+        for info in archive.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED, fname + " is compressed"
+            # local file header: 30 bytes, then file name and extra field
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-len('.npy')]
+            if np.prod(shape) == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(fname, dtype=dtype, mode='r', offset=f.tell(), shape=shape, order='F' if fortran_order else 'C')
+    return arrays
+
+class HypergraphE:
+    """
+    Semi-external hypergraph used by the out-of-core local algorithm, backed by the binary dataset file (see
+    ArrayRep.save_arrayhg). Only the vertex state is kept in memory: labels, lub and llb (O(n)). The incidence CSRs and
+    the neighbourhood CSR stay on disk (memory-mapped) and are streamed in windows of at most buffer_size entries.
+    """
+    def __init__(self, fname, buffer_size = 1 << 20):
+        arrays = mmap_npz(fname)
+        if 'v_edges' not in arrays:
+            raise RuntimeError(fname + " has no vertex CSR: rebuild the binary dataset file")
+        self.fname = fname
+        self.buffer_size = buffer_size
+        self.e_ptr = np.asarray(arrays['e_ptr'])
+        self.e_nodes = np.asarray(arrays['e_nodes'])
+        self.v_ptr = np.asarray(arrays['v_ptr'])
+        self.v_edges = np.asarray(arrays['v_edges'])
+        self.nbr_ptr = np.asarray(arrays['nbr_ptr'])
+        self.nbr_idx = np.asarray(arrays['nbr_idx'])
+        self.init_nodes = arrays['init_nodes'].tolist()
+        self.lub = np.array(arrays['lub'], dtype=np.int64)
+        self.bytes_streamed = 0
+        self.compute_local_lowerbound()
+
+    def get_N(self):
+        return len(self.init_nodes)
+
+    def get_M(self):
+        return len(self.e_ptr) - 1
+
+    def windows(self, ptr, data):
+        """
+        Streams a CSR (ptr, data) in windows of at most buffer_size entries.
+        Yields (rows, offsets, values, sizes): values[offsets[i]:offsets[i+1]] belong to row rows[i], whose full length 
+        is sizes[i]. The first and last row of a window may be split across windows (partial rows).
+        """
+        n = len(ptr) - 1
+        total = int(ptr[n])
+        row = 0
+        for start in range(0, total, self.buffer_size):
+            end = min(total, start + self.buffer_size)
+            values = np.array(data[start:end])
+            self.bytes_streamed += values.nbytes
+            # rows overlapping [start, end)
+            row = int(np.searchsorted(ptr[row:n + 1], start, side='right')) - 1 + row
+            last = int(np.searchsorted(ptr[row:n + 1], end, side='left')) - 1 + row
+            bounds = np.array(ptr[row:last + 2], dtype=np.int64)
+            offsets = np.clip(bounds, start, end) - start
+            rows = np.arange(row, last + 1)
+            nonempty = offsets[1:] > offsets[:-1]
+            yield rows[nonempty], np.append(offsets[:-1][nonempty], end - start), values, np.diff(bounds)[nonempty]
+            row = last
+
+    def compute_local_lowerbound(self):
+        """ llb(v) = max(max |e| - 1 over e incident on v, glb), edges streamed in windows """
+        n = self.get_N()
+        self.glb = int(np.min(np.diff(self.nbr_ptr))) if n else 0
+        self.llb = np.zeros(n, dtype=np.int64)
+        for rows, offsets, values, sizes in self.windows(self.e_ptr, self.e_nodes):
+            np.maximum.at(self.llb, values, np.repeat(sizes, np.diff(offsets)) - 1)
+        self.llb = np.maximum(self.llb, self.glb)
+
+    def inc_edges(self, v):
+        edges = np.array(self.v_edges[self.v_ptr[v]:self.v_ptr[v + 1]])
+        self.bytes_streamed += edges.nbytes
+        return edges
+
+    def edge_members(self, e):
+        members = np.array(self.e_nodes[self.e_ptr[e]:self.e_ptr[e + 1]])
+        self.bytes_streamed += members.nbytes
+        return members
+
+    def edge_batches(self, edges):
+        """ 
+        Reads the members of hyperedges (indices) in batches of at most buffer_size entries (at least one hyperedge).
+        Yields (batch, offsets, members): members[offsets[i]:offsets[i+1]] are the members of hyperedge batch[i].
+        """
+        starts = self.e_ptr[edges]
+        lens = self.e_ptr[edges + 1] - starts
+        i = 0
+        while i < len(edges):
+            j = max(i + 1, int(np.searchsorted(np.cumsum(lens[i:]), self.buffer_size, side='right')) + i)
+            offsets = np.concatenate(([0], np.cumsum(lens[i:j])))
+            idx = np.repeat(starts[i:j] - offsets[:-1], lens[i:j]) + np.arange(offsets[-1])
+            members = self.e_nodes[idx]
+            self.bytes_streamed += members.nbytes
+            yield edges[i:j], offsets, members
+            i = j
+
+def build_binary_file(text_fname, fname, chunk_size = 1 << 20, tmp_dir = None):
+    """
+    Builds the binary dataset file fname (see ArrayRep.save_arrayhg) from the text dataset file text_fname (one
+    comma-separated hyperedge per line) without holding the hypergraph in memory:
+        1) first pass over the text file => vertex labels, #hyperedges and #incidences
+        2) second pass => hyperedge CSR, written to a memory-mapped file in chunks of chunk_size entries
+        3) vertex CSR and neighbourhood CSR, built from the memory-mapped CSRs for blocks of about chunk_size incidences
+        4) lub => core numbers of the clique-expansion graph, by h-index iterations streaming the neighbourhood CSR
+    The CSRs go through temporary files in tmp_dir (directory of fname by default) and are copied into the .npz in
+    buffered chunks. Peak memory: the vertex labels and O(n) vertex state, plus O(chunk_size) per step.
+    """
+    import os
+    import tempfile
+    labels = set()
+    m = 0
+    total = 0
+    with open(text_fname) as f:
+        for line in f:
+            edge = set(line[:-1].split(','))
+            labels.update(edge)
+            total += len(edge)
+            m += 1
+    init_nodes = sorted(labels)
+    del labels
+    node_index = {v: j for j, v in enumerate(init_nodes)}
+    n = len(init_nodes)
+
+    if tmp_dir is None:
+        tmp_dir = os.path.dirname(fname) or '.'
+    with tempfile.TemporaryDirectory(dir = tmp_dir) as tmp:
+        e_ptr = np.zeros(m + 1, dtype=np.int64)
+        e_nodes = np.lib.format.open_memmap(os.path.join(tmp, 'e_nodes.npy'), mode='w+', dtype=np.int64, shape=(total,))
+        buffer = []
+        written = 0
+        with open(text_fname) as f:
+            for idx, line in enumerate(f):
+                buffer.extend(node_index[v] for v in dict.fromkeys(line[:-1].split(',')))
+                e_ptr[idx + 1] = written + len(buffer)
+                if len(buffer) >= chunk_size:
+                    e_nodes[written:written + len(buffer)] = buffer
+                    written += len(buffer)
+                    buffer = []
+        e_nodes[written:written + len(buffer)] = buffer
+        del node_index, buffer
+
+        # vertex CSR: counting sort of the incidences by vertex, one chunk of hyperedge slots at a time
+        degree = np.zeros(n, dtype=np.int64)
+        for start in range(0, total, chunk_size):
+            degree += np.bincount(e_nodes[start:start + chunk_size], minlength=n)
+        v_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degree, out=v_ptr[1:])
+        v_edges = np.lib.format.open_memmap(os.path.join(tmp, 'v_edges.npy'), mode='w+', dtype=np.int64, shape=(total,))
+        cursor = v_ptr[:-1].copy()
+        for start in range(0, total, chunk_size):
+            nodes = np.asarray(e_nodes[start:start + chunk_size])
+            edges = np.searchsorted(e_ptr, np.arange(start, start + len(nodes)), side='right') - 1
+            order = np.argsort(nodes, kind='stable')
+            nodes, edges = nodes[order], edges[order]
+            first = np.searchsorted(nodes, nodes, side='left') # rank of every slot among the slots of its vertex
+            v_edges[cursor[nodes] + np.arange(len(nodes)) - first] = edges
+            cursor += np.bincount(nodes, minlength=n)
+        del degree, cursor
+
+        # neighbourhood CSR: blocks of vertices with about chunk_size member slots in their incident hyperedges
+        sizes = np.diff(e_ptr)
+        vol = np.zeros(n + 1, dtype=np.int64) # vol[j] => member slots of the hyperedges incident on vertices < j
+        for start in range(0, total, chunk_size):
+            slot_sizes = sizes[np.asarray(v_edges[start:start + chunk_size])]
+            owner = np.searchsorted(v_ptr, np.arange(start, start + len(slot_sizes)), side='right') - 1
+            vol[1:] += np.bincount(owner, weights=slot_sizes, minlength=n).astype(np.int64)
+        np.cumsum(vol, out=vol)
+        nbr_ptr = np.zeros(n + 1, dtype=np.int64)
+        nbr_file = os.path.join(tmp, 'nbr_idx.bin')
+        with open(nbr_file, 'wb') as out:
+            start = 0
+            while start < n:
+                end = min(n, max(start + 1, int(np.searchsorted(vol, vol[start] + chunk_size, side='right')) - 1))
+                edges = np.asarray(v_edges[v_ptr[start]:v_ptr[end]])
+                lens = sizes[edges]
+                slots = np.arange(int(lens.sum()), dtype=np.int64) + np.repeat(e_ptr[edges] - (np.cumsum(lens) - lens), lens)
+                owner = np.repeat(np.repeat(np.arange(start, end, dtype=np.int64), np.diff(v_ptr[start:end + 1])), lens)
+                pairs = np.unique(owner * n + np.asarray(e_nodes[slots]))
+                owner, nbr = pairs // n, pairs % n
+                keep = owner != nbr
+                owner, nbr = owner[keep], nbr[keep]
+                nbr_ptr[start + 1:end + 1] = nbr_ptr[start] + np.cumsum(np.bincount(owner - start, minlength=end - start))
+                out.write(nbr.tobytes())
+                start = end
+        nbr_idx = np.memmap(nbr_file, dtype=np.int64, mode='r', shape=(int(nbr_ptr[n]),)) if nbr_ptr[n] else np.zeros(0, dtype=np.int64)
+        lub = csr_core(nbr_ptr, nbr_idx, chunk_size)
+
+        np.savez(fname,
+                 init_nodes = np.array(init_nodes, dtype=str),
+                 e_ids = np.arange(m, dtype=np.int64),
+                 e_ptr = e_ptr,
+                 e_nodes = e_nodes,
+                 v_ptr = v_ptr,
+                 v_edges = v_edges,
+                 nbr_ptr = nbr_ptr,
+                 nbr_idx = nbr_idx,
+                 lub = lub)
+        del e_nodes, v_edges, nbr_idx
+
+def csr_core(ptr, idx, chunk_size = 1 << 20):
+    """
+    Core numbers of the graph given by a (possibly memory-mapped) neighbourhood CSR, by h-index iterations: starting
+    from the degrees, h(v) = min(h(v), h-index of the h values of its neighbours) until nothing changes. Rows are read
+    in blocks of about chunk_size entries and updated in place (later blocks see the new values).
+    """
+    n = len(ptr) - 1
+    h = np.diff(ptr).astype(np.int64)
+    changed = True
+    while changed:
+        changed = False
+        start = 0
+        while start < n:
+            end = min(n, max(start + 1, int(np.searchsorted(ptr, ptr[start] + chunk_size, side='right')) - 1))
+            lens = np.diff(ptr[start:end + 1])
+            if ptr[end] > ptr[start]:
+                rows = np.repeat(np.arange(end - start, dtype=np.int64), lens)
+                values = np.minimum(h[np.asarray(idx[ptr[start]:ptr[end]])], h[start + rows])
+                # sort every row in descending order: h-index = max over positions p (1-based) of min(value, p)
+                order = np.lexsort((-values, rows))
+                position = np.arange(len(values)) - np.repeat(np.cumsum(lens) - lens, lens) + 1
+                nonempty = lens > 0
+                hindex = np.zeros(end - start, dtype=np.int64)
+                hindex[nonempty] = np.maximum.reduceat(np.minimum(values[order], position), (np.cumsum(lens) - lens)[nonempty])
+                block = h[start:end]
+                if np.any(hindex < block):
+                    changed = True
+                    h[start:end] = np.minimum(block, hindex)
+            start = end
+    return h
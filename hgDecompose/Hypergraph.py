@@ -2,6 +2,7 @@ import math
 import itertools
 import random
 from typing import final 
+from hgDecompose.ArrayRep import local_upper_bound
 
 class Hypergraph:
     """ 
@@ -11,8 +12,8 @@ class Hypergraph:
     To support node-centric queries, we also maintain incidence dictionary inc_dict (key = v_ids, values = incident edge ids)
     """
 
-    def __init__(self, _edgedict=None):
-        
+    def __init__(self, _edgedict=None, lub=None):
+        """ lub: precomputed local upper bounds (e.g. read from the binary dataset file). """
         self.e_indices = {}  # (position, position+edge_size) of edge e in e_nodes list
         self.e_nodes = []  # flattened edge list
         self.inc_dict = {}  # key: nodeid, value = ids of incident edges (set)
@@ -22,10 +23,12 @@ class Hypergraph:
         self.init_nbr = {}
         self.init_eids = {}
         self.init_nodes = []
+        self.giant_threshold = None
+        self.giant_members = {}  # key: id of a giant hyperedge, value: set of its members
+        self.i = 0
         if _edgedict is None or len(_edgedict)==0:  # Returns an empty Hypergraph
             return
 
-        self.i = 0
         for e_id, e in _edgedict.items():
             _len = len(e)
             
@@ -46,8 +49,10 @@ class Hypergraph:
 
         self.init_nodes = sorted(self.init_nodes)
         
-        # self.compute_Bounds()
-        self.compute_Bounds2()
+        if lub is None:
+            self.compute_Bounds2()
+        else:
+            self.compute_Bounds(lub)
 
     def compute_Bounds2(self):
         """ Computes Local Upper Bound differently from compute_Bounds() """
@@ -97,44 +102,24 @@ class Hypergraph:
         self.sorted_ub_set.add(_min_llb - 1)
         self.sorted_ub_set = sorted(list(self.sorted_ub_set), reverse=True)
 
-    def compute_Bounds(self):
+    def compute_Bounds(self, lub=None):
+        """ 
+        Computes global bounds, local lower bound and the local upper bound. The local upper bound is the core number in the 
+        clique-expansion graph, computed by an array bucket-queue peel over the neighbourhood CSR (unless lub is given).
+        """
         # print('Global-local ub')
         # Computing global upper and lower bounds
         self.glb = math.inf
         self.gub = -math.inf
-        # Computing local lower bounds
-        # self.precomputedlb2 = {}
-        # # Computing local upper bounds
-        self.lub = {}
-        
-        # Auxiliary variables to assist computation of ub2
-        _inv_bucket = {}
-        _bucket = {}
-        self.sorted_ub_set = set() # || => upper bound for param_s
         for v in self.node_iterator():
             len_neighbors_v = self.init_nbrsize[v]
             self.glb = min(self.glb,len_neighbors_v)
             self.gub = max(self.gub, len_neighbors_v)
-            _inv_bucket[v] = len_neighbors_v
-            ## print(node, neighbors)
-            if len_neighbors_v not in _bucket:
-                _bucket[len_neighbors_v] = set()
-            _bucket[len_neighbors_v].add(v)
-        ## print('---- ',self.glb, self.gub)
-        for k in range(self.glb, self.gub+1):
-            while len(_bucket.get(k, [])) != 0:
-                v = _bucket[k].pop()
-                self.lub[v] = k
-                self.sorted_ub_set.add(k) # add computed local upper bound to ub_set
-                for u in self.init_nbr[v]:
-                    if u not in self.lub:
-                        max_value = max(_inv_bucket[u] - 1, k)
-                        _bucket[_inv_bucket[u]].remove(u)
-                        if(max_value not in _bucket):
-                            _bucket[max_value] = set()
-                        _bucket[max_value].add(u)
-                        _inv_bucket[u] = max_value
 
+        if lub is None:
+            lub = local_upper_bound(self.init_nodes, self.init_nbr)
+        self.lub = lub
+        self.sorted_ub_set = set(self.lub.values()) # || => upper bound for param_s
         
         self.llb = {}
         _min_llb = math.inf
@@ -148,8 +133,21 @@ class Hypergraph:
 
         self.sorted_ub_set.add(_min_llb - 1)
         self.sorted_ub_set = sorted(list(self.sorted_ub_set), reverse=True)
-        del _bucket
-        del _inv_bucket
+
+    def tighten_bounds(self, upper = {}, lower = {}):
+        """ 
+        Tightens lub and llb with externally known bounds (e.g. utils.warm_start_bounds) and recomputes sorted_ub_set. 
+        Vertices missing from upper/lower keep their bounds.
+        """
+        for v, k in upper.items():
+            if v in self.lub and k < self.lub[v]:
+                self.lub[v] = max(k, 0)
+        for v, k in lower.items():
+            if v in self.llb and k > self.llb[v]:
+                self.llb[v] = min(k, self.lub[v])
+        self.sorted_ub_set = set(self.lub.values())
+        self.sorted_ub_set.add(min(self.llb.values(), default = 0) - 1)
+        self.sorted_ub_set = sorted(list(self.sorted_ub_set), reverse=True)
 
     def get_init_nbr(self, v):
         return self.init_nbr[v]
@@ -276,9 +274,51 @@ class Hypergraph:
     def neighbors(self, v):
         return [u for u in self.neighbors_iterator(v)]
 
+    def set_giant_threshold(self, giant_threshold):
+        """ 
+        Hyperedges with at least giant_threshold members are treated as giant: their member sets are kept, and 
+        get_number_of_nbrs() counts their members arithmetically instead of enumerating them. None disables the engine.
+        Removing a vertex (removeV_transform) still visits every member of its giant edges, once per removal; only the
+        repeated neighbour counts are saved (see tests/test_giant.py --bench).
+        """
+        self.giant_threshold = giant_threshold
+        self.giant_members = {}
+        if giant_threshold is None:
+            return
+        for e_id, e in self.edge_eid_iterator():
+            if len(e) >= giant_threshold:
+                self.giant_members[e_id] = set(e)
+
     def get_number_of_nbrs(self, u):
+        if len(self.giant_members):
+            return self.get_number_of_nbrs_giant(u)
         return len(self.neighbors(u))
 
+    def get_number_of_nbrs_giant(self, u):
+        """ 
+        Neighbourhood size of u when u may lie in giant hyperedges. 
+        A hyperedge is alive only while all its members are (strongly induced sub-hypergraph), so the largest alive giant edge g of u 
+        contributes |g| - 1 neighbours at once, and only the members of the other edges of u are enumerated (and checked against g).
+        Overall complexity: O(sum of |e| over the incident edges of u except g), instead of O(|g| + ...)
+        """
+        incident_edges = self.inc_dict.get(u, None)
+        if not incident_edges:
+            return 0
+        g = None
+        for e_id in incident_edges:
+            if e_id in self.giant_members and (g is None or len(self.giant_members[e_id]) > len(self.giant_members[g])):
+                g = e_id
+        if g is None:
+            return len(self.neighbors(u))
+        g_members = self.giant_members[g]
+        outside_g = set()
+        for e_id in incident_edges:
+            if e_id != g:
+                for w in self.get_edge_byindex(e_id):
+                    if w not in g_members:
+                        outside_g.add(w)
+        return len(g_members) - 1 + len(outside_g)
+
     def neighbors_iterator(self, v):
         """ Returns the set of neighbours of v.
             implements a traversal from vertex v to each of its neighbours in contrast to set in neighbors(). 
@@ -522,6 +562,7 @@ class Hypergraph:
         e_nodes = []  # flattened edge list
         inc_dict = {}
         H.i = 0
+        vertex_set = set(vertex_list)
     
         # print('inc_dict: ',self.inc_dict.items())
         # print('e_indices: ',self.e_indices.items())
@@ -531,7 +572,7 @@ class Hypergraph:
             e = self.get_edge_byindex(e_id)
             flag = True 
             for u in e:
-                if u not in vertex_list:
+                if u not in vertex_set:
                     flag = False
                     break
             if flag:
@@ -552,6 +593,8 @@ class Hypergraph:
         H.e_nodes = e_nodes
         H.inc_dict = inc_dict
         H.e_indices = e_indices
+        H.giant_threshold = self.giant_threshold
+        H.giant_members = {e_id: self.giant_members[e_id] for e_id in e_indices if e_id in self.giant_members}
         return H
 
     def get_hnx_format(self):
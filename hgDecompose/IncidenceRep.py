@@ -1,7 +1,9 @@
 import math
+from hgDecompose.ArrayRep import local_upper_bound
 class HypergraphL:
     """ Hypergraph Class used by Local-core algorithm"""
-    def __init__(self, _edgedict=None):
+    def __init__(self, _edgedict=None, lub=None):
+        """ lub: precomputed local upper bounds (e.g. read from the binary dataset file). Computed if None. """
         self.inc_dict = {}  # key => node, value = List of incident hyperedge ids.
         self.e_id_to_edge = {} # key => hyperedge_id, value => List of vertices in a hyperedge
         self.init_nbr = {}  # key: node, value = List of Neighbours.
@@ -28,7 +30,7 @@ class HypergraphL:
         #         val = self.edge_min_hindex.get(e_id, math.inf)
         #         self.edge_min_hindex[e_id] = min(nbr_v, val)
 
-        self.compute_local_upperbound()
+        self.compute_local_upperbound(lub)
         self.edge_min_hindex = {} # key = edge_id, value => min (h_index of vertices in hyperedge edge_id)
         for v in self.init_nodes:
             lub_v = self.lub[v]
@@ -37,42 +39,23 @@ class HypergraphL:
                 self.edge_min_hindex[e_id] = min(lub_v, val)
         self.compute_local_lowerbound()
         
-    def compute_local_upperbound(self):
+    def compute_local_upperbound(self, lub=None):
+        """ 
+        Local upper bound => core number in the clique-expansion graph, computed by an array bucket-queue peel 
+        over the neighbourhood CSR. 
+        """
         # Computing global upper and lower bounds
         self.glb = math.inf
         self.gub = -math.inf
-        # Computing local lower bounds
-        self.lub = {}
-        
-        # Auxiliary variables to assist computation of ub2
-        _inv_bucket = {}
-        _bucket = {}
-        
-        # Bucket initialisations
         for v in self.init_nodes:
             len_neighbors_v = self.init_nbrsize[v]
             self.glb = min(self.glb,len_neighbors_v)
             self.gub = max(self.gub, len_neighbors_v)
-            _inv_bucket[v] = len_neighbors_v
-            if len_neighbors_v not in _bucket:
-                _bucket[len_neighbors_v] = set()
-            _bucket[len_neighbors_v].add(v)
         
-        # Week core-number computation
-        for k in range(self.glb, self.gub+1):
-            while len(_bucket.get(k, [])) != 0:
-                v = _bucket[k].pop()
-                self.lub[v] = k
-                for u in self.init_nbr[v]:
-                    if u not in self.lub:
-                        max_value = max(_inv_bucket[u] - 1, k)
-                        _bucket[_inv_bucket[u]].remove(u)
-                        if(max_value not in _bucket):
-                            _bucket[max_value] = set()
-                        _bucket[max_value].add(u)
-                        _inv_bucket[u] = max_value
-        del _bucket
-        del _inv_bucket
+        if lub is None:
+            self.lub = local_upper_bound(self.init_nodes, self.init_nbr)
+        else:
+            self.lub = lub
 
     def compute_local_lowerbound(self):
         """
@@ -98,6 +81,10 @@ class HypergraphL:
     def get_init_nbrlen(self, v):
         return self.init_nbrsize[v]
 
+    def nbrset_size(self, u, nbrset):
+        """ Size of a neighbourhood nbrset of u (u excluded) """
+        return len(nbrset)
+
     def iterate_inc_min_hindices(self, v):
         for e_id in self.inc_edgeId_iterator(v):
             yield self.get_min_hindex[e_id]
@@ -0,0 +1,249 @@
+import os
+import numpy as np
+import pandas as pd
+from hgDecompose.ArrayRep import connected_components
+from hgDecompose.ExternalRep import mmap_npz
+
+# Engines chosen by the auto algorithm (run.py algo names), and their per-component variants (par_component_core)
+engines = ['naive_nbr', 'opt_local_core', 'top_down']
+component_engines = {'naive_nbr': 'comp_naiveNBR', 'opt_local_core': 'comp_opt_local_core'}
+pool_overhead = 0.05 # seconds per worker process of the component variants
+
+# Cost model of every algorithm (run.py algo names): (time feature, seconds per unit), (memory feature, bytes per unit).
+# Time features (work of the engines, see engine_work):
+#     vol_deg => sum over v of vol(v) * deg(v), vol(v) = sum of |e| over e incident on v (peeling recounts)
+#     sq_iter => sum of vol(v) (= sum of |e|^2) times log2(2 + lub range) h-index iterations (local algorithms)
+#     top_down => vol_deg over the vertices with llb < lub, vol(v) over the others (settled by their bounds)
+#     sq => sum of |e|^2 (pairs of the clique expansion), n_inc => N * sum of |e| (one subgraph per peeled vertex)
+# Memory features (peak resident set size on top of the interpreter, including the hypergraph):
+#     nbr_inc => sum of |N(v)| + sum of |e| (neighbour sets and incidence dicts)
+#     sketch => N HyperLogLog hashes + sum of |e|, n => O(N) vertex state of the out-of-core algorithm
+# Defaults are medians measured on syn and random hypergraphs (up to 10000 vertices), memory as the growth of the peak
+# resident set size (utils.peak_memory_usage) as in the logged runs. fit() replaces them with the medians over the
+# logged runs.
+default_models = {
+    'naive_nbr': (('vol_deg', 2.4e-7), ('nbr_inc', 155.0)),
+    'improved_nbr': (('vol_deg', 2.2e-7), ('nbr_inc', 225.0)),
+    'improved_nbr_simple': (('vol_deg', 2.2e-7), ('nbr_inc', 225.0)),
+    'improved2_nbr': (('vol_deg', 7.8e-7), ('nbr_inc', 250.0)),
+    'top_down': (('top_down', 2.3e-6), ('nbr_inc', 245.0)),
+    'multi_core': (('vol_deg', 2.9e-7), ('nbr_inc', 230.0)),
+    'opt_local_core': (('sq_iter', 1.8e-6), ('nbr_inc', 170.0)),
+    'approx_local_core': (('sq_iter', 3.1e-6), ('sketch', 600.0)),
+    'external_local_core': (('sq_iter', 1.9e-6), ('n', 2000.0)),
+    'graph_core': (('sq', 4.4e-6), ('nbr_inc', 550.0)),
+    'naive_degree': (('n_inc', 2.3e-7), ('nbr_inc', 255.0)),
+}
+
+# Statistics the cost models are evaluated on, computed by both hg_statistics and summary_statistics and logged
+# with every run (log_run)
+model_statistics = ['N', 'M', 'incidences', 'sum sq edge size', 'sum nbrsize', 'lub range',
+                    'naive_nbr work', 'opt_local_core work', 'top_down work']
+
+def engine_work(vol, degree, llb, lub, iterations):
+    """ Work of every engine on every vertex, from vol(v), deg(v), llb, lub and the expected #h-index iterations """
+    naive = vol * degree.astype(np.float64)
+    return {'naive_nbr': naive, 'opt_local_core': vol * iterations, 'top_down': np.where(llb < lub, naive, vol)}
+
+def hg_statistics(A):
+    """
+    Cheap statistics of A (HypergraphA, neighbourhood sizes and lub as read from the binary dataset file), computed
+    with vectorised passes over its CSRs and one union-find pass for the components:
+        edge size distribution, degree skew, lub spread (and #vertices whose llb = lub), component count
+    and the model statistics, among which the estimated work of every engine summed over the vertices:
+        naive_nbr => vol(v) * deg(v) (the neighbourhood of v is recounted whenever one of its hyperedges dies)
+        opt_local_core => vol(v) per h-index iteration, with about log2(2 + lub range) iterations
+        top_down => as naive_nbr for the vertices with llb < lub, vol(v) for the others (settled by their bounds)
+    'component share' of an engine is the fraction of its work in the largest component.
+    """
+    if A.lub is None:
+        A.compute_local_upperbound()
+    n = A.get_N()
+    sizes = np.diff(A.e_ptr)
+    degree = np.diff(A.v_ptr)
+    nbrsize = np.asarray(A.init_nbrsize, dtype=np.int64)
+    lub = np.asarray(A.lub, dtype=np.int64)
+    inc_sizes = sizes[A.v_edges]
+    vol = np.diff(np.append(0, np.cumsum(inc_sizes))[A.v_ptr])
+    max_inc_size = np.zeros(n, dtype=np.int64)
+    has_edges = degree > 0
+    if np.any(has_edges):
+        max_inc_size[has_edges] = np.maximum.reduceat(inc_sizes, A.v_ptr[:-1][has_edges])
+    glb = int(nbrsize.min()) if n else 0
+    llb = np.maximum(max_inc_size - 1, glb)
+    comp, num_comp = connected_components(A)
+    comp = np.array(comp, dtype=np.int64)
+
+    stats = {'N': n, 'M': A.get_M(), 'incidences': int(sizes.sum()), 'sum sq edge size': int(np.sum(sizes.astype(np.int64) ** 2))}
+    stats['mean edge size'] = float(sizes.mean()) if len(sizes) else 0.0
+    stats['max edge size'] = int(sizes.max()) if len(sizes) else 0
+    stats['edge size cv'] = float(sizes.std() / sizes.mean()) if len(sizes) else 0.0
+    stats['mean degree'] = float(degree.mean()) if n else 0.0
+    stats['degree skew'] = float(degree.max() / degree.mean()) if n else 0.0
+    stats['mean nbrsize'] = float(nbrsize.mean()) if n else 0.0
+    stats['sum nbrsize'] = float(nbrsize.sum())
+    stats['num lub values'] = len(np.unique(lub))
+    stats['lub range'] = int(lub.max() - lub.min()) if n else 0
+    stats['tight fraction'] = float(np.mean(llb >= lub)) if n else 0.0
+    stats['num components'] = num_comp
+    stats['largest component'] = int(np.bincount(comp).max()) if n else 0
+
+    work = engine_work(vol, degree, llb, lub, np.log2(2 + stats['lub range']))
+    for engine in engines:
+        total = float(work[engine].sum())
+        stats[engine + ' work'] = total
+        per_comp = np.bincount(comp, weights=work[engine], minlength=num_comp) if n else np.zeros(1)
+        stats[engine + ' component share'] = min(1.0, float(per_comp.max() / total)) if total > 0 else 1.0
+    return stats
+
+def summary_statistics(fname, sample_size = 1000, seed = 0):
+    """
+    Summary statistics of the binary dataset file fname (see ArrayRep.save_arrayhg), read through memory maps:
+        incidence count (sum of |e|), sum of |e|^2, degree and edge-size histograms, work of every engine (as in
+        hg_statistics), lub range and the neighbourhood sizes of sample_size random vertices (sum of |N(v)| is
+        extrapolated)
+    Neither the hypergraph nor its neighbourhood CSR is loaded: only the pointer arrays, lub and the incidences of the
+    sampled vertices are read in full.
+    """
+    arrays = mmap_npz(fname)
+    e_ptr = np.asarray(arrays['e_ptr'])
+    v_ptr = np.asarray(arrays['v_ptr'])
+    v_edges = arrays['v_edges']
+    e_nodes = arrays['e_nodes']
+    n = len(v_ptr) - 1
+    sizes = np.diff(e_ptr)
+    degree = np.diff(v_ptr)
+
+    stats = {'N': n, 'M': len(sizes), 'incidences': int(sizes.sum()), 'sum sq edge size': int(np.sum(sizes.astype(np.int64) ** 2))}
+    stats['edge size histogram'] = np.bincount(sizes).tolist()
+    stats['degree histogram'] = np.bincount(degree).tolist()
+    lub = np.asarray(arrays['lub'], dtype=np.int64)
+    stats['lub range'] = int(lub.max() - lub.min()) if n else 0
+    glb = int(np.diff(np.asarray(arrays['nbr_ptr'])).min()) if n else 0
+    iterations = np.log2(2 + stats['lub range'])
+    # work of every engine, streamed over the vertex CSR in blocks of vertices
+    for engine in engines:
+        stats[engine + ' work'] = 0.0
+    block = 1 << 20
+    for start in range(0, n, block):
+        end = min(n, start + block)
+        inc_sizes = sizes[np.asarray(v_edges[v_ptr[start]:v_ptr[end]])]
+        ptr = v_ptr[start:end + 1] - v_ptr[start]
+        vol = np.diff(np.append(0, np.cumsum(inc_sizes))[ptr])
+        max_inc_size = np.zeros(end - start, dtype=np.int64)
+        has_edges = degree[start:end] > 0
+        if np.any(has_edges):
+            max_inc_size[has_edges] = np.maximum.reduceat(inc_sizes, ptr[:-1][has_edges])
+        llb = np.maximum(max_inc_size - 1, glb)
+        work = engine_work(vol, degree[start:end], llb, lub[start:end], iterations)
+        for engine in engines:
+            stats[engine + ' work'] += float(work[engine].sum())
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(n, size = min(n, sample_size), replace = False) if n else np.zeros(0, dtype=np.int64)
+    nbrsize = []
+    for j in sample:
+        members = [np.asarray(e_nodes[e_ptr[e]:e_ptr[e + 1]]) for e in np.asarray(v_edges[v_ptr[j]:v_ptr[j + 1]])]
+        nbrsize.append(len(np.unique(np.concatenate(members))) - 1 if len(members) else 0)
+    stats['sampled nbrsize'] = nbrsize
+    stats['sum nbrsize'] = float(np.mean(nbrsize) * n) if len(nbrsize) else 0.0
+    return stats
+
+def features(stats):
+    """ Value of every time and memory feature of the cost models, from the model statistics """
+    return {'vol_deg': stats['naive_nbr work'], 'sq_iter': stats['opt_local_core work'], 'top_down': stats['top_down work'],
+            'sq': stats['sum sq edge size'], 'n_inc': stats['N'] * stats['incidences'],
+            'nbr_inc': stats['sum nbrsize'] + stats['incidences'], 'sketch': stats['N'] + stats['incidences'],
+            'n': stats['N']}
+
+def estimate(stats, algos = None, models = None, baseline_memory = 0):
+    """
+    Predicted wall time (seconds) and peak memory (MB, on top of baseline_memory MB) of every algorithm.
+    Returns: dict (algo => (time, memory))
+    """
+    if models is None:
+        models = default_models
+    if algos is None:
+        algos = list(models)
+    value = features(stats)
+    result = {}
+    for algo in algos:
+        assert algo in models, algo + " has no cost model"
+        (time_feature, seconds), (memory_feature, num_bytes) = models[algo]
+        result[algo] = (seconds * value[time_feature], baseline_memory + num_bytes * value[memory_feature] / float(2 ** 20))
+    return result
+
+def fit(history, models = None, min_runs = 3):
+    """
+    Refits the cost per unit of every algorithm with at least min_runs logged runs: the median of execution time /
+    work and of memory / memory feature over its runs. Runs of a per-component variant count towards the time of its
+    engine (their work is that of the largest component), but not towards its memory.
+    history: DataFrame (or csv file written by log_run). The defaults are returned if the file does not exist.
+    """
+    if models is None:
+        models = default_models
+    models = dict(models)
+    if isinstance(history, str):
+        if not os.path.isfile(history):
+            return models
+        history = pd.read_csv(history)
+    for engine, runs in history.groupby('engine'):
+        if engine not in models or len(runs) < min_runs:
+            continue
+        (time_feature, seconds), (memory_feature, num_bytes) = models[engine]
+        ok = runs['work'].values > 0
+        if np.any(ok):
+            seconds = float(np.median(runs['execution time'].values[ok] / runs['work'].values[ok]))
+        runs = runs[(runs['algo'] == engine) & runs['memory'].notna()]
+        memory_value = np.array([features(row)[memory_feature] for _, row in runs.iterrows()], dtype=np.float64)
+        ok = memory_value > 0
+        if np.any(ok):
+            num_bytes = float(np.median(runs['memory'].values[ok] * float(2 ** 20) / memory_value[ok]))
+        models[engine] = ((time_feature, seconds), (memory_feature, num_bytes))
+    return models
+
+def select_algorithm(stats, num_threads = 1, models = None):
+    """
+    Chooses the engine with the least predicted time = seconds per unit of work * work. The per-component variants
+    are considered when there are several components and threads: their work is that of the largest component or an
+    even share of the threads, whichever is larger, plus the start-up of the worker processes.
+    Returns: (algo, predicted) => predicted: dict (algo => (predicted time, work))
+    """
+    if models is None:
+        models = default_models
+    value = features(stats)
+    predicted = {}
+    for engine in engines:
+        (time_feature, seconds), _ = models[engine]
+        work = value[time_feature]
+        predicted[engine] = (seconds * work, work)
+        if engine in component_engines and num_threads > 1 and stats.get('num components', 1) > 1:
+            work = work * max(stats[engine + ' component share'], 1.0 / num_threads)
+            predicted[component_engines[engine]] = (seconds * work + pool_overhead * num_threads, work)
+    algo = min(predicted, key = lambda a: predicted[a][0])
+    return algo, predicted
+
+def engine_of(algo):
+    """ Engine behind an algorithm chosen by select_algorithm """
+    for engine, comp_algo in component_engines.items():
+        if algo == comp_algo:
+            return engine
+    return algo
+
+def log_run(history_file, dataset, algo, execution_time, memory, stats, predicted = None):
+    """
+    Appends a run to history_file: its execution time, peak memory (MB on top of the interpreter, None if not
+    measured), work and model statistics. The work and predicted time are those of select_algorithm when predicted
+    is given, else the work is the time feature of the default cost model of algo.
+    """
+    engine = engine_of(algo)
+    if predicted is not None:
+        work, predicted_time = predicted[algo][1], predicted[algo][0]
+    else:
+        work = features(stats)[default_models[engine][0][0]] if engine in default_models else None
+        predicted_time = None
+    entry = {'dataset': dataset, 'algo': algo, 'engine': engine, 'work': work, 'predicted time': predicted_time,
+             'execution time': execution_time, 'memory': memory}
+    entry.update({key: stats[key] for key in model_statistics})
+    os.makedirs(os.path.dirname(history_file) or '.', exist_ok=True)
+    pd.DataFrame([entry]).to_csv(history_file, header=not os.path.isfile(history_file), index=False, mode='a')
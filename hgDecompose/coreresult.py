@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import HypergraphA, to_arrayhg
+
+def edge_coreness(H, core, kind = 'min'):
+    """
+    Coreness of every hyperedge of H (Hypergraph, HypergraphL or HypergraphA), computed with one segmented reduction
+    over the member CSR instead of a loop over the hyperedges:
+        kind = 'min' => min core over the members, i.e. the largest k whose k-core (strongly induced) keeps the hyperedge
+        kind = 'max' => max core over the members
+    Only a HypergraphA is reduced in place: a Hypergraph or HypergraphL is first copied to a CSR (ArrayRep.to_arrayhg),
+    which loops over its hyperedges in Python and holds a second copy of the incidences.
+    core: dict (vertex label => core number, vertices missing from it have core 0, e.g. vertices without neighbours
+    that the peeling algorithms do not assign), or an array indexed by vertex index if H is a HypergraphA.
+    Returns: (e_ids, coreness, sizes) => numpy arrays in the hyperedge order of H.
+    """
+    assert kind in ['min', 'max'], kind + " is not a coreness kind"
+    A = to_arrayhg(H)
+    if isinstance(core, np.ndarray):
+        assert isinstance(H, HypergraphA) and len(core) == A.get_N()
+        core_array = core.astype(np.int64, copy=False)
+    else:
+        core_array = np.array([core[v] if v in core else 0 for v in A.init_nodes], dtype=np.int64)
+    sizes = np.diff(A.e_ptr)
+    coreness = np.zeros(A.get_M(), dtype=np.int64)
+    nonempty = sizes > 0
+    if np.any(nonempty):
+        reduce = np.minimum if kind == 'min' else np.maximum
+        # empty hyperedges start where the next one starts, so dropping them keeps every segment intact
+        coreness[nonempty] = reduce.reduceat(core_array[A.e_nodes], A.e_ptr[:-1][nonempty])
+    e_ids = np.empty(A.get_M(), dtype=object)
+    e_ids[:] = A.e_ids
+    return e_ids, coreness, sizes
+
+def export_edge_coreness(fname, e_ids, coreness, sizes, chunk_size = 1 << 20):
+    """
+    Writes one (edge_id, coreness, size) row per hyperedge.
+        fname ending with .npz => uncompressed arrays (memory-mappable with ExternalRep.mmap_npz if the ids are numeric)
+        otherwise => csv with a header line, written in chunks of chunk_size rows
+    """
+    if fname.endswith('.npz'):
+        # numeric ids are stored as a numeric array rather than pickled objects
+        np.savez(fname, edge_id=np.asarray(list(e_ids)), coreness=coreness, size=sizes)
+        return
+    with open(fname, 'w') as f:
+        f.write("edge_id,coreness,size\n")
+        for start in range(0, len(e_ids), chunk_size):
+            pd.DataFrame({'edge_id': e_ids[start:start + chunk_size], 'coreness': coreness[start:start + chunk_size],
+                          'size': sizes[start:start + chunk_size]}).to_csv(f, header=False, index=False)
+
+def export_peel_order(fname, peel_order, peel_density, core):
+    """
+    Writes the removal (degeneracy) order of a peeling run, one (vertex, core, density) row per step: density is that
+    of the sub-hypergraph left before the removal (see HGDecompose.record_peel). Vertices without a core number
+    (no neighbours, recorded first) have core 0.
+        fname ending with .npz => uncompressed arrays, otherwise => csv with a header line
+    """
+    core_array = np.array([core[v] if v in core else 0 for v in peel_order], dtype=np.int64)
+    density = np.asarray(peel_density, dtype=np.float64)
+    if fname.endswith('.npz'):
+        np.savez(fname, vertex=np.asarray(list(peel_order)), core=core_array, density=density)
+        return
+    pd.DataFrame({'vertex': list(peel_order), 'core': core_array, 'density': density}).to_csv(fname, index=False)
+
+class CoreResult:
+    """
+    Indexed core decomposition: k-core extraction in time proportional to the output instead of scanning every vertex
+    and hyperedge of the core dict.
+        1) vertices sorted by decreasing core number, level_ptr[i] = #vertices with core >= levels[i] (levels decreasing),
+           so the vertices with core >= k are a prefix of vertices
+        2) hyperedges (if the hypergraph is given) sorted by decreasing minimum core over their members, so the hyperedges
+           of the k-core (strongly induced on the vertices with core >= k) are a prefix of e_ids as well
+    Read-only mapping vertex => core number (core[v], len, iteration, items), so it can replace HGDecompose.core.
+    """
+    def __init__(self, core, H = None):
+        self.core = core
+        order = sorted(core, key = lambda v: core[v], reverse = True)
+        self.vertices = np.empty(len(order), dtype=object)
+        self.vertices[:] = order
+        self.core_array = np.array([core[v] for v in order], dtype=np.int64)
+        # level boundaries: levels[i] is the i-th largest core number, level_ptr[i] the end of its block
+        if len(order):
+            change = np.flatnonzero(np.diff(self.core_array)) + 1
+            self.levels = self.core_array[np.append(change - 1, len(order) - 1)]
+            self.level_ptr = np.append(change, len(order))
+        else:
+            self.levels = np.zeros(0, dtype=np.int64)
+            self.level_ptr = np.zeros(0, dtype=np.int64)
+
+        self.e_ids = None
+        self.edge_min = None
+        self.H = H
+        if H is not None:
+            assert isinstance(H, (Hypergraph, HypergraphL))
+            e_ids, edge_min, _ = edge_coreness(H, core)
+            e_order = np.argsort(-edge_min, kind='stable')
+            self.e_ids = e_ids[e_order]
+            self.edge_min = edge_min[e_order]
+
+    def __getitem__(self, v):
+        return self.core[v]
+
+    def __contains__(self, v):
+        return v in self.core
+
+    def __len__(self):
+        return len(self.core)
+
+    def __iter__(self):
+        return iter(self.core)
+
+    def items(self):
+        return self.core.items()
+
+    def values(self):
+        return self.core.values()
+
+    def get_max_core(self):
+        return int(self.levels[0]) if len(self.levels) else None
+
+    def num_at_least(self, k):
+        """ #vertices with core >= k (binary search over the levels) """
+        i = int(np.searchsorted(-self.levels, -k, side='right'))
+        return int(self.level_ptr[i - 1]) if i > 0 else 0
+
+    def vertices_at_least(self, k):
+        """ Vertices with core >= k, i.e. the vertices of the k-core """
+        return self.vertices[:self.num_at_least(k)].tolist()
+
+    def vertices_with_core(self, k):
+        """ Vertices with core == k """
+        i = int(np.searchsorted(-self.levels, -k, side='left'))
+        if i == len(self.levels) or self.levels[i] != k:
+            return []
+        return self.vertices[(self.level_ptr[i - 1] if i > 0 else 0):self.level_ptr[i]].tolist()
+
+    def innermost(self):
+        """ (max core number, vertices of the innermost core) """
+        if len(self.levels) == 0:
+            return None, []
+        return int(self.levels[0]), self.vertices[:self.level_ptr[0]].tolist()
+
+    def histogram(self):
+        """ core number => #vertices, in decreasing order of core number """
+        sizes = np.diff(np.append(0, self.level_ptr))
+        return {int(k): int(c) for k, c in zip(self.levels, sizes)}
+
+    def edges_at_least(self, k):
+        """ Ids of the hyperedges of the k-core (every member has core >= k) """
+        assert self.edge_min is not None, "hypergraph not given"
+        return self.e_ids[:int(np.searchsorted(-self.edge_min, -k, side='right'))].tolist()
+
+    def kcore(self, k):
+        """ The k-core as a Hypergraph (strongly induced on the vertices with core >= k) """
+        assert self.H is not None, "hypergraph not given"
+        return Hypergraph({e_id: self.H.get_edge_byindex(e_id) for e_id in self.edges_at_least(k)})
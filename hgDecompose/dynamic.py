@@ -0,0 +1,221 @@
+import math
+from time import time
+from collections import deque
+from hgDecompose.Hypergraph import Hypergraph
+
+class DynamicCoreIndex:
+    """
+    Maintains the core number of every vertex of a Hypergraph under hyperedge insertions and deletions.
+    Let K = min core (before the update) over the members of the inserted/deleted hyperedge e. A vertex v can only change if
+        1) insertion: K <= core(v) <= K + |e| - 2 (its core rises by at most |e| - 1)
+        2) deletion: K - |e| + 2 <= core(v) <= K (its core drops by at most |e| - 1)
+    and v is connected to a member of e through such vertices that change as well. Only this region is recomputed:
+        1) insertion: the region is collected by BFS and peeled (every vertex outside it is removed at its known level)
+        2) deletion: the current cores are upper bounds, so they are lowered by the local h-index/core-correction step, 
+           starting at the members of e (a vertex is rechecked only when a neighbour drops)
+    Vertices without neighbours have core 0.
+    """
+    def __init__(self, H, core = None):
+        """ core: exact core numbers of H (if known), otherwise computed by peeling. """
+        assert isinstance(H, Hypergraph)
+        self.H = H
+        self.core = {}
+        self.last_touched = 0 # Number of vertices recomputed by the last update
+        self.last_update_time = 0
+        start_update_time = time()
+        if core is None:
+            self.peel_region(list(self.H.node_iterator()), 0)
+        else:
+            for v in self.H.node_iterator():
+                self.core[v] = core.get(v, 0)
+        self.last_update_time = time() - start_update_time
+
+    def insert_edge(self, e_id, e):
+        """ Inserts hyperedge e with id e_id and updates the core numbers. """
+        assert e_id not in self.H.e_indices, str(e_id) + " already exists"
+        start_update_time = time()
+        e = list(dict.fromkeys(e))
+        for v in e:
+            if v not in self.core: # new vertex
+                self.core[v] = 0
+        K = min(self.core[v] for v in e)
+        self.H.add_edge(e_id, e)
+        self.peel_region(self.rise_region(e, K, K + len(e) - 2, len(e) - 1), K)
+        self.last_update_time = time() - start_update_time
+
+    def delete_edge(self, e_id):
+        """ Deletes the hyperedge with id e_id and updates the core numbers. """
+        assert e_id in self.H.e_indices, str(e_id) + " does not exist"
+        start_update_time = time()
+        e = list(self.H.get_edge_byindex(e_id))
+        K = min(self.core[v] for v in e)
+        self.H.del_edge(e_id)
+        for v in e:
+            if v not in self.H.inc_dict: # v has no incident hyperedge anymore
+                del self.core[v]
+        # Cores only drop, so the current values are upper bounds: the update starts at the members of e and spreads lazily.
+        lb, ub = K - len(e) + 2, K
+        self.local_update([v for v in e if v in self.core and lb <= self.core[v] <= ub], lb, ub)
+        self.last_update_time = time() - start_update_time
+
+    def apply_batch(self, deletions = [], insertions = []):
+        """
+        Applies a batch of updates. deletions: hyperedge ids, insertions: list of (e_id, e).
+        Deletions only lower cores, so they are applied together and repaired in one lazy pass (only vertices with 
+        core <= max K can drop). Insertions only raise cores: a vertex can only rise if its core is at least min K, 
+        by at most D = sum of (|e| - 1) over the batch, so the rising region is collected and peeled once for the whole batch.
+        """
+        start_update_time = time()
+        touched = 0
+        if len(deletions):
+            ub = -math.inf
+            seeds = set()
+            for e_id in deletions:
+                e = list(self.H.get_edge_byindex(e_id))
+                ub = max(ub, min(self.core[v] for v in e))
+                self.H.del_edge(e_id)
+                seeds.update(e)
+            for v in seeds:
+                if v not in self.H.inc_dict:
+                    del self.core[v]
+            self.local_update([v for v in seeds if v in self.core and self.core[v] <= ub], 0, ub)
+            touched += self.last_touched
+
+        if len(insertions):
+            lb = math.inf
+            D = 0
+            members = {}
+            for e_id, e in insertions:
+                assert e_id not in self.H.e_indices, str(e_id) + " already exists"
+                e = list(dict.fromkeys(e))
+                for v in e:
+                    if v not in self.core: # new vertex
+                        self.core[v] = 0
+                    members[v] = True
+                lb = min(lb, min(self.core[v] for v in e))
+                D += len(e) - 1
+                self.H.add_edge(e_id, e)
+            self.peel_region(self.rise_region(list(members), lb, math.inf, D), lb)
+            touched += self.last_touched
+
+        self.last_touched = touched
+        self.last_update_time = time() - start_update_time
+
+    def can_rise(self, v, lb, ub, d):
+        """ 
+        False if v can not reach core(v) + 1 after an insertion: even when every vertex w with lb <= core(w) <= ub rises by d, 
+        v has less than core(v) + 1 neighbours through hyperedges whose members all reach core(v) + 1.
+        """
+        k = self.core[v] + 1
+        nbrs = set()
+        for e_id in self.H.inc_dict[v]:
+            e = self.H.get_edge_byindex(e_id)
+            if all(self.core[w] + (d if lb <= self.core[w] <= ub else 0) >= k for w in e):
+                nbrs.update(e)
+        return len(nbrs) - 1 >= k
+
+    def rise_region(self, e, lb, ub, d):
+        """ Vertices with lb <= core <= ub that can rise, connected to a member of e through such vertices (BFS). """
+        region = [v for v in e if lb <= self.core[v] <= ub and self.can_rise(v, lb, ub, d)]
+        visited = set(e)
+        queue = deque(region)
+        while queue:
+            v = queue.popleft()
+            for u in self.H.neighbors_iterator(v):
+                if u not in visited:
+                    visited.add(u)
+                    if lb <= self.core[u] <= ub and self.can_rise(u, lb, ub, d):
+                        region.append(u)
+                        queue.append(u)
+        return region
+
+    def peel_region(self, region, lb):
+        """
+        Recomputes the cores of region (none of them below lb) by peeling, every other core being exact. Only the hyperedges 
+        incident on region matter: their members outside region are removed exactly at their known level, members with 
+        core < lb before the first level. Overall complexity: proportional to the hyperedges incident on region.
+        """
+        in_region = set(region)
+        H = Hypergraph() # neighbourhoods and bounds are not needed, so hyperedges are only added
+        for v in region:
+            for e_id in self.H.inc_dict[v]:
+                if e_id not in H.e_indices:
+                    e = self.H.get_edge_byindex(e_id)
+                    if all(w in in_region or self.core[w] >= lb for w in e):
+                        H.add_edge(e_id, e)
+        outside = {} # key: level, value: vertices outside region removed at that level
+        for w in H.node_iterator():
+            if w not in in_region:
+                outside.setdefault(self.core[w], []).append(w)
+        num_neighbors = {}
+        bucket = {}
+        for v in region:
+            num_neighbors[v] = max(H.get_number_of_nbrs(v), lb)
+            bucket.setdefault(num_neighbors[v], set()).add(v)
+
+        def remove(v, k):
+            nbr_v = H.neighbors(v)
+            H.removeV_transform(v)
+            for u in nbr_v:
+                if u in num_neighbors:
+                    len_neighbors_u = max(H.get_number_of_nbrs(u), k)
+                    if len_neighbors_u != num_neighbors[u]:
+                        bucket[num_neighbors[u]].remove(u)
+                        num_neighbors[u] = len_neighbors_u
+                        bucket.setdefault(len_neighbors_u, set()).add(u)
+
+        k = lb
+        while len(num_neighbors):
+            for w in outside.get(k, []):
+                remove(w, k)
+            while len(bucket.get(k, [])):
+                v = bucket[k].pop()
+                del num_neighbors[v]
+                self.core[v] = k
+                remove(v, k)
+            k += 1
+        self.last_touched = len(in_region)
+
+    def local_value(self, v):
+        """
+        Local h-index of v with the core correction folded in:
+            max over t of min(t, |union of the hyperedges e incident on v with min(core(w): w in e) >= t| - 1).
+        Never exceeds core(v) and never goes below the true core number while every core value is an upper bound.
+        """
+        core = self.core
+        edges = []
+        for e_id in self.H.inc_dict.get(v, []):
+            e = self.H.get_edge_byindex(e_id)
+            edges.append((min(core[w] for w in e), e))
+        edges.sort(key = lambda x: x[0], reverse = True)
+        nbrs = set()
+        best = 0
+        for i, (t, e) in enumerate(edges):
+            if t <= best:
+                break
+            nbrs.update(e)
+            if i + 1 < len(edges) and edges[i + 1][0] == t:
+                continue
+            best = max(best, min(t, len(nbrs) - 1))
+        return best
+
+    def local_update(self, seeds, lb, ub):
+        """ 
+        Lowers core values (upper bounds) until they are exact, starting from seeds. Whenever a vertex drops, its neighbours 
+        with lb <= core <= ub are rechecked (no other vertex can change).
+        """
+        touched = set(seeds)
+        queue = deque(seeds)
+        queued = set(seeds)
+        while queue:
+            v = queue.popleft()
+            queued.remove(v)
+            k = self.local_value(v)
+            if k < self.core[v]:
+                self.core[v] = k
+                for u in self.H.neighbors_iterator(v):
+                    if u not in queued and (u in touched or lb <= self.core[u] <= ub):
+                        touched.add(u)
+                        queued.add(u)
+                        queue.append(u)
+        self.last_touched = len(touched)
@@ -0,0 +1,134 @@
+import pandas as pd
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+
+class CoreHierarchy:
+    """
+    Core hierarchy (k-core forest) of a hypergraph: every node is a connected component of a k-core, i.e. of the
+    strongly induced subhypergraph on the vertices with core >= k, and its parent is the component of a lower core
+    containing it. A node is created at level k for every component that changes at k: it gains vertices, hyperedges
+    or merges with another component. Components that do not change keep their node, so node k is the component for
+    every k' in (parent's k, k].
+    Built in one pass: vertices are added in decreasing core order and a hyperedge joins at level min core of its
+    members, merging the components of its members (union-find, union by size, path halving). Overall complexity:
+    O(sum of |e| * alpha(n) + n log n).
+    Every node records its core, size (#vertices), num_edges (#hyperedges of the strongly induced subhypergraph on it),
+    representatives (a few vertices whose core equals the node's core), parent and children. Roots are the connected
+    components of the hypergraph.
+    """
+    def __init__(self, H, core, num_representatives = 3):
+        assert isinstance(H, (Hypergraph, HypergraphL))
+        if isinstance(H, Hypergraph):
+            edges = H.edge_iterator()
+        else:
+            edges = H.init_edge_iterator()
+        self.node_core = []
+        self.size = []
+        self.num_edges = []
+        self.representatives = []
+        self.parent = []
+        self.children = []
+        self.vertex_node = {} # vertex => deepest node containing it (created at its core)
+
+        # vertices and hyperedges grouped by the level at which they join
+        vertices_at = {}
+        for v, k in core.items():
+            vertices_at.setdefault(k, []).append(v)
+        edges_at = {}
+        for e in edges:
+            e = [v for v in e if v in core]
+            if len(e):
+                edges_at.setdefault(min(core[v] for v in e), []).append(e)
+
+        uf_parent = {}
+        uf_size = {}
+        uf_edges = {}
+        node = {} # root => current node of its component
+
+        def find(x):
+            while uf_parent[x] != x:
+                uf_parent[x] = uf_parent[uf_parent[x]]
+                x = uf_parent[x]
+            return x
+
+        for k in sorted(set(vertices_at) | set(edges_at), reverse = True):
+            kids = {} # root => nodes of the higher levels merged into its component at this level
+            for v in vertices_at.get(k, []):
+                uf_parent[v] = v
+                uf_size[v] = 1
+                uf_edges[v] = 0
+                kids[v] = []
+            for e in edges_at.get(k, []):
+                r = find(e[0])
+                if r not in kids:
+                    kids[r] = [node[r]]
+                for u in e[1:]:
+                    s = find(u)
+                    if s == r:
+                        continue
+                    if s not in kids:
+                        kids[s] = [node[s]]
+                    if uf_size[r] < uf_size[s]:
+                        r, s = s, r
+                    uf_parent[s] = r
+                    uf_size[r] += uf_size[s]
+                    uf_edges[r] += uf_edges[s]
+                    if len(kids[r]) < len(kids[s]):
+                        kids[r], kids[s] = kids[s], kids[r]
+                    kids[r].extend(kids.pop(s))
+                uf_edges[r] += 1
+
+            # one new node per changed component
+            for r, merged in kids.items():
+                x = len(self.node_core)
+                self.node_core.append(k)
+                self.size.append(uf_size[r])
+                self.num_edges.append(uf_edges[r])
+                self.representatives.append([])
+                self.parent.append(None)
+                self.children.append(merged)
+                for y in merged:
+                    self.parent[y] = x
+                node[r] = x
+            for v in vertices_at.get(k, []):
+                x = node[find(v)]
+                self.vertex_node[v] = x
+                if len(self.representatives[x]) < num_representatives:
+                    self.representatives[x].append(v)
+
+        self.roots = [x for x in range(len(self.node_core)) if self.parent[x] is None]
+
+    def get_num_nodes(self):
+        return len(self.node_core)
+
+    def node_of(self, v, k = None):
+        """ Node of the component of the k-core containing v (k = None => core(v), the innermost one), None if k > core(v) """
+        x = self.vertex_node[v]
+        if k is None:
+            return x
+        if k > self.node_core[x]:
+            return None
+        while self.parent[x] is not None and self.node_core[self.parent[x]] >= k:
+            x = self.parent[x]
+        return x
+
+    def members(self, x):
+        """ Vertices of node x (O(n)) """
+        node_set = set(self.subtree(x))
+        return [v for v, y in self.vertex_node.items() if y in node_set]
+
+    def subtree(self, x):
+        """ Nodes in the subtree of node x """
+        result = []
+        stack = [x]
+        while stack:
+            y = stack.pop()
+            result.append(y)
+            stack.extend(self.children[y])
+        return result
+
+    def to_dataframe(self):
+        """ One row per node: node, core, size, num_edges, parent (-1 for roots), representatives """
+        return pd.DataFrame({'node': list(range(self.get_num_nodes())), 'core': self.node_core, 'size': self.size,
+                             'num_edges': self.num_edges, 'parent': [-1 if y is None else y for y in self.parent],
+                             'representatives': self.representatives})
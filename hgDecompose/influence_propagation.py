@@ -242,7 +242,8 @@ def run_intervention_exp2_explain_splen_prev(name, verbose = False):
     save_dict(result,'data/output/'+name+'_sp3.pkl')
 
 
-def run_intervention_exp(H, core, p = 0.5, verbose = False):
+def run_intervention_exp(H, core, p = 0.5, verbose = False, edge_core = None):
+    """ edge_core: optional (e_ids, min coreness, sizes) arrays (see coreresult.edge_coreness) to select the candidate hyperedges """
     # print(core)
     # deleted_ids = [2693,2804,3865,1547,2102,2960,2537, 3446, 2120, 2673]
     max_core_number = -1
@@ -261,7 +262,12 @@ def run_intervention_exp(H, core, p = 0.5, verbose = False):
     all_nodes = H.nodes()
     result = {}
     # print(all_nodes)
-    strongly_induced_eids = H.get_stronglyinduced_edgeIds(nodes_with_max_core)
+    if edge_core is None:
+        strongly_induced_eids = H.get_stronglyinduced_edgeIds(nodes_with_max_core)
+    else:
+        # hyperedges of the innermost core: min coreness of the members equals the max core number
+        e_ids, coreness, _ = edge_core
+        strongly_induced_eids = e_ids[coreness == max_core_number].tolist()
     if verbose:
         print('# potential edges to delete: ',len(strongly_induced_eids))
     # # for eid in ['nill'] +  strongly_induced_eids:
@@ -3,7 +3,7 @@ import math
 from hgDecompose.Hypergraph import Hypergraph
 from copy import deepcopy
 from multiprocessing import Pool
-from hgDecompose.utils import operator_H, par_operator_H
+from hgDecompose.utils import operator_H, par_operator_H, warm_start_bounds
 from hgDecompose.heapdict import heapdict
 import pandas as pd
 class GrDecompose():
@@ -534,11 +534,16 @@ class HDecompose():
                             print(bucket)
                             print()
 
-    def top_down(self, H, s = 1, verbose = True):
+    def top_down(self, H, s = 1, verbose = True, prior_core = None, deleted = [], inserted = []):
         """ 
         This is not-so-efficient, yet correct implementation of a top-down algorithm.        
+        Warm start: prior_core => core numbers of a previous version of H, which differs from H by the hyperedges deleted 
+        and inserted (see utils.edge_diff). lub/llb are tightened with utils.warm_start_bounds before the intervals are 
+        generated, so fewer and smaller intervals are peeled.
         """
         start_execution_time = time()
+        if prior_core is not None:
+            H.tighten_bounds(*warm_start_bounds(prior_core, deleted, inserted))
         llb = H.llb
         lub = H.lub
 
@@ -572,4 +577,61 @@ class HDecompose():
         if(verbose):
             print("\n\nOutput")
             print(self.core)
-        self.execution_time = time() - start_execution_time
\ No newline at end of file
+        self.execution_time = time() - start_execution_time
+
+    def cores_at_least(self, H, threshold, verbose = True):
+        """ 
+        Core numbers of only those vertices with core number >= threshold, without a full decomposition. 
+        Vertices with lub < threshold can not reach the threshold and are discarded, the rest is peeled as one top-down 
+        interval [threshold, max lub].
+        Returns {vertex: core number}.
+        """
+        start_execution_time = time()
+        self.top_interval_core(H, threshold, H.sorted_ub_set[0], verbose)
+        result = {}
+        for v, k in self.core.items():
+            if k >= threshold:
+                result[v] = k
+        if(verbose):
+            print("\n\nOutput")
+            print(result)
+        self.execution_time = time() - start_execution_time
+        return result
+
+    def innermost_cores(self, H, k = 1, s = 1, verbose = True):
+        """ 
+        Top-k innermost cores, without a full decomposition. Intervals over the distinct lub values are processed from 
+        the highest, doubling the number of values per interval (starting at s) until k distinct core numbers are found: 
+        every vertex with core number >= lower is known after interval [lower, upper]. The maximum core number is at 
+        least max llb, so the intervals never go below max llb before the first core number is found.
+        Returns [(core number, [vertices])] in decreasing order of core number (at most k entries).
+        """
+        start_execution_time = time()
+        max_llb = max(H.llb.values(), default = 1)
+        sorted_ub_set = sorted(set(H.sorted_ub_set) | {max_llb - 1}, reverse = True)
+        llb_index = sorted_ub_set.index(max_llb - 1)
+        i = 0
+        while i < len(sorted_ub_set) - 1 and len(set(self.core.values())) < k:
+            j = min(i + s, len(sorted_ub_set) - 1)
+            if i < llb_index and len(self.core) == 0:
+                j = min(j, llb_index)
+            self.top_interval_core(H, sorted_ub_set[j] + 1, sorted_ub_set[i], verbose)
+            i = j
+            s *= 2
+        members = {}
+        for v, c in self.core.items():
+            members.setdefault(c, []).append(v)
+        result = [(c, members[c]) for c in sorted(members, reverse = True)[:k]]
+        if(verbose):
+            print("\n\nOutput")
+            print(result)
+        self.execution_time = time() - start_execution_time
+        return result
+
+    def top_interval_core(self, H, lower, upper, verbose):
+        """ Assigns the core numbers in [lower, upper], given that every core number > upper is already known. """
+        if(verbose):
+            print("Inverval [%d,%d]"%(lower, upper))
+        V_kmin = [u for u in H.init_node_iterator() if H.lub[u] >= lower]
+        H_kmin = H.strong_subgraph(V_kmin)
+        self.Core_decomp2(H_kmin, V_kmin, lower, upper, {}, {}, {}, verbose)
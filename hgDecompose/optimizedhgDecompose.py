@@ -2,13 +2,32 @@ from time import time
 import math
 from hgDecompose.Hypergraph import Hypergraph
 from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import HypergraphA, to_arrayhg, bucket_peel, degree_core, local_upper_bound, connected_components, component_edgedicts
+from hgDecompose.twins import compress_twins, twin_algos
+from hgDecompose.sketch import HLLSketches
+from hgDecompose.ExternalRep import HypergraphE
+from hgDecompose.partitioned import partition_vertices, partition_edgedicts
+from hgDecompose.dynamic import DynamicCoreIndex
+from hgDecompose.coreresult import CoreResult, edge_coreness
 from copy import deepcopy
-from multiprocessing import Pool
-from hgDecompose.utils import operator_H, par_operator_H
+from collections import deque
+from multiprocessing import Pool, Process, Queue
+from hgDecompose.utils import operator_H, par_operator_H, warm_start_bounds
 from hgDecompose.heapdict import heapdict
 import pandas as pd
+import numpy as np
+import pickle
+import os
 # from tests.verify_kcore import *
 
+# Algorithms that can be run per connected component (par_component_core) => hypergraph class they expect.
+component_algos = {
+    'naiveNBR': Hypergraph,
+    'improvedNBR_simplified': Hypergraph,
+    'bipartitedist2core': Hypergraph,
+    'opt_local_core': HypergraphL
+}
+
 class HGDecompose():
     def __init__(self):
         # self.bucket = {}
@@ -34,9 +53,50 @@ class HGDecompose():
         self.core_correctionvol_n = [] #  core_corrections volume per iteration => Ammount of core_correction done. => Relation with runtime
         self.core_correction_volume = 0 # For core_correction volume vs dataset plot
         self.reduction_hhat_n = [] # [ hhat^{n-1} - hhat^{n}, for n \in [1, tau] ] => Convergence plot.
+        self.checkpoint_time = 0 # Time spent writing checkpoints (not part of execution_time)
+        self.num_checkpoints = 0
+        self.peel_order = [] # removal order of the peeling engines (record_order = True)
+        self.peel_density = [] # peel_density[i] => #hyperedges / #vertices of the sub-hypergraph on peel_order[i:]
 
     def preprocess(self):
         pass
+
+    def save_checkpoint(self, filename, state):
+        """ Writes state atomically (temporary file, then rename), time spent is added to checkpoint_time. """
+        start_checkpoint_time = time()
+        with open(filename + ".tmp", 'wb') as handle:
+            pickle.dump(state, handle, protocol= 4)
+        os.replace(filename + ".tmp", filename)
+        self.checkpoint_time += time() - start_checkpoint_time
+        self.num_checkpoints += 1
+
+    def resume(self, H, checkpoint, checkpoint_interval = 600, verbose = True):
+        """ 
+        Continues the run that wrote the file checkpoint (opt_local_core or improved2NBR) on the same hypergraph H, 
+        writing further checkpoints to the same file. 
+        """
+        with open(checkpoint, 'rb') as handle:
+            state = pickle.load(handle)
+        if state['algo'] == 'opt_local_core':
+            assert state['N'] == len(H.init_nodes) and state['M'] == len(H.edge_min_hindex), "checkpoint was written for another hypergraph"
+            self.opt_local_core(H, verbose = verbose, checkpoint = checkpoint, checkpoint_interval = checkpoint_interval, resume_from = state)
+        elif state['algo'] == 'improved2NBR':
+            self.improved2NBR(H, s = state['s'], verbose = verbose, checkpoint = checkpoint, checkpoint_interval = checkpoint_interval, resume_from = state)
+        else:
+            raise RuntimeError(state['algo'] + " can not be resumed")
+
+    def get_result(self, H = None):
+        """ Indexed view of the computed core numbers (see coreresult.CoreResult), hyperedge index built if H is given. """
+        return CoreResult(self.core, H)
+
+    def get_edge_coreness(self, H, kind = 'min'):
+        """ 
+        Coreness of every hyperedge of H from the computed core numbers (see coreresult.edge_coreness). H must still hold
+        all hyperedges, i.e. not be the copy consumed by a peeling algorithm.
+        Returns: (e_ids, coreness, sizes) numpy arrays, also kept as self.edge_core.
+        """
+        self.edge_core = edge_coreness(H, self.core, kind)
+        return self.edge_core
     
     def LLCSAT(self, H, u, core_u, core_dict):
         nbrhood_u_plus = set()
@@ -360,16 +420,25 @@ class HGDecompose():
                 Nplus = Nplus.union(edge)
         if len(Nplus):
             Nplus.remove(u)
-            if len(Nplus) >= core_u: 
+            if H.nbrset_size(u, Nplus) >= core_u: 
                 return True
             else:
                 return False
         else:
             return False
 
-    def opt_local_core(self, H, verbose = True, store_core_information = False, filename=None, info_dic = {}):
+    def opt_local_core(self, H, verbose = True, store_core_information = False, filename=None, info_dic = {}, prior_core = None, deleted = [], inserted = [], time_budget = None, max_iterations = None, checkpoint = None, checkpoint_interval = 600, resume_from = None):
         """ 
         More efficient local core computation: The times reported in the paper comes from this implementation.
+        Warm start: prior_core => core numbers of a previous version of H, which differs from H by the hyperedges deleted 
+        and inserted (see utils.edge_diff). Initial values are capped by the upper bounds of utils.warm_start_bounds, and 
+        vertices at their lower bound are final (skipped).
+        Budget: stops after time_budget seconds or max_iterations iterations (converged => False), core then holds upper 
+        bounds (see anytime_local_core).
+        Checkpoint: every checkpoint_interval seconds (at the end of an iteration) the state is written to the file 
+        checkpoint: current estimates, edge minima, final vertices, iteration counter. resume_from => such a state (see 
+        resume), the run continues from it to the same result. Checkpoint time is reported in checkpoint_time and is not 
+        part of execution_time.
         """
         assert isinstance(H, HypergraphL)
 
@@ -377,12 +446,29 @@ class HGDecompose():
         total_store_time = 0
         total_store_time0 = 0
         start_init_time = time()
+        upper, lower = {}, {}
+        if prior_core is not None:
+            upper, lower = warm_start_bounds(prior_core, deleted, inserted)
         # dirty = heapdict()
         for node in H.init_node_iterator():
             len_neighbors = H.get_init_nbrlen(node)
-            self.core[node] = len_neighbors
+            self.core[node] = min(len_neighbors, upper.get(node, len_neighbors))
+            if self.core[node] < H.lub[node]:
+                H.update_min_hindex(node, self.core[node])
             # dirty[node] = len_neighbors
             # num_nodes += 1
+        final = set(node for node in lower if node in self.core and self.core[node] <= lower[node])
+        k = 0
+        if resume_from is not None:
+            for node, value in zip(H.init_nodes, resume_from['core'].tolist()):
+                self.core[node] = value
+            for e_id, value in zip(list(H.edge_min_hindex), resume_from['edge_min'].tolist()):
+                H.edge_min_hindex[e_id] = value
+            final = set(resume_from['final'])
+            k = resume_from['iteration']
+            self.core_correctionvol_n = list(resume_from['core_correctionvol_n'])
+            self.reduction_hhat_n = list(resume_from['reduction_hhat_n'])
+        last_checkpoint_time = time()
         self.init_time = time() - start_init_time  
         if(verbose):
             print("Init core")
@@ -406,7 +492,6 @@ class HGDecompose():
             total_store_time0 += time() - start_store_time
         # Main loop
         start_loop_time = time()
-        k = 0
         while True:
             hn_1_minus_hn = 0 
             hn_minus_hhatn = 0
@@ -415,6 +500,8 @@ class HGDecompose():
             flag = True
             start_inner_time = time()
             for node in H.init_node_iterator():
+                if node in final:
+                    continue
                 H_value = operator_H([self.core[j] for j in H.init_nbr_iterator(node)])
                 if H_value < self.core[node]:
                     hn_1_minus_hn += (self.core[node] - H_value)
@@ -443,6 +530,8 @@ class HGDecompose():
             # dirty = dirty2
             # hhatn = {}
             for node in H.init_node_iterator():
+                if node in final:
+                    continue
                 # if not self.LLCSAT(H, node, self.core[node], self.core):
                 if not self.opt_LCCSAT(H, node, self.core[node]):   
                     flag = False
@@ -487,8 +576,17 @@ class HGDecompose():
 
                 total_store_time += time() - start_store_time
             
+            if checkpoint is not None and not flag and time() - last_checkpoint_time >= checkpoint_interval:
+                self.save_checkpoint(checkpoint, {'algo': 'opt_local_core', 'N': len(H.init_nodes), 'M': len(H.edge_min_hindex), 
+                    'iteration': k, 'core': np.array([self.core[node] for node in H.init_nodes], dtype=np.int64),
+                    'edge_min': np.array(list(H.edge_min_hindex.values()), dtype=np.int64), 'final': list(final),
+                    'core_correctionvol_n': self.core_correctionvol_n, 'reduction_hhat_n': self.reduction_hhat_n})
+                last_checkpoint_time = time()
+
             if flag:
                 break
+            if (max_iterations is not None and k >= max_iterations) or (time_budget is not None and time() - start_execution_time >= time_budget):
+                break
 
         self.loop_time = time() - start_loop_time
         self.execution_time = time() - start_execution_time
@@ -499,76 +597,444 @@ class HGDecompose():
             self.loop_time -= total_store_time
             self.execution_time -= total_store_time
             self.execution_time -= total_store_time0
+        self.loop_time -= self.checkpoint_time
+        self.execution_time -= self.checkpoint_time
         self.core_correction_volume = sum(self.core_correctionvol_n)
         self.max_n = k
+        self.converged = flag
         # print('opt_local_core: ', k)
         if (verbose):
             print("\n\nOutput")
             print(self.core)
 
-    def bipartitedist2core(self, H, verbose = True):
-        
-        H.initBiparite()
-        _node_to_num_neighbors = {}
-        bucket = {}
-        num_nodes = 0
-        for node in H.init_node_iterator():
-            len_neighbors = len(H.getDist2nbr(node))
-            # print('N(',node,') = ', H.getDist2nbr(node))
-            _node_to_num_neighbors[node] = len_neighbors
-            if len_neighbors not in bucket:
-                bucket[len_neighbors] = []
-            bucket[len_neighbors].append(node)
-            num_nodes += 1
+    def anytime_local_core(self, H, time_budget = None, max_iterations = None, verbose = True):
+        """
+        opt_local_core within a time/iteration budget, returning certified intervals instead of nothing:
+            1) upper bound: the current values (every iteration of h-index and core-correction keeps upper bounds)
+            2) lower bound: l is obtained from the upper bounds by lowering every vertex violating LCCSAT to its 
+               corrected value until none does. Every level set {l >= k} is then a k-subgraph, so l is a lower bound 
+               of the core numbers. Lowering never passes the core numbers either, so l is exact: when this phase 
+               completes, every vertex is certified. It shares the time budget; if that runs out first, the lower 
+               bound is llb.
+        Sets lower, certified (vertices with lb == ub, i.e. exact) and converged (all exact).
+        Returns {vertex: (lb, ub)}.
+        """
+        assert isinstance(H, HypergraphL)
+        start_execution_time = time()
+        self.opt_local_core(H, verbose = False, time_budget = time_budget, max_iterations = max_iterations)
+        upper = self.core
+        start_lower_time = time()
+        lower = dict(upper)
+        queue = deque(H.init_node_iterator())
+        queued = set(queue)
+        completed = True
+        while len(queue):
+            if time_budget is not None and time() - start_execution_time >= time_budget:
+                completed = False
+                break
+            v = queue.popleft()
+            queued.remove(v)
+            # largest t <= lower[v] such that v has >= t neighbours through hyperedges whose members all have lower >= t
+            edges = []
+            for e_id in H.inc_edgeId_iterator(v):
+                e = H.get_edge_byindex(e_id)
+                edges.append((min(lower[w] for w in e), e))
+            edges.sort(key = lambda x: x[0], reverse = True)
+            nbrs = set()
+            corrected = 0
+            for i, (t, e) in enumerate(edges):
+                if t <= corrected:
+                    break
+                nbrs.update(e)
+                if i + 1 < len(edges) and edges[i + 1][0] == t:
+                    continue
+                corrected = max(corrected, min(t, len(nbrs) - 1))
+            if corrected < lower[v]:
+                lower[v] = corrected
+                for u in H.init_nbr_iterator(v):
+                    if lower[u] > corrected and u not in queued:
+                        queued.add(u)
+                        queue.append(u)
+        if completed:
+            # the fixpoint is the core numbers
+            self.core = upper = lower
+        self.lower = {}
+        self.certified = set()
+        for v in upper:
+            self.lower[v] = lower[v] if completed else H.llb[v]
+            if self.lower[v] == upper[v]:
+                self.certified.add(v)
+        self.lower_bound_time = time() - start_lower_time
+        self.converged = len(self.certified) == len(upper)
+        self.execution_time = time() - start_execution_time
         if(verbose):
-            print(bucket)
+            print("#iterations: ", self.max_n, " #certified: ", len(self.certified), "/", len(upper))
+        return {v: (self.lower[v], upper[v]) for v in upper}
 
-        for k in range(1, num_nodes + 1):
-            while len(bucket.get(k, [])) != 0:
-                v = bucket[k].pop()  # get first element in the
-                
+    def local_fixpoint(self, H, interior, h, seeds = None):
+        """ 
+        Applies the h-index operator followed by core-correction to the vertices in interior until none of them changes. 
+        Values of the other vertices in h are kept fixed. Core-correction is done in one pass over the incident hyperedges 
+        (in descending order of the min value of their other members) instead of calling LLCSAT for h, h-1, ...
+        seeds: vertices of interior to start from (all of interior if None), the others are only rechecked when a 
+        neighbour changes. Returns the number of vertex updates evaluated.
+        """
+        queue = deque(interior if seeds is None else seeds)
+        queued = set(queue)
+        num_evaluations = 0
+        while len(queue):
+            v = queue.popleft()
+            queued.remove(v)
+            num_evaluations += 1
+            edges = []
+            for e_id in H.inc_edgeId_iterator(v):
+                e = H.get_edge_byindex(e_id)
+                edges.append((min([h[w] for w in e if w != v], default = 0), e))
+            edges.sort(key = lambda x: x[0], reverse = True)
+            h_v = min(h[v], operator_H([h[u] for u in H.init_nbr_iterator(v)])) if len(edges) else 0
+            # largest t <= h_v such that v has >= t neighbours through hyperedges whose other members all have value >= t
+            nbrs = set()
+            corrected = 0
+            for i, (t, e) in enumerate(edges):
+                if t <= corrected:
+                    break
+                nbrs.update(e)
+                if i + 1 < len(edges) and edges[i + 1][0] == t:
+                    continue
+                corrected = max(corrected, min(t, h_v, len(nbrs) - 1))
+            if corrected < h[v]:
+                h[v] = corrected
+                for u in H.init_nbr_iterator(v):
+                    if u in interior and u not in queued:
+                        queued.add(u)
+                        queue.append(u)
+        return num_evaluations
+
+    def in_kcore(self, H, candidates, u, k):
+        """ True if u is in the k-core of the strong subhypergraph induced by candidates (hence in the k-core of H). """
+        alive = set(candidates)
+        if u not in alive:
+            return False
+        def num_nbrs(v):
+            nbrs = set()
+            for e_id in H.inc_edgeId_iterator(v):
+                e = H.get_edge_byindex(e_id)
+                if all(w in alive for w in e):
+                    nbrs.update(e)
+            return len(nbrs) - 1
+        queue = deque(v for v in alive if num_nbrs(v) < k)
+        removed = set(queue)
+        while len(queue):
+            v = queue.popleft()
+            if v == u:
+                return False
+            alive.remove(v)
+            for w in H.init_nbr_iterator(v):
+                if w in alive and w not in removed and num_nbrs(w) < k:
+                    removed.add(w)
+                    queue.append(w)
+        return True
+
+    def core_of(self, H, vertices, verbose = True):
+        """ 
+        Core numbers of only the query vertices. Every query vertex u starts with [llb, lub], and then a ball of radius 
+        r = 1, 2, ... around u is explored until the bounds meet:
+            1) upper bound: the h-index and core-correction operators are applied inside the ball (vertices at distance 
+               < r) until they converge, vertices at distance r are fixed at their upper bounds.
+            2) lower bound: if u is in the ub-core of the strong subhypergraph induced by the ball vertices with value 
+               >= ub, then core(u) = ub.
+        Upper bounds computed for a query are reused by the next ones.
+        Returns {u: (core number, #vertices touched)}.
+        """
+        assert isinstance(H, HypergraphL)
+        start_execution_time = time()
+        result = {}
+        h = {} # upper bounds, shared by all queries
+        for u in vertices:
+            if u not in h:
+                h[u] = H.lub[u]
+            lb = H.llb[u]
+            ub = h[u]
+            ball = set([u])
+            interior = set()
+            frontier = [u]
+            while lb < ub:
+                # grow the ball by one hop
+                interior.update(frontier)
+                next_frontier = []
+                for v in frontier:
+                    for w in H.init_nbr_iterator(v):
+                        if w not in ball:
+                            ball.add(w)
+                            if w not in h:
+                                h[w] = H.lub[w]
+                            next_frontier.append(w)
+                frontier = next_frontier
+                self.local_fixpoint(H, interior, h)
+                ub = h[u]
+                if len(frontier) == 0 or self.in_kcore(H, [v for v in interior if h[v] >= ub], u, ub):
+                    # the ball is the whole connected component (upper bounds are exact) or u is certified
+                    lb = ub
                 if(verbose):
-                    print("k:", k, "node:", v)
-    
-                self.core[v] = k
-                
-                nbr_v = H.getDist2nbr(v)
-                # print('nbr(',v,') = ',nbr_v)
-                H.bipartiteDeleteu(v)
+                    print("u: ", u, " ball: ", len(ball), " [lb, ub]: ", [lb, ub])
+            self.core[u] = ub
+            result[u] = (ub, len(ball))
+        self.execution_time = time() - start_execution_time
+        if (verbose):
+            print("\n\nOutput")
+            print(result)
+        return result
 
-                # enumerating over all neighbors of v
-                for u in nbr_v:
-                    
-                    if (verbose):
-                        print("node_to_num_neighbours: ",_node_to_num_neighbors)
-                        print("Considering neighbor", u)
+    def approx_local_core(self, A, p = 8, seed = 0, verbose = True):
+        """ 
+        Approximate local core computation on a HypergraphA without neighbour sets: every neighbourhood size is estimated 
+        by a HyperLogLog sketch of its members (see sketch.HLLSketches, relative standard error 1.04 / sqrt(2^p)).
+            1) Init: core(v) = estimated |N(v)|.
+            2) Iterate until no value changes: core(v) = max over t <= core(v) of min(t, estimated |N_t(v)|), where N_t(v) 
+               is the neighbourhood through the hyperedges whose members all have core >= t (h-index and core-correction 
+               in one step). Only vertices incident on a hyperedge whose min core changed are recomputed.
+        self.error_bound is the relative standard error of the neighbourhood size estimates.
+        """
+        assert isinstance(A, HypergraphA)
+        start_execution_time = time()
+        start_init_time = time()
+        sketches = HLLSketches(A, p = p, seed = seed)
+        self.error_bound = sketches.relative_error
+        h = sketches.nbrsize()
+        self.init_time = time() - start_init_time
 
-                    len_neighbors_u = len(H.getDist2nbr(u))
-                    
-                    max_value = max(len_neighbors_u, k)
+        e_ptr, e_nodes, v_ptr, v_edges = A.e_ptr, A.e_nodes, A.v_ptr, A.v_edges
+        min_core = np.minimum.reduceat(h[e_nodes], e_ptr[:-1]) # min core of every hyperedge
+        dirty = np.arange(A.get_N())
+        k = 0
+        while len(dirty):
+            if(verbose):
+                print("Iteration: ", k, " #recomputed: ", len(dirty))
+            new_h = h.copy()
+            for v in dirty:
+                edges = v_edges[v_ptr[v]:v_ptr[v + 1]]
+                order = np.argsort(-min_core[edges], kind='stable')
+                edges = edges[order]
+                t = min_core[edges]
+                last = np.append(t[1:] != t[:-1], True) # last hyperedge with every min core value
+                nbrsize = sketches.prefix_nbrsize(edges, np.append(0, np.cumsum(last[:-1])))
+                new_h[v] = min(h[v], max(0, int(np.max(np.minimum(t[last], nbrsize)))))
+            changed = np.nonzero(new_h != h)[0]
+            h = new_h
+            new_min_core = np.minimum.reduceat(h[e_nodes], e_ptr[:-1])
+            changed_edges = np.nonzero(new_min_core != min_core)[0]
+            min_core = new_min_core
+            if len(changed_edges):
+                slots = np.concatenate([np.arange(e_ptr[e], e_ptr[e + 1]) for e in changed_edges])
+                dirty = np.unique(e_nodes[slots])
+            else:
+                dirty = changed[:0]
+            k += 1
+        self.max_n = k
+        self.core = {A.init_nodes[j]: int(h[j]) for j in range(A.get_N())}
+        self.execution_time = time() - start_execution_time
+        if (verbose):
+            print("\n\nOutput")
+            print(self.core)
 
-                    if(verbose):
-                        print("max core between", k, 'and', len_neighbors_u, "is ", max_value)
-                        print("The location of", u, "is updated from", _node_to_num_neighbors[u], "to", max_value)
+    def external_local_core(self, X, verbose = True):
+        """ 
+        Out-of-core local core computation on a HypergraphE: only the vertex state (core estimate, lub, llb and two flags 
+        per vertex) is in memory, the CSRs are streamed from the binary dataset file in every iteration.
+            1) h-index: the neighbourhood CSR is streamed in windows. Complete rows of a window are evaluated together 
+               (sorted in descending order per row), rows split across windows are aggregated as histograms of their 
+               neighbours' values (capped at the current value) and evaluated once complete.
+            2) core-correction: every vertex that changed or has a neighbour that changed (and is above its llb) reads its 
+               incident hyperedges and corrects its value in one pass over them (see local_fixpoint).
+        Starts from lub and stops when an iteration changes nothing.
+        """
+        assert isinstance(X, HypergraphE)
+        start_execution_time = time()
+        start_bytes_streamed = X.bytes_streamed
+        n = X.get_N()
+        h = X.lub.copy()
+        changed = np.ones(n, dtype=bool) # changed in the last iteration
+        k = 0
+        while changed.any():
+            if(verbose):
+                print("Iteration: ", k, " #changed: ", int(changed.sum()))
+            h_prev = h.copy()
+            dirty = changed.copy()
+            partial = {} # row => [#neighbours seen, histogram of capped neighbour values]
+            start_inner_time = time()
+            for rows, offsets, values, sizes in X.windows(X.nbr_ptr, X.nbr_idx):
+                lens = np.diff(offsets)
+                owners = np.repeat(rows, lens)
+                np.logical_or.at(dirty, owners, changed[values])
+                capped = np.minimum(h_prev[values], h_prev[owners])
+                full = lens == sizes
+                if full.any():
+                    in_full = np.repeat(full, lens)
+                    full_owners = owners[in_full]
+                    full_values = capped[in_full]
+                    order = np.lexsort((-full_values, full_owners))
+                    seg_start = np.concatenate(([0], np.cumsum(lens[full])[:-1]))
+                    rank = np.arange(len(order)) - np.repeat(seg_start, lens[full]) + 1
+                    h_index = np.maximum.reduceat(np.minimum(full_values[order], rank), seg_start)
+                    h[rows[full]] = np.minimum(h[rows[full]], h_index)
+                for i in np.nonzero(~full)[0]:
+                    v = rows[i]
+                    seen, hist = partial.get(v, (0, np.zeros(h_prev[v] + 1, dtype=np.int64)))
+                    hist += np.bincount(capped[offsets[i]:offsets[i + 1]], minlength = h_prev[v] + 1)
+                    seen += lens[i]
+                    partial[v] = (seen, hist)
+                    if seen == sizes[i]:
+                        at_least = np.cumsum(hist[::-1])[::-1] # at_least[t] => #neighbours with value >= t
+                        h[v] = min(h[v], int(np.max(np.nonzero(at_least >= np.arange(len(hist)))[0])))
+                        del partial[v]
+            self.h_index_time += (time() - start_inner_time)
 
+            start_core_correct_time = time()
+            for v in np.nonzero((dirty | (h != h_prev)) & (h > X.llb))[0]:
+                edges = X.inc_edges(v)
+                t = []
+                batches = []
+                for batch, offsets, members in X.edge_batches(edges):
+                    t.append(np.minimum.reduceat(h[members], offsets[:-1]))
+                    if batches is not None:
+                        batches.append((offsets, members))
+                        if len(batches) > 1: # members do not fit in the buffer => read again when needed
+                            batches = None
+                t = np.concatenate(t)
+                order = np.argsort(-t, kind='stable')
+                nbrs = set()
+                corrected = X.llb[v]
+                for i, j in enumerate(order):
+                    if t[j] <= corrected:
+                        break
+                    if batches is not None:
+                        offsets, members = batches[0]
+                        nbrs.update(members[offsets[j]:offsets[j + 1]].tolist())
+                    else:
+                        nbrs.update(X.edge_members(edges[j]).tolist())
+                    if i + 1 < len(order) and t[order[i + 1]] == t[j]:
+                        continue
+                    corrected = max(corrected, min(t[j], len(nbrs) - 1))
+                if corrected < h[v]:
+                    h[v] = corrected
+            self.core_correct_time += (time() - start_core_correct_time)
+            changed = h != h_prev
+            self.reduction_hhat_n.append(int(np.sum(h_prev - h)))
+            k += 1
+        self.max_n = k
+        self.bytes_streamed = X.bytes_streamed - start_bytes_streamed
+        self.core = {X.init_nodes[j]: int(h[j]) for j in range(n)}
+        self.execution_time = time() - start_execution_time
+        if (verbose):
+            print("\n\nOutput")
+            print(self.core)
 
-                    # Move u to new location in bucket
-                    prev_idx = _node_to_num_neighbors[u]
-                    # if verbose:
-                    #     print('prev_idx: ',prev_idx, bucket[prev_idx])
-                    bucket[prev_idx].remove(u)
+    def bipartitedist2core(self, H, verbose = True):
+        """ 
+        Distance-2 core of the bipartite incidence graph (reference implementation for randomised testing).
+        Deleting a vertex removes it from its hyperedges but keeps the hyperedges, so the distance-2 neighbourhood 
+        of every other vertex shrinks by exactly the deleted vertex. Neighbour counts are therefore decremented 
+        incrementally and vertices are peeled by an array bucket-queue over the neighbourhood CSR.
+        """
+        start_execution_time = time()
+        start_init_time = time()
+        A = to_arrayhg(H)
+        A.compute_nbr_csr()
+        self.init_time = time() - start_init_time
+        if(verbose):
+            print("\n---------- Initial neighbour counts -------")
+            print(dict(zip(A.init_nodes, A.init_nbrsize.tolist())))
 
-                    if max_value not in bucket:
-                        bucket[max_value] = []
-                    bucket[max_value].append(u)
-                    self.num_bucket_update += 1
-                    
-                    _node_to_num_neighbors[u] = max_value    
+        start_loop_time = time()
+        core, order = bucket_peel(A.nbr_ptr, A.nbr_idx, A.init_nbrsize)
+        for j in order:
+            self.core[A.init_nodes[j]] = core[j]
+        # Every remaining neighbour of a peeled vertex was moved once, i.e. once per pair of neighbours
+        self.num_bucket_update += int(np.sum(A.init_nbrsize)) // 2
+        self.loop_time = time() - start_loop_time
+        self.execution_time = time() - start_execution_time
         if(verbose):
             print("\n\nOutput")
             print(self.core)
 
-    def naiveNBR(self, H, verbose = True):
+    def multi_core(self, H, verbose = True):
+        """
+        Neighbourhood core, degree core and clique-graph core of H (Hypergraph) in one invocation, sharing the loaded
+        incidence instead of reloading the hypergraph once per variant:
+            1) clique-graph core => array bucket-queue peel over the neighbourhood sets of H (init_nbr)
+            2) degree core => array bucket-queue peel (strongly induced deletion) over incidence CSRs built from the 
+               incidence of H (ArrayRep.degree_core, 2 * sum of |e| ints; no HypergraphA copy)
+            3) neighbourhood core => naiveNBR on H, whose initial buckets are the same neighbourhood sizes
+        H is consumed by the neighbourhood peel (vertices are deleted), as by naiveNBR.
+        Returns: (nbr core, degree core, graph core) dicts; self.core is the neighbourhood core and
+        self.variant_time the execution time of every variant.
+        """
+        assert isinstance(H, Hypergraph)
+        start_execution_time = time()
+        self.variant_time = {}
+
+        start_time = time()
+        self.graph_core = local_upper_bound(H.init_nodes, H.init_nbr)
+        self.variant_time['graph'] = time() - start_time
+
+        start_time = time()
+        self.degree_core = degree_core(H.init_nodes, H.inc_dict, H.e_indices, H.e_nodes)
+        self.variant_time['degree'] = time() - start_time
+
+        start_time = time()
+        self.naiveNBR(H, verbose = False)
+        self.variant_time['nbr'] = time() - start_time
+        self.execution_time = time() - start_execution_time
+        if(verbose):
+            print("\n\nOutput")
+            print("nbr core:", self.core)
+            print("degree core:", self.degree_core)
+            print("graph core:", self.graph_core)
+        return self.core, self.degree_core, self.graph_core
+
+    def start_peel_record(self, H):
+        self.peel_order = []
+        self.peel_density = []
+        self.num_alive_edges = H.get_M()
+        self.num_alive_nodes = H.get_N()
+
+    def record_peel(self, H, v):
+        """ 
+        Appends v to the removal order with the density of the sub-hypergraph left before its removal. Called before 
+        H.removeV_transform(v): the hyperedges still incident on v die with it (strongly induced), so the counts are 
+        updated in O(1).
+        """
+        self.peel_order.append(v)
+        self.peel_density.append(self.num_alive_edges / self.num_alive_nodes)
+        self.num_alive_edges -= len(H.inc_dict.get(v, ()))
+        self.num_alive_nodes -= 1
+
+    def densest_subhypergraph(self, H = None, verbose = True):
+        """ 
+        Densest sub-hypergraph approximation by peeling: the vertices left after the prefix of the removal order whose
+        sub-hypergraph (strongly induced) has the most hyperedges per vertex. Read off the order recorded by the last
+        naiveNBR/improvedNBR run with record_order = True, else naiveNBR(H, record_order = True) is run (H is consumed).
+        Returns: (vertices, density)
+        """
+        if len(self.peel_order) == 0:
+            assert H is not None, "no recorded peeling order"
+            self.naiveNBR(H, verbose = False, record_order = True)
+        density = np.array(self.peel_density)
+        i = int(np.argmax(density)) # first maximum => largest densest sub-hypergraph
+        if(verbose):
+            print("densest sub-hypergraph: ", len(self.peel_order) - i, " vertices, density ", density[i])
+        return self.peel_order[i:], float(density[i])
+
+    def naiveNBR(self, H, verbose = True, record_order = False):
+        for _ in self.naiveNBR_iter(H, verbose, record_order):
+            pass
+
+    def naiveNBR_iter(self, H, verbose = True, record_order = False):
+        """ 
+        Generator version of naiveNBR: yields (vertex, core number) as soon as the vertex is peeled, in non-decreasing order 
+        of core number. The peeling only advances when the caller asks for the next vertex.
+        record_order => the removal order and per-step density are appended to peel_order and peel_density.
+        """
         start_execution_time = time()
         num_nodes = 0
         _node_to_num_neighbors = {}
@@ -582,6 +1048,11 @@ class HGDecompose():
                 bucket[len_neighbors] = set()
             bucket[len_neighbors].add(node)
             num_nodes += 1
+        if record_order:
+            self.start_peel_record(H)
+            # vertices without neighbours are never peeled (k starts at 1), they are removed first (core 0)
+            for node in bucket.get(0, ()):
+                self.record_peel(H, node)
         self.init_time = time() - start_init_time
 
         if(verbose):
@@ -596,7 +1067,8 @@ class HGDecompose():
 
         
         start_loop_time = time()
-        for k in range(1, num_nodes + 1):
+        # Neighbourhood sizes only shrink, so the largest initial size bounds k. (It may exceed num_nodes when vertices carry multiplicities.)
+        for k in range(1, max(num_nodes, max(bucket, default = 0)) + 1):
             while len(bucket.get(k, [])) != 0:
                 # print(k)
                 v = bucket[k].pop()  # get first element in the
@@ -605,6 +1077,9 @@ class HGDecompose():
                     print("k:", k, "node:", v)
     
                 self.core[v] = k
+                if record_order:
+                    self.record_peel(H, v)
+                yield v, k
                 
                 start_neighborhood_call = time()
                 nbr_v = H.neighbors(v)
@@ -866,8 +1341,17 @@ class HGDecompose():
     #         print("\n\nOutput")
     #         print(self.core)
 
-    def improvedNBR(self, H, verbose=True):
+    def improvedNBR(self, H, verbose=True, record_order = False):
         """ Arijits paper version"""
+        for _ in self.improvedNBR_iter(H, verbose, record_order):
+            pass
+
+    def improvedNBR_iter(self, H, verbose=True, record_order = False):
+        """ 
+        Arijits paper version. Generator: yields (vertex, core number) as soon as the vertex is peeled, in non-decreasing 
+        order of core number. The peeling only advances when the caller asks for the next vertex.
+        record_order => the removal order and per-step density are appended to peel_order and peel_density.
+        """
         start_execution_time = time()
         bucket = {}
         lb1 = H.glb
@@ -884,6 +1368,8 @@ class HGDecompose():
                 bucket[lb] = set()
             bucket[lb].add(node)
             setlb[node] = True
+        if record_order:
+            self.start_peel_record(H)
 
         self.init_time = time() - start_init_time
 
@@ -913,6 +1399,9 @@ class HGDecompose():
 
                     if len_nbr_v < k:
                         self.core[v] = k
+                        if record_order:
+                            self.record_peel(H, v)
+                        yield v, k
                         setlb[v] = True
 
                         start_neighborhood_call = time()
@@ -969,6 +1458,9 @@ class HGDecompose():
                         setlb[v] = False
                 else:
                     self.core[v] = k
+                    if record_order:
+                        self.record_peel(H, v)
+                    yield v, k
                     setlb[v] = True
 
                     start_neighborhood_call = time()
@@ -1243,11 +1735,14 @@ class HGDecompose():
 
         # self.loop_time = time() - start_loop_time
 
-    def improved2NBR(self, H, s = 1, verbose = True):
+    def improved2NBR(self, H, s = 1, verbose = True, checkpoint = None, checkpoint_interval = 600, resume_from = None):
         """ 
         This is our original top-down, UB-based algorithm.
         :param H -> Hypergraph
         :param s -> Integer, algorithm parameter. 
+        :param checkpoint -> file written every checkpoint_interval seconds (after an interval): completed intervals, 
+            partial cores and buckets. 
+        :param resume_from -> such a state (see resume), the run continues with the next interval.
         """
         start_execution_time = time()
         # num_nodes = 0
@@ -1310,10 +1805,19 @@ class HGDecompose():
         final_bucket = {}
         setlb = {}
         inv_bucket = {}
+        num_done = 0
+        if resume_from is not None:
+            assert resume_from['intervals'] == Intervals, "checkpoint was written for other intervals"
+            self.core = resume_from['core']
+            final_bucket = resume_from['final_bucket']
+            setlb = resume_from['setlb']
+            inv_bucket = resume_from['inv_bucket']
+            num_done = resume_from['num_done']
+        last_checkpoint_time = time()
         
         start_loop_time = time()
         # for lower, upper in gen:
-        for lower,upper in Intervals:
+        for lower,upper in Intervals[num_done:]:
             if(verbose):
                 print("Inverval [%d,%d]"%(lower, upper))
             # continue  
@@ -1345,11 +1849,16 @@ class HGDecompose():
 
             # self.Core_decomp(H_kmin, lower-1, upper, setlb, final_bucket, inv_bucket, verbose)
             self.Core_decomp(H_kmin, lower, upper, setlb, final_bucket, inv_bucket, verbose)
+            num_done += 1
             if verbose:
                 print('Partial Core: ',self.core)
                 print("Bucket: ",final_bucket)
                 print("setLB: ",setlb)
                 print("=================")
+            if checkpoint is not None and num_done < len(Intervals) and time() - last_checkpoint_time >= checkpoint_interval:
+                self.save_checkpoint(checkpoint, {'algo': 'improved2NBR', 's': s, 'intervals': Intervals, 'num_done': num_done,
+                    'core': self.core, 'final_bucket': final_bucket, 'setlb': setlb, 'inv_bucket': inv_bucket})
+                last_checkpoint_time = time()
             # for k in range(lower-1, upper+1):
             #     if(verbose):
             #         print('k=',k)
@@ -1403,8 +1912,8 @@ class HGDecompose():
             #                         self.num_bucket_update += 1
             #                     self.bucket_update_time += time() - start_bucket_update
                         
-        self.loop_time = time() - start_loop_time
-        self.execution_time = time() - start_execution_time
+        self.loop_time = time() - start_loop_time - self.checkpoint_time
+        self.execution_time = time() - start_execution_time - self.checkpoint_time
         
         if(verbose):
             print("\n\nOutput")
@@ -1775,6 +2284,290 @@ class HGDecompose():
             print("\n\nOutput")
             print(self.core)
 
+    def component_batch_core(self, arg):
+        """ Decomposes a batch of connected components one after another. (Worker of par_component_core()) """
+        edgedicts, algo = arg
+        _local_core = {}
+        for _edgedict in edgedicts:
+            H = component_algos[algo](_edgedict)
+            hgDecompose = HGDecompose()
+            getattr(hgDecompose, algo)(H, verbose = False)
+            _local_core.update(hgDecompose.core)
+        return _local_core
+
+    def par_component_core(self, H, algo = 'naiveNBR', num_threads = 4, batch_size = 10000, verbose = True):
+        """
+        Splits H into connected components (array union-find) and decomposes every component independently by algo.
+        Components with less than batch_size incidences are batched together (about batch_size incidences per batch), 
+        larger components form a batch of their own. Batches are distributed over num_threads processes.
+        :param algo -> name of an HGDecompose method in component_algos.
+        """
+        assert algo in component_algos, algo + " can not be run per component"
+        start_execution_time = time()
+
+        start_init_time = time()
+        A = to_arrayhg(H)
+        comp, num_comp = connected_components(A)
+        edgedicts = component_edgedicts(A, comp, num_comp)
+        self.num_components = num_comp
+
+        # Batching: largest components first, so that the large batches are scheduled first.
+        batches = []
+        batch = []
+        batch_incidences = 0
+        for _edgedict in sorted(edgedicts, key = lambda d: sum(len(e) for e in d.values()), reverse = True):
+            num_incidences = sum(len(e) for e in _edgedict.values())
+            if num_incidences >= batch_size:
+                batches.append([_edgedict])
+                continue
+            batch.append(_edgedict)
+            batch_incidences += num_incidences
+            if batch_incidences >= batch_size:
+                batches.append(batch)
+                batch = []
+                batch_incidences = 0
+        if len(batch):
+            batches.append(batch)
+        self.init_time = time() - start_init_time
+        if(verbose):
+            print("#components: ", num_comp, " #batches: ", len(batches))
+
+        start_loop_time = time()
+        arguments = [(batch, algo) for batch in batches]
+        if num_threads > 1 and len(batches) > 1:
+            with Pool(min(num_threads, len(batches))) as p:
+                return_values = p.map(self.component_batch_core, arguments, chunksize = 1)
+        else:
+            return_values = [self.component_batch_core(arg) for arg in arguments]
+
+        # Merging per-component results
+        for _local_core in return_values:
+            self.core.update(_local_core)
+        self.loop_time = time() - start_loop_time
+        self.execution_time = time() - start_execution_time
+
+        if(verbose):
+            print("\n\nOutput")
+            print(self.core)
+
+    def partition_worker(self, part_id, _edgedict, owned, boundary, h, in_queue, out_queue):
+        """ 
+        Worker of partitioned_local_core: owns the vertices owned (boundary => those with ghost copies in other parts) 
+        and holds ghost copies of the other members of their hyperedges. Every message from in_queue holds new values of 
+        ghosts, the owned vertices are then iterated (local_fixpoint) until they converge for the current ghost values, 
+        and the changed boundary values are sent back. A None message ends the worker, which sends its final values.
+        """
+        H = HypergraphL(_edgedict, lub = h)
+        owned = set(owned)
+        seeds = set(owned)
+        while True:
+            msg = in_queue.get()
+            if msg is None:
+                out_queue.put((part_id, {v: h[v] for v in owned}, 0))
+                return
+            for v, val in msg.items():
+                if val < h[v]:
+                    h[v] = val
+                    seeds.update(u for u in H.init_nbr_iterator(v) if u in owned)
+            before = {v: h[v] for v in boundary}
+            num_evaluations = self.local_fixpoint(H, owned, h, seeds)
+            seeds = set()
+            out_queue.put((part_id, {v: h[v] for v in boundary if h[v] < before[v]}, num_evaluations))
+
+    def partitioned_local_core(self, H, num_parts = 4, verbose = True):
+        """
+        Partitioned local core computation: vertices are split into num_parts parts (partition_vertices, few boundary 
+        vertices), and every part is run by a worker process (partition_worker) holding the hyperedges of its vertices 
+        with ghost copies of boundary vertices. Values start at lub and are only lowered, so rounds can run the parts 
+        independently: in every round, the workers with new ghost values iterate until local convergence, and only the 
+        changed boundary values are sent (through queues) to the parts holding their ghost copies. Stops when a round 
+        changes no boundary value.
+        Reports self.num_rounds, self.comm_volume (#(vertex, value) messages), self.num_ghosts (#ghost copies, up to
+        about (num_parts - 1) * n on hypergraphs with large random neighbourhoods, see partition_vertices).
+        """
+        assert isinstance(H, HypergraphL)
+        start_execution_time = time()
+        start_init_time = time()
+        part = partition_vertices(H, num_parts)
+        edgedicts, ghost_parts = partition_edgedicts(H, part, num_parts)
+        owned = [[] for _ in range(num_parts)]
+        for v in H.init_node_iterator():
+            owned[part[v]].append(v)
+        self.num_ghosts = sum(len(parts) for parts in ghost_parts.values())
+        self.init_time = time() - start_init_time
+        if(verbose):
+            print("part sizes: ", [len(o) for o in owned], " #ghost copies: ", self.num_ghosts)
+
+        out_queue = Queue()
+        in_queues = {}
+        workers = []
+        for p in range(num_parts):
+            if len(owned[p]) == 0:
+                continue
+            h = {}
+            for e in edgedicts[p].values():
+                for v in e:
+                    h[v] = H.lub[v]
+            boundary = [v for v in owned[p] if v in ghost_parts]
+            in_queues[p] = Queue()
+            worker = Process(target = self.partition_worker, args = (p, edgedicts[p], owned[p], boundary, h, in_queues[p], out_queue))
+            worker.start()
+            workers.append(worker)
+
+        start_loop_time = time()
+        updates = {p: {} for p in in_queues}
+        active = list(in_queues)
+        self.num_rounds = 0
+        self.comm_volume = 0
+        while len(active):
+            for p in active:
+                in_queues[p].put(updates[p])
+                updates[p] = {}
+            for _ in range(len(active)):
+                p, changed, num_evaluations = out_queue.get()
+                self.inner_iteration += num_evaluations
+                for v, val in changed.items():
+                    for q in ghost_parts[v]:
+                        updates[q][v] = val
+                        self.comm_volume += 1
+            self.num_rounds += 1
+            active = [p for p in in_queues if len(updates[p])]
+            if(verbose):
+                print("Round: ", self.num_rounds, " #active parts: ", len(active))
+        for p in in_queues:
+            in_queues[p].put(None)
+        for _ in range(len(in_queues)):
+            p, _local_core, _ = out_queue.get()
+            self.core.update(_local_core)
+        for worker in workers:
+            worker.join()
+        self.loop_time = time() - start_loop_time
+        self.execution_time = time() - start_execution_time
+        if(verbose):
+            print("\n\nOutput")
+            print(self.core)
+
+    def stream_worker(self, H, algo, queue, batch_size):
+        """ Runs the generator algo (e.g. naiveNBR_iter) and puts batches of (vertex, core) into queue, None at the end. """
+        batch = []
+        for item in getattr(self, algo)(H, False):
+            batch.append(item)
+            if len(batch) == batch_size:
+                queue.put(batch) # blocks while the queue is full
+                batch = []
+        queue.put(batch)
+        queue.put(None)
+
+    def stream_cores(self, H, algo = 'naiveNBR', batch_size = 1000, max_batches = 10, verbose = True):
+        """
+        Yields (vertex, core number) as soon as each vertex is peeled by algo (naiveNBR or improvedNBR), in non-decreasing 
+        order of core number, while the peeling goes on in a separate process. Backpressure: the peeling process blocks 
+        once max_batches batches of batch_size vertices are waiting, so at most max_batches * batch_size results are 
+        buffered. Closing the generator early (e.g. after the low cores) stops the peeling process.
+        H is not modified (the peeling process works on its own copy). core holds the vertices yielded so far.
+        """
+        assert algo in ['naiveNBR', 'improvedNBR'], algo + " can not be streamed"
+        start_execution_time = time()
+        queue = Queue(max_batches)
+        worker = Process(target = self.stream_worker, args = (H, algo + '_iter', queue, batch_size))
+        worker.start()
+        try:
+            while True:
+                batch = queue.get()
+                if batch is None:
+                    break
+                for v, k in batch:
+                    self.core[v] = k
+                    yield v, k
+            worker.join()
+        finally:
+            if worker.is_alive(): # closed early
+                worker.terminate()
+                worker.join()
+            self.execution_time = time() - start_execution_time
+            if(verbose):
+                print("#streamed: ", len(self.core), " time: ", self.execution_time)
+
+    def twin_compressed_core(self, H, algo = 'naiveNBR', verbose = True):
+        """
+        Collapses twin vertices (identical incident hyperedges) into a representative with a multiplicity, 
+        decomposes the reduced hypergraph by algo with multiplicity-aware neighbourhood sizes and copies 
+        the core number of every representative to its twins.
+        :param algo -> name of an HGDecompose method in twin_algos.
+        """
+        assert algo in twin_algos, algo + " can not be run on the twin-compressed hypergraph"
+        start_execution_time = time()
+
+        start_init_time = time()
+        _edgedict, mult, rep = compress_twins(H)
+        lub = getattr(H, 'lub', None)
+        if isinstance(lub, dict):  # twins share their upper bounds
+            lub = {v: lub[v] for v in mult}
+        else:
+            lub = None
+        H_twin = twin_algos[algo](_edgedict, mult = mult, lub = lub)
+        self.num_twins_removed = len(rep) - len(mult)
+        self.init_time = time() - start_init_time
+        if(verbose):
+            print("#vertices: ", len(rep), " #representatives: ", len(mult))
+
+        start_loop_time = time()
+        hgDecompose = HGDecompose()
+        getattr(hgDecompose, algo)(H_twin, verbose = False)
+        for v in rep:
+            if rep[v] in hgDecompose.core:  # vertices without neighbours are not assigned a core by the peeling algorithms
+                self.core[v] = hgDecompose.core[rep[v]]
+        self.loop_time = time() - start_loop_time
+        self.execution_time = time() - start_execution_time
+
+        if(verbose):
+            print("\n\nOutput")
+            print(self.core)
+
+    def snapshot_series_core(self, H, masks, verbose = True):
+        """
+        Decomposes a nested series of snapshots of H without rebuilding them: masks[i] is a boolean array over the 
+        hyperedges of H (in e_indices order), True if the hyperedge is in snapshot i, and every snapshot is a subset of 
+        the previous one. Snapshot 0 is decomposed by opt_local_core. Snapshot i + 1 only deletes hyperedges, so the 
+        cores of snapshot i are upper bounds: they are lowered lazily by DynamicCoreIndex.apply_batch, starting at the 
+        members of the deleted hyperedges. H is modified (it ends up as the last snapshot).
+        Sets series_core (core numbers per snapshot), series_time (seconds per snapshot) and series_touched (#vertices 
+        rechecked per snapshot); core => last snapshot.
+        """
+        assert isinstance(H, Hypergraph)
+        start_execution_time = time()
+        e_ids = list(H.e_indices)
+        self.series_core = []
+        self.series_time = []
+        self.series_touched = []
+        prev_mask = np.ones(len(e_ids), dtype=bool)
+        index = None
+        for i, mask in enumerate(masks):
+            mask = np.asarray(mask, dtype=bool)
+            assert len(mask) == len(e_ids), "mask " + str(i) + " does not cover the hyperedges"
+            assert not np.any(mask & ~prev_mask), "snapshot " + str(i) + " is not nested in the previous one"
+            start_snapshot_time = time()
+            deletions = [e_ids[j] for j in np.flatnonzero(prev_mask & ~mask)]
+            if index is None:
+                for e_id in deletions:
+                    H.del_edge(e_id)
+                hgDecompose = HGDecompose()
+                hgDecompose.opt_local_core(HypergraphL(dict(H.edge_eid_iterator())), verbose = False)
+                index = DynamicCoreIndex(H, core = hgDecompose.core)
+                touched = len(index.core)
+            else:
+                index.apply_batch(deletions = deletions)
+                touched = index.last_touched
+            self.series_core.append(dict(index.core))
+            self.series_time.append(time() - start_snapshot_time)
+            self.series_touched.append(touched)
+            prev_mask = mask
+            if(verbose):
+                print("Snapshot ", i, ": #deleted ", len(deletions), " #touched ", touched, " time ", self.series_time[-1])
+        if index is not None:
+            self.core = index.core
+        self.execution_time = time() - start_execution_time
+
     def par_core_correct(self, args):
         """ 
         Verify if core_u locally satisfies the property that the induced sub_neighborhood of u has at least u vertices. 
@@ -0,0 +1,90 @@
+from collections import deque
+from hgDecompose.heapdict import heapdict
+
+def partition_vertices(H, num_parts, imbalance = 1.05, refine_passes = 2):
+    """
+    Splits the vertices of H (HypergraphL) into num_parts parts with few boundary vertices.
+        1) Greedy graph growing: every part grows from a seed (next unassigned vertex in BFS order) by repeatedly taking 
+           the unassigned vertex with the most neighbours already in the part, until it has ceil(n / num_parts) vertices.
+        2) Refinement: a vertex moves to the part holding most of its neighbours if that part is below 
+           imbalance * n / num_parts vertices (a few passes).
+    Replication factor: vertex v gets a ghost copy in every other part owning one of its neighbours, i.e. at most
+    min(num_parts - 1, |N(v)|) copies. The heuristic only pays off on hypergraphs with local structure; when the
+    neighbourhoods are large and random, every vertex is a boundary vertex with a copy in (almost) every other part,
+    as with a random partition: on syn (800 vertices, 50 neighbours on average), 4 parts give 2398 ghost copies
+    (2400 for a random partition), i.e. about num_parts - 1 per vertex.
+    Returns: dict (vertex => part)
+    """
+    nodes = list(H.init_node_iterator())
+    n = len(nodes)
+    order = []
+    visited = set()
+    for s in nodes:
+        if s in visited:
+            continue
+        visited.add(s)
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for u in H.init_nbr_iterator(v):
+                if u not in visited:
+                    visited.add(u)
+                    queue.append(u)
+
+    part = {}
+    size = [0] * num_parts
+    target = -(-n // num_parts)
+    next_seed = 0
+    for p in range(num_parts):
+        frontier = heapdict() # unassigned vertex => -(#neighbours in part p)
+        while size[p] < target or p == num_parts - 1:
+            if len(frontier) == 0:
+                while next_seed < n and order[next_seed] in part:
+                    next_seed += 1
+                if next_seed == n:
+                    break
+                frontier[order[next_seed]] = 0
+            v, _ = frontier.popitem()
+            part[v] = p
+            size[p] += 1
+            for u in H.init_nbr_iterator(v):
+                if u not in part:
+                    frontier[u] = frontier.get(u, 0) - 1
+
+    cap = imbalance * n / num_parts
+    for _ in range(refine_passes):
+        moved = 0
+        for v in order:
+            count = {}
+            for u in H.init_nbr_iterator(v):
+                count[part[u]] = count.get(part[u], 0) + 1
+            if len(count) == 0:
+                continue
+            best = max(count, key = lambda p: (count[p], p == part[v]))
+            if best != part[v] and count[best] > count.get(part[v], 0) and size[best] + 1 <= cap:
+                size[part[v]] -= 1
+                size[best] += 1
+                part[v] = best
+                moved += 1
+        if moved == 0:
+            break
+    return part
+
+def partition_edgedicts(H, part, num_parts):
+    """
+    Hyperedges of every part: a hyperedge belongs to every part owning one of its members, so every owned vertex sees
+    all of its incident hyperedges. Members owned by another part are ghost copies.
+    Returns: (edgedicts, ghost_parts) => ghost_parts[v] is the set of parts holding a ghost copy of v.
+    """
+    edgedicts = [{} for _ in range(num_parts)]
+    ghost_parts = {}
+    for e_id, e in H.e_id_to_edge.items():
+        owners = set(part[v] for v in e)
+        for p in owners:
+            edgedicts[p][e_id] = e
+        for v in e:
+            for p in owners:
+                if p != part[v]:
+                    ghost_parts.setdefault(v, set()).add(p)
+    return edgedicts, ghost_parts
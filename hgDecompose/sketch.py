@@ -0,0 +1,86 @@
+import numpy as np
+
+class HLLSketches:
+    """
+    HyperLogLog cardinality sketches of vertex neighbourhoods of a HypergraphA, used to estimate neighbourhood sizes
+    without materialising neighbour sets (init_nbr / the neighbourhood CSR).
+    Only the register and rank of every vertex (a hash of its index) are stored. The sketch of a union of hyperedges,
+    2^p one-byte registers, is built on demand from their members as the max rank per register, so
+    |N(v)| + 1 = |union of the hyperedges incident on v| is estimated from the sketch of those hyperedges.
+    The relative standard error of an estimate is 1.04 / sqrt(2^p).
+    Memory: 3 bytes per vertex, plus 2^p bytes per sketch held at a time (see nbrsize / prefix_nbrsize).
+    """
+    def __init__(self, A, p = 8, seed = 0):
+        assert 4 <= p <= 16, "p must be in [4, 16]"
+        self.A = A
+        self.p = p
+        self.num_registers = 1 << p
+        self.relative_error = 1.04 / np.sqrt(self.num_registers)
+        if self.num_registers >= 128:
+            self.alpha = 0.7213 / (1 + 1.079 / self.num_registers)
+        else:
+            self.alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.num_registers]
+
+        # 32-bit hash of every vertex index: the low p bits select the register, the rank is the position of the
+        # leftmost 1-bit among the remaining 32 - p bits.
+        x = np.arange(A.get_N(), dtype=np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) % (1 << 64))
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = (x ^ (x >> np.uint64(31))) & np.uint64(0xFFFFFFFF)
+        self.register = (x & np.uint64(self.num_registers - 1)).astype(np.uint16)
+        w = (x >> np.uint64(p)).astype(np.float64)
+        self.rank = np.full(len(w), 32 - p + 1, dtype=np.uint8)
+        nonzero = w > 0
+        self.rank[nonzero] = (32 - p) - np.floor(np.log2(w[nonzero])).astype(np.uint8)
+
+    def estimate(self, registers):
+        """ Estimated cardinality of every row of registers (2D array). """
+        registers = np.atleast_2d(registers)
+        M = self.num_registers
+        E = self.alpha * M * M / np.sum(np.exp2(-registers.astype(np.float64)), axis=1)
+        zeros = np.sum(registers == 0, axis=1)
+        small = (E <= 2.5 * M) & (zeros > 0) # linear counting
+        E[small] = M * np.log(M / zeros[small])
+        return E
+
+    def sketch(self, edges, group, num_groups):
+        """
+        Sketches of num_groups unions of hyperedges: row g merges the members of every edges[i] with group[i] = g.
+        Returns: (num_groups, 2^p) array of registers
+        """
+        e_ptr = self.A.e_ptr
+        sizes = e_ptr[edges + 1] - e_ptr[edges]
+        # slots of the members of every hyperedge in edges, concatenated
+        slots = np.arange(int(sizes.sum()), dtype=np.int64) + np.repeat(e_ptr[edges] - (np.cumsum(sizes) - sizes), sizes)
+        members = self.A.e_nodes[slots]
+        registers = np.zeros((num_groups, self.num_registers), dtype=np.uint8)
+        np.maximum.at(registers, (np.repeat(group, sizes), self.register[members]), self.rank[members])
+        return registers
+
+    def prefix_nbrsize(self, edges, group):
+        """
+        Estimated size of the union of the hyperedges of groups 0..g, minus 1, for every group g.
+        edges: hyperedge indices, group: non-decreasing group of every hyperedge (0, 1, ..)
+        """
+        registers = np.maximum.accumulate(self.sketch(edges, group, int(group[-1]) + 1), axis=0)
+        return np.rint(self.estimate(registers)) - 1
+
+    def nbrsize(self, chunk = 1 << 20):
+        """
+        Estimated |N(v)| of every vertex index (rounded). Vertices are sketched in chunks of about chunk member slots
+        (sum of |e| over their incident hyperedges) and at most chunk >> p vertices.
+        """
+        A = self.A
+        n = A.get_N()
+        result = np.zeros(n, dtype=np.int64)
+        v_ptr = A.v_ptr
+        vol = np.append(0, np.cumsum(np.diff(A.e_ptr)[A.v_edges]))[v_ptr] # vol[j] => member slots of vertices < j
+        max_rows = max(1, chunk >> self.p)
+        start = 0
+        while start < n:
+            end = max(start + 1, min(n, start + max_rows, np.searchsorted(vol, vol[start] + chunk, side='right') - 1))
+            edges = A.v_edges[v_ptr[start]:v_ptr[end]]
+            group = np.repeat(np.arange(end - start, dtype=np.int64), np.diff(v_ptr[start:end + 1]))
+            result[start:end] = np.maximum(np.rint(self.estimate(self.sketch(edges, group, end - start))) - 1, 0)
+            start = end
+        return result
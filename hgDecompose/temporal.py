@@ -0,0 +1,64 @@
+from time import time
+from collections import deque
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.dynamic import DynamicCoreIndex
+
+class SlidingWindowCore:
+    """
+    Core numbers of the hypergraph formed by the hyperedges with timestamp in (t - window, t].
+    Every call of advance(t, arrivals) moves the window to t: the expired hyperedges are deleted as one batch and the
+    arrivals are inserted as one batch (DynamicCoreIndex.apply_batch), so cores are repaired incrementally.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.index = DynamicCoreIndex(Hypergraph())
+        self.core = self.index.core
+        self.alive = deque() # (timestamp, e_id) of the hyperedges in the window, in order of arrival
+        self.stats = [] # per-step statistics
+
+    def advance(self, t, arrivals):
+        """
+        arrivals: list of (timestamp, e_id, e) with timestamp <= t, in non-decreasing order of timestamp.
+        Returns the statistics of this step.
+        """
+        start_step_time = time()
+        expired = []
+        while len(self.alive) and self.alive[0][0] <= t - self.window:
+            expired.append(self.alive.popleft()[1])
+        insertions = []
+        for timestamp, e_id, e in arrivals:
+            if timestamp > t - self.window:
+                self.alive.append((timestamp, e_id))
+                insertions.append((e_id, e))
+        self.index.apply_batch(deletions = expired, insertions = insertions)
+        stat = {
+            'time' : t,
+            'latency' : time() - start_step_time,
+            'touched' : self.index.last_touched,
+            'num arrivals' : len(insertions),
+            'num expirations' : len(expired),
+            'num edges' : len(self.alive),
+            'num nodes' : len(self.core)
+        }
+        self.stats.append(stat)
+        return stat
+
+    def run(self, temporal_edges, step, verbose = False):
+        """
+        temporal_edges: list of (timestamp, e) in non-decreasing order of timestamp (e_id => position in the list).
+        Advances the window every step time units from the first timestamp, yields (t, core) after every step.
+        """
+        if len(temporal_edges) == 0:
+            return
+        t = temporal_edges[0][0]
+        i = 0
+        while i < len(temporal_edges):
+            arrivals = []
+            while i < len(temporal_edges) and temporal_edges[i][0] <= t:
+                arrivals.append((temporal_edges[i][0], i, temporal_edges[i][1]))
+                i += 1
+            stat = self.advance(t, arrivals)
+            if verbose:
+                print(stat)
+            yield t, self.core
+            t += step
@@ -0,0 +1,102 @@
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import to_arrayhg
+
+def compress_twins(H):
+    """
+    Collapses twin vertices (vertices with identical sets of incident hyperedges) into one representative.
+    Twins have identical neighbourhoods in every strong sub-hypergraph, so they always share the same core number.
+    Returns: (_edgedict, mult, rep)
+        _edgedict => hyperedges of the reduced hypergraph (twins replaced by their representative)
+        mult => key: representative, value: number of vertices it stands for
+        rep => key: vertex, value: its representative
+    """
+    A = to_arrayhg(H)
+    v_ptr = A.v_ptr.tolist()
+    v_edges = A.v_edges.tolist()
+    incidence_to_rep = {} # key: sorted incidence list, value: representative
+    rep = {}
+    mult = {}
+    for j, v in enumerate(A.init_nodes):
+        key = tuple(sorted(v_edges[v_ptr[j]:v_ptr[j + 1]]))
+        if key not in incidence_to_rep:
+            incidence_to_rep[key] = v
+            mult[v] = 0
+        rep[v] = incidence_to_rep[key]
+        mult[rep[v]] += 1
+
+    _edgedict = {}
+    for e_id, e in A.edge_eid_iterator():
+        _edgedict[e_id] = tuple(dict.fromkeys(rep[v] for v in e))
+    return _edgedict, mult, rep
+
+class TwinHypergraph(Hypergraph):
+    """
+    Hypergraph (used by the peeling algorithms) where every vertex v stands for mult[v] twin vertices.
+    Neighbourhood sizes count every neighbour u with multiplicity mult[u], plus the mult[v] - 1 twins of v.
+    """
+    def __init__(self, _edgedict=None, mult=None, lub=None):
+        self.mult = mult if mult is not None else {}
+        Hypergraph.__init__(self, _edgedict, lub)
+
+    def weigh_init_nbrsize(self):
+        for v in self.init_nodes:
+            self.init_nbrsize[v] = sum(self.mult[u] for u in self.init_nbr[v]) + self.mult[v] - 1
+
+    def compute_Bounds(self, lub=None):
+        self.weigh_init_nbrsize()
+        Hypergraph.compute_Bounds(self, lub)
+
+    def compute_Bounds2(self):
+        self.weigh_init_nbrsize()
+        Hypergraph.compute_Bounds2(self)
+
+    def get_number_of_nbrs(self, u):
+        if not self.inc_dict.get(u):  # u has no incident edge left, so its twins are no neighbours either.
+            return 0
+        return sum(self.mult[w] for w in self.neighbors_iterator(u)) + self.mult[u] - 1
+
+    def strong_subgraph(self, vertex_list):
+        """ returns: TwinHypergraph object. """
+        _H = Hypergraph.strong_subgraph(self, vertex_list)
+        H = TwinHypergraph(mult = self.mult)
+        H.e_indices = _H.e_indices
+        H.e_nodes = _H.e_nodes
+        H.inc_dict = _H.inc_dict
+        H.degree_dict = _H.degree_dict
+        H.i = _H.i
+        return H
+
+class TwinHypergraphL(HypergraphL):
+    """
+    HypergraphL (used by the local algorithms) where every vertex v stands for mult[v] twin vertices.
+    init_nbr_iterator(v) yields every neighbour u mult[u] times and v itself mult[v] - 1 times (its twins share its core estimate).
+    """
+    def __init__(self, _edgedict=None, mult=None, lub=None):
+        self.mult = mult
+        HypergraphL.__init__(self, _edgedict, lub)
+
+    def compute_local_upperbound(self, lub=None):
+        for v in self.init_nodes:
+            self.init_nbrsize[v] = self.nbrset_size(v, self.init_nbr[v])
+        if lub is None:
+            # Neighbourhood sizes are valid (if loose) upper bounds.
+            lub = dict(self.init_nbrsize)
+        HypergraphL.compute_local_upperbound(self, lub)
+
+    def nbrset_size(self, u, nbrset):
+        return sum(self.mult[w] for w in nbrset) + self.mult[u] - 1
+
+    def init_nbr_iterator(self, v):
+        for u in self.init_nbr[v]:
+            for _ in range(self.mult[u]):
+                yield u
+        for _ in range(self.mult[v] - 1):
+            yield v
+
+# Algorithms that can be run on the twin-compressed hypergraph (HGDecompose.twin_compressed_core) => hypergraph class they expect.
+twin_algos = {
+    'naiveNBR': TwinHypergraph,
+    'improvedNBR_simplified': TwinHypergraph,
+    'opt_local_core': TwinHypergraphL
+}
@@ -3,6 +3,8 @@ from numpy.core.fromnumeric import mean
 import pandas as pd
 from hgDecompose.Hypergraph import Hypergraph
 from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import HypergraphA, to_arrayhg, save_arrayhg, load_arrayhg, connected_components
+from hgDecompose.ExternalRep import HypergraphE, mmap_npz, build_binary_file
 import random
 import heapq
 from hgDecompose.heapdict import heapdict
@@ -17,6 +19,68 @@ for i in range(10):
     scal_dataset_to_filename['enron_'+str(i)]= 'data/datasets/scalability/enron_'+str(i)+'.hyp' 
     scal_dataset_to_filename['pref_'+str(i)]= 'data/datasets/scalability/pref_'+str(i)+'.hyp' 
 
+# Text dataset file of every dataset read by get_hg()/get_localhg()
+dataset_to_filename = {
+    "enron" : "data/datasets/real/Enron.hyp",
+    "congress" : "data/datasets/real/congress-bills.hyp",
+    "contact" : "data/datasets/real/contact-primary-school.hyp",
+    "dblp": "data/datasets/real/DBLP.hyp",
+    "amazon": "data/datasets/real/amazon-reviews.hyp",
+    "protein": 'data/datasets/real/humancomplexes.hyp',
+    '3sat': "data/datasets/synthetic/3sat",
+    "syn" : "data/datasets/synthetic/syn.hyp",
+    "bin_1" : "data/datasets/synthetic/binomial_5_100_4_0.200000_sample_1_iter_1.txt",
+    "bin_2" : "data/datasets/synthetic/binomial_5_500_4_0.200000_sample_2_iter_1.txt",
+    "bin_4" : "data/datasets/synthetic/binomial_5_100_3_0.200000_sample_4_iter_1.txt",
+    "bin_5" : "data/datasets/synthetic/binomial_5_500_3_0.200000_sample_5_iter_1.txt",
+    "4_sim": "data/datasets/synthetic/4simplex.hyp",
+    "5_sim": "data/datasets/synthetic/5simplex.hyp",
+    "pref": "data/datasets/synthetic/pref_1000000_3_1.hyp",
+    "pref_20000": "data/datasets/synthetic/pref_20000_3_1_simple.hyp",
+    "pref_40000": "data/datasets/synthetic/pref_40000_3_1_simple.hyp",
+    "pref_60000": "data/datasets/synthetic/pref_60000_3_1_simple.hyp",
+    "pref_80000": "data/datasets/synthetic/pref_80000_3_1_simple.hyp",
+    "pref_100000": "data/datasets/synthetic/pref_100000_3_1_simple.hyp",
+    'gowalla': 'data/datasets/gowalla/gowallasimple.hyp',
+    'weeplaces': 'data/datasets/weeplaces/weeplaces.hyp'
+}
+dataset_to_filename.update(scal_dataset_to_filename)
+
+# Binary dataset format (.npz, see ArrayRep.save_arrayhg) => CSR incidence, neighbourhood CSR and local upper bounds.
+binary_dataset_dir = 'data/datasets/binary/'
+
+def get_binary_filename(dataset):
+    return binary_dataset_dir + dataset + '.npz'
+
+def is_binary_file_current(dataset, text_fname):
+    """ 
+    Returns False if the binary dataset file does not exist, is older than the text dataset file text_fname
+    or has no vertex CSR (older format).
+    """
+    import os
+    bin_fname = get_binary_filename(dataset)
+    if not os.path.isfile(bin_fname):
+        return False
+    if os.path.isfile(text_fname) and os.path.getmtime(text_fname) > os.path.getmtime(bin_fname):
+        return False
+    return 'v_edges' in mmap_npz(bin_fname)
+
+def load_binary_lub(fname):
+    """ lub keyed by vertex label, read from the binary dataset file fname (no other array is loaded) """
+    arrays = mmap_npz(fname)
+    return dict(zip(arrays['init_nodes'].tolist(), np.asarray(arrays['lub']).tolist()))
+
+def save_binary_hg(dataset, H):
+    """ Writes H (with its lub) in the binary dataset format. """
+    import os
+    os.makedirs(binary_dataset_dir, exist_ok=True)
+    A = to_arrayhg(H)
+    if A.lub is None and getattr(H, 'lub', None) is not None:
+        A.compute_nbr_csr()
+        A.lub = np.array([H.lub[v] for v in A.init_nodes], dtype=np.int64)
+    save_arrayhg(A, get_binary_filename(dataset))
+    return A
+
 def strong_subgraph(H, vertex_set):
     import sys
 
@@ -251,7 +315,8 @@ def get_hg(dataset):
                 # if idx%10000 == 0:
                 #     print(idx)
 
-        H = Hypergraph(dic)
+        # lub is read from the binary dataset file (built once)
+        H = Hypergraph(dic, lub = load_binary_lub(get_binary_file(dataset)))
 
     else:
         raise RuntimeError(dataset + " is not defined or implemented yet")
@@ -259,6 +324,30 @@ def get_hg(dataset):
 
     return H
 
+def get_snapshot_series(name, num_snapshots = 10):
+    """ 
+    Nested snapshot series name_0, .., name_{num_snapshots - 1} (see scalabilitydataprep.gen_nested_hypergraph): only the 
+    largest snapshot name_0 is loaded as a Hypergraph, every snapshot is a boolean mask over its hyperedges (e_indices 
+    order), matched by vertex set. Returns (H, masks) for HGDecompose.snapshot_series_core.
+    """
+    H = get_hg(name + "_0")
+    e_ids = list(H.e_indices)
+    positions = {}
+    for j, e_id in enumerate(e_ids):
+        positions.setdefault(tuple(sorted(set(H.get_edge_byindex(e_id)))), []).append(j)
+    masks = [np.ones(len(e_ids), dtype=bool)]
+    for i in range(1, num_snapshots):
+        mask = np.zeros(len(e_ids), dtype=bool)
+        remaining = {key: list(val) for key, val in positions.items()}
+        with open(scal_dataset_to_filename[name + "_" + str(i)]) as f:
+            for line in f:
+                key = tuple(sorted(set(line[:-1].split(','))))
+                if len(remaining.get(key, [])) == 0:
+                    raise RuntimeError(name + "_" + str(i) + " is not a subset of " + name + "_0")
+                mask[remaining[key].pop()] = True
+        masks.append(mask)
+    return H, masks
+
 def get_localhg(dataset):
     H = None
     if(dataset == "default"):
@@ -332,13 +421,43 @@ def get_localhg(dataset):
                 dic[idx] = edge
                 idx+=1
 
-        H = HypergraphL(dic)
+        # lub is read from the binary dataset file (built once)
+        H = HypergraphL(dic, lub = load_binary_lub(get_binary_file(dataset)))
 
     else:
         raise RuntimeError(dataset + " is not defined or implemented yet")
 
     return H
 
+def get_arrayhg(dataset):
+    """ 
+    Returns the array-based hypergraph (HypergraphA, with lub) of dataset, read from the binary dataset file.
+    """
+    if dataset == "default":
+        A = to_arrayhg(get_localhg(dataset))
+        A.compute_local_upperbound()
+        return A
+    return load_arrayhg(get_binary_file(dataset))
+
+def get_binary_file(dataset):
+    """ 
+    Returns the name of the binary dataset file of dataset, with a vertex CSR. 
+    The file is (re)built by streaming the text dataset file (ExternalRep.build_binary_file) if it does not exist, is 
+    older than the text dataset file or has no vertex CSR (older format).
+    """
+    import os
+    fname = get_binary_filename(dataset)
+    if dataset == "default":
+        save_binary_hg(dataset, get_localhg(dataset))
+    elif not is_binary_file_current(dataset, dataset_to_filename[dataset]):
+        os.makedirs(binary_dataset_dir, exist_ok=True)
+        build_binary_file(dataset_to_filename[dataset], fname)
+    return fname
+
+def get_externalhg(dataset, buffer_size = 1 << 20):
+    """ Returns the semi-external hypergraph (HypergraphE) of dataset, backed by the binary dataset file. """
+    return HypergraphE(get_binary_file(dataset), buffer_size = buffer_size)
+
 def get_random_hg(n = 10, m = 5, edge_size_ub = None, seed = 1):
     """ 
     Returns a random hypergraph with n vertices and m edges. 
@@ -360,7 +479,8 @@ def get_random_hg(n = 10, m = 5, edge_size_ub = None, seed = 1):
         else:
             edge_sz = random.randint(2, edge_size_ub) # 2 because we do not want singletons
         
-        e = random.sample(V, edge_sz)
+        # sampling from a set is rejected by Python >= 3.11; the draws differ from the former set-based sampling
+        e = random.sample(sorted(V), edge_sz)
         Edict[m] = tuple([str(v) for v in sorted(list(e))])
         m = m-1
     return Hypergraph(Edict)
@@ -377,7 +497,7 @@ def get_random_graph(n = 10, m = 5, seed = 1):
     Edict = {}
     exists = {}
     while m:
-        e = random.sample(V, 2)
+        e = random.sample(sorted(V), 2)
         if e[1]<e[0]:
             e[0],e[1] = e[1],e[0]
         if not exists.get((e[0],e[1]),False):
@@ -466,6 +586,74 @@ def get_basic_hg(dataset):
 
     return H
 
+def get_temporal_edges(fname):
+    """ 
+    Reads a timestamped hypergraph: every line is timestamp,v1,v2,... 
+    Returns: list of (timestamp, edge) sorted by timestamp. 
+    """
+    temporal_edges = []
+    with open(fname) as f:
+        for line in f:
+            fields = line.rstrip('\n').split(',')
+            temporal_edges.append((float(fields[0]), tuple(fields[1:])))
+    temporal_edges.sort(key = lambda x: x[0])
+    return temporal_edges
+
+def edge_diff(old_edgedict, new_edgedict):
+    """ 
+    Hyperedges deleted from and inserted into old_edgedict to obtain new_edgedict, compared as vertex sets 
+    (hyperedge ids may differ between versions). Returns (deleted, inserted) => lists of hyperedges.
+    """
+    from collections import Counter
+    old = Counter(tuple(sorted(set(e))) for e in old_edgedict.values())
+    new = Counter(tuple(sorted(set(e))) for e in new_edgedict.values())
+    return list((old - new).elements()), list((new - old).elements())
+
+def warm_start_bounds(prior_core, deleted = [], inserted = []):
+    """
+    Bounds on the core numbers of a hypergraph from the core numbers prior_core of a previous version and the 
+    hyperedges deleted and inserted since then. Let K = min core over the members of an updated hyperedge e. By the 
+    per-edge bounds of dynamic.DynamicCoreIndex, only vertices with 
+        1) deletion: K - |e| + 2 <= core(v) <= K can drop, by at most |e| - 1
+        2) insertion: K <= core(v) <= K + |e| - 2 can rise, to at most K + |e| - 1 (the new core subgraph of v 
+           contains e, and without e every vertex of it keeps at least core - |e| + 1 neighbours)
+    and every other core number is unchanged. The deletions and then the insertions are applied one hyperedge at a 
+    time to an interval [lower, upper] per vertex (starting at prior_core, 0 for vertices without a prior core): K is 
+    only known to lie in [min lower, min upper] over the members of e, so v is affected if its interval meets the 
+    window of any K in that range. Vertices no update can reach keep lower = upper = prior_core.
+    By the same argument for the whole batch, no core rises by more than the largest sum of (|e| - 1) over the 
+    inserted hyperedges of one vertex.
+    Returns (upper, lower) => dicts over the vertices of prior_core and of the inserted hyperedges.
+    """
+    nodes = list(prior_core)
+    for e in inserted:
+        nodes.extend(v for v in e if v not in prior_core)
+    nodes = list(dict.fromkeys(nodes))
+    index = {v: j for j, v in enumerate(nodes)}
+    lower = np.array([prior_core.get(v, 0) for v in nodes], dtype=np.int64)
+    upper = lower.copy()
+    for e in deleted:
+        members = [index[v] for v in set(e) if v in index]
+        if len(members) == 0:
+            continue
+        size = len(set(e))
+        K_lo, K_hi = lower[members].min(), upper[members].min()
+        affected = (upper >= K_lo - size + 2) & (lower <= K_hi)
+        lower[affected] = np.maximum(lower[affected] - (size - 1), 0)
+    load = np.zeros(len(nodes), dtype=np.int64) # sum of (|e| - 1) over the inserted hyperedges of every vertex
+    for e in inserted:
+        members = [index[v] for v in set(e)]
+        load[members] += len(members) - 1
+    cap = upper + (load.max() if len(inserted) else 0)
+    for e in inserted:
+        members = [index[v] for v in set(e)]
+        size = len(members)
+        K_lo, K_hi = lower[members].min(), upper[members].min()
+        affected = (upper >= K_lo) & (lower <= K_hi + size - 2)
+        upper[affected] = np.maximum(upper[affected], K_hi + size - 1)
+    upper = np.minimum(upper, cap)
+    return dict(zip(nodes, upper.tolist())), dict(zip(nodes, lower.tolist()))
+
 def writeHypergraph(edge_dict, out_file):
     with open(out_file,'w') as wf:
         for edge in edge_dict.values():
@@ -585,6 +773,22 @@ def get_nbr_stats(H):
     stat['75%'] = _temp['75%']
     return stat
 
+def core_error_stats(core, core_approx):
+    """ Return the stats of the errors of approximate core numbers core_approx w.r.t. the exact core numbers core. """
+    abs_err = []
+    rel_err = []
+    for v in core:
+        err = abs(core_approx.get(v, 0) - core[v])
+        abs_err.append(err)
+        rel_err.append(err / max(core[v], 1))
+    stat = {'mean abs error': None, 'max abs error': None, 'mean rel error': None, 'max rel error': None, 'exact fraction': None}
+    stat['mean abs error'] = float(np.mean(abs_err))
+    stat['max abs error'] = int(np.max(abs_err))
+    stat['mean rel error'] = float(np.mean(rel_err))
+    stat['max rel error'] = float(np.max(rel_err))
+    stat['exact fraction'] = float(np.mean(np.array(abs_err) == 0))
+    return stat
+
 
 import numpy as np
 
@@ -628,6 +832,8 @@ def operator_H(citations):
     
     citations = np.array(citations)
     n         = citations.shape[0]
+    if n == 0: # vertex without neighbours
+        return 0
     array     = np.arange(1, n+1)
     
     # reverse sorting
@@ -717,20 +923,20 @@ def memory_usage_psutil():
     mem = process.memory_info().rss / float(2 ** 20)
     return mem
 
+def peak_memory_usage():
+    # return the peak memory usage (resident set size) of this process in MB
+    import resource, sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KB on Linux
+    if sys.platform == 'darwin':
+        return peak / float(2 ** 20)
+    return peak / 1024.0
+
 def check_connectivity(hg):
-    ds = DisjointSet()
-    for v in hg.nodes():
-        if v in ds:
-            continue 
-        else:
-            for e in hg.inc_dict[v]:
-                # print(hg.get_edge_byindex(e))
-                for u in hg.get_edge_byindex(e):
-                    ds.union(v,u)
-            # print('-----')
-            # print(list(ds.itersets()),'\n------')
-    print('Is connected: ', len(list(ds.itersets()))==1)
-    # print(list(ds.itersets()))
+    """ Prints whether hg is connected (array union-find over hyperedges). Returns the number of connected components. """
+    _, num_comp = connected_components(to_arrayhg(hg))
+    print('Is connected: ', num_comp==1)
+    return num_comp
             
 def component_sz(v,hg):
     """ Returns the size of the component v is part of in Hg"""
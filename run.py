@@ -7,7 +7,10 @@ import networkx as nx
 # from hgDecompose.utils import get_hg_hnx
 # from hgDecompose.newhgDecompose import HGDecompose
 from hgDecompose.optimizedhgDecompose import HGDecompose
-from hgDecompose.utils import get_hg, memory_usage_psutil,get_localhg,check_connectivity
+from hgDecompose.optimizedGDecompose import HDecompose
+from hgDecompose.coreresult import edge_coreness, export_edge_coreness, export_peel_order
+from hgDecompose.autoselect import hg_statistics, summary_statistics, fit, select_algorithm, log_run
+from hgDecompose.utils import get_hg, memory_usage_psutil,peak_memory_usage,get_localhg,get_arrayhg,get_externalhg,get_binary_file,check_connectivity,edge_diff,get_snapshot_series,core_error_stats
 from hgDecompose.influence_propagation import propagate_for_all_vertices, propagate_for_random_seeds, run_intervention_exp2,run_intervention_exp2_explain,run_intervention_exp2_explain_splen
 from hgDecompose.sis_propagation import propagateSIS_for_all_vertices
 import argparse
@@ -34,6 +37,20 @@ parser.add_argument("--sir_exp3_explanation_splen", action = 'store_true')
 parser.add_argument("--con", help="Is connected hypergraph", action='store_true')
 parser.add_argument("-p", "--prob", help="parameter for Probability", default= 0.3, type=float)
 parser.add_argument("-g", "--gamma", help="parameter for Probability", default= 0.01, type=float)
+parser.add_argument("--giant", help="Size threshold of giant hyperedges (neighbour counts derived arithmetically), None => disabled", default=None, type=int)
+parser.add_argument("--buffer", help="external_local_core: #entries streamed from the binary dataset file at a time", default=1 << 20, type=int)
+parser.add_argument("--precision", help="approx_local_core: 2^precision registers per HyperLogLog sketch", default=8, type=int)
+parser.add_argument("--checkpoint", help="opt_local_core/improved2_nbr: checkpoint file (None => no checkpoints)", default=None, type=str)
+parser.add_argument("--checkpoint_interval", help="seconds between checkpoints", default=600, type=float)
+parser.add_argument("--resume", help="continue from --checkpoint", action='store_true')
+parser.add_argument("--budget", help="anytime_local_core: time budget in seconds (None => until convergence)", default=None, type=float)
+parser.add_argument("--series", help="Number of nested snapshots dataset_0, dataset_1, .. decomposed in one run (0 => disabled)", default=0, type=int)
+parser.add_argument("--edge_export", help="file (.csv or .npz) receiving (edge_id, coreness, size) of every hyperedge, None => disabled", default=None, type=str)
+parser.add_argument("--edge_coreness", help="hyperedge coreness: min or max core of the members", default="min", type=str)
+parser.add_argument("--history", help="csv of logged runs (execution time, peak memory, statistics), fits the cost models of auto and estimate.py", default="data/output/run_history.csv", type=str)
+parser.add_argument("--record", help="log the run to --history (auto runs are always logged)", action='store_true')
+parser.add_argument("--peel_order", help="naive_nbr/improved_nbr: file (.csv or .npz) receiving the removal order and per-step density, None => disabled", default=None, type=str)
+parser.add_argument("--warm_start", help="opt_local_core/top_down: previous version of the dataset, whose core numbers seed the decomposition", default=None, type=str)
 
 args = parser.parse_args()
 
@@ -42,6 +59,29 @@ if (args.con):
     check_connectivity(input_H)
     quit()
 
+# Nested snapshot series: the largest snapshot is loaded once, the others are hyperedge masks
+if (args.series > 0):
+    input_H, masks = get_snapshot_series(args.dataset, num_snapshots=args.series)
+    print("HG construction done!")
+    for iteration in range(args.iterations):
+        hgDecompose = HGDecompose()
+        hgDecompose.snapshot_series_core(deepcopy(input_H), masks, verbose=args.verbose)
+        result = pd.DataFrame()
+        for i in range(args.series):
+            entry = {}
+            entry['algo'] = 'series_local_core'
+            entry['dataset'] = args.dataset + "_" + str(i)
+            entry['core'] = hgDecompose.series_core[i]
+            entry['execution time'] = hgDecompose.series_time[i]
+            entry['num touched'] = hgDecompose.series_touched[i]
+            entry['total execution time'] = hgDecompose.execution_time
+            result = result.append(entry, ignore_index=True)
+        os.system("mkdir -p data/output")
+        result.to_csv('data/output/scal_result.csv', header=False,
+                                index=False, mode='a')
+        print(result[['dataset', 'execution time', 'num touched']])
+    quit()
+
 # Pandemic propagation
 if(args.sir or args.sir_exp2 or args.sir_exp3 or args.sir_exp3_explanation or args.sir_exp3_explanation_splen):
 
@@ -211,30 +251,74 @@ if(args.sir or args.sir_exp2 or args.sir_exp3 or args.sir_exp3_explanation or ar
 
 #     quit()
 
+# Automatic algorithm selection: cheap statistics of the binary dataset file => least predicted time
+auto_stats, auto_predicted = None, None
+if args.algo == "auto":
+    auto_stats = hg_statistics(get_arrayhg(args.dataset))
+    args.algo, auto_predicted = select_algorithm(auto_stats, num_threads=args.nthreads, models=fit(args.history))
+    print("auto: ", args.algo, " predicted times: ", {algo: value[0] for algo, value in auto_predicted.items()})
+
+record_stats = auto_stats
+if args.record and auto_stats is None:
+    record_stats = summary_statistics(get_binary_file(args.dataset))
+    baseline_memory = peak_memory_usage()
+
 # hyper-graph construction
 # H = get_hg_hnx(args.dataset)
-if args.algo.startswith('opt_local_core'):
+if args.algo.startswith('opt_local_core') or args.algo in ["partitioned_local_core", "anytime_local_core"]:
     input_H = get_localhg(args.dataset)
+elif args.algo == "approx_local_core":
+    input_H = get_arrayhg(args.dataset)
+elif args.algo == "external_local_core":
+    input_H = get_externalhg(args.dataset, buffer_size=args.buffer)
 else:
     input_H = get_hg(args.dataset)
+    if args.giant is not None:
+        input_H.set_giant_threshold(args.giant)
 print("HG construction done!")
 assert input_H is not None
 
+def get_exact_core(dataset):
+    """ Exact core numbers of dataset by naiveNBR, cached as in tests/test.py """
+    fname = "tests/tmp/" + dataset + ".pkl"
+    if(not os.path.isfile(fname)):
+        hgDecompose = HGDecompose()
+        hgDecompose.naiveNBR(get_hg(dataset), verbose=False)
+        os.system("mkdir -p tests/tmp")
+        with open(fname, 'wb') as handle:
+            pickle.dump(hgDecompose, handle, protocol= 4)
+    with open(fname, 'rb') as handle:
+        return pickle.load(handle).core
+
+prior_core, deleted, inserted = None, [], []
+if args.warm_start is not None:
+    if args.algo not in ["opt_local_core", "top_down"]:
+        raise RuntimeError("--warm_start is only supported by opt_local_core and top_down")
+    # Core numbers of the previous version and the hyperedge diff to the current one
+    old_H = get_hg(args.warm_start)
+    prior_core = get_exact_core(args.warm_start)
+    deleted, inserted = edge_diff(dict(old_H.edge_eid_iterator()), dict(get_hg(args.dataset).edge_eid_iterator()))
+    print("Warm start from ", args.warm_start, ": #deleted ", len(deleted), " #inserted ", len(inserted))
+
 
 
 for iteration in range(args.iterations):
-    H = deepcopy(input_H)
+    if args.algo == "external_local_core":
+        H = input_H # read-only, a copy would load the memory-mapped arrays
+    else:
+        H = deepcopy(input_H)
     entry = {}
     entry['algo'] = args.algo
     entry['dataset'] = args.dataset
     entry['num_threads'] = args.nthreads
+    entry['giant threshold'] = args.giant
     # run algo
-    hgDecompose = HGDecompose()
+    hgDecompose = HDecompose() if args.algo == "top_down" else HGDecompose()
     if(args.algo == "naive_nbr"):
-        hgDecompose.naiveNBR(H, verbose=args.verbose)
+        hgDecompose.naiveNBR(H, verbose=args.verbose, record_order=args.peel_order is not None)
 
     elif(args.algo == "improved_nbr"):
-        hgDecompose.improvedNBR(H, verbose=args.verbose)
+        hgDecompose.improvedNBR(H, verbose=args.verbose, record_order=args.peel_order is not None)
 
     elif(args.algo == "improved_nbr_simple"):
         hgDecompose.improvedNBR_simplified(H, verbose=False)
@@ -260,9 +344,24 @@ for iteration in range(args.iterations):
         # # hgDecompose.naiveDeg(G, verbose=args.verbose)
         # print(hgDecompose.core)
 
+    elif(args.algo == "top_down"):
+        hgDecompose.top_down(H, s=args.param_s, verbose=args.verbose, prior_core=prior_core, deleted=deleted, inserted=inserted)
+        entry['warm start'] = args.warm_start
+
+    elif(args.algo == "multi_core"):
+        # nbr, degree and clique-graph cores from one load of the hypergraph
+        hgDecompose.multi_core(H, verbose=args.verbose)
+        entry['degree core'] = hgDecompose.degree_core
+        entry['graph core'] = hgDecompose.graph_core
+        entry['variant time'] = hgDecompose.variant_time
+
     elif(args.algo == "improved2_nbr"):
         assert args.param_s > 0 # Is this assertion valid?
-        hgDecompose.improved2NBR(H, s=args.param_s, verbose=args.verbose)
+        if args.resume:
+            hgDecompose.resume(H, args.checkpoint, checkpoint_interval=args.checkpoint_interval, verbose=args.verbose)
+        else:
+            hgDecompose.improved2NBR(H, s=args.param_s, verbose=args.verbose, checkpoint=args.checkpoint, checkpoint_interval=args.checkpoint_interval)
+        entry['checkpoint time'] = hgDecompose.checkpoint_time
 
     elif (args.algo == 'par_improved2_nbr'):
         assert args.param_s > 0 # Is this assertion valid?
@@ -286,7 +385,12 @@ for iteration in range(args.iterations):
     
     elif(args.algo == "opt_local_core"):
         # Run local_core algorithm while storing core-correction ammount and other auxiliary information.
-        hgDecompose.opt_local_core(H, verbose=args.verbose, store_core_information=True, filename="data/output/"+args.dataset+"_local_core.csv", info_dic={'algo' : args.algo, 'dataset' : args.dataset, 'num_threads' : args.nthreads, 'outer iteration' : iteration})
+        if args.resume:
+            hgDecompose.resume(H, args.checkpoint, checkpoint_interval=args.checkpoint_interval, verbose=args.verbose)
+        else:
+            hgDecompose.opt_local_core(H, verbose=args.verbose, store_core_information=True, filename="data/output/"+args.dataset+"_local_core.csv", info_dic={'algo' : args.algo, 'dataset' : args.dataset, 'num_threads' : args.nthreads, 'outer iteration' : iteration}, prior_core=prior_core, deleted=deleted, inserted=inserted, checkpoint=args.checkpoint, checkpoint_interval=args.checkpoint_interval)
+        entry['warm start'] = args.warm_start
+        entry['checkpoint time'] = hgDecompose.checkpoint_time
         
         # Run local_core algorithm without storing other auxiliary information.
         # hgDecompose.opt_local_core(H, verbose=args.verbose, store_core_information=False)
@@ -307,6 +411,41 @@ for iteration in range(args.iterations):
     elif(args.algo == "par_local_core"):
         hgDecompose.par_local_core(H, verbose=args.verbose)
 
+    elif(args.algo == "approx_local_core"):
+        # Neighbourhood sizes estimated by HyperLogLog sketches (no neighbour sets)
+        hgDecompose.approx_local_core(H, p=args.precision, verbose=args.verbose)
+        entry['precision'] = args.precision
+        entry['error bound'] = hgDecompose.error_bound
+
+    elif(args.algo == "external_local_core"):
+        # Out-of-core: CSRs streamed from the binary dataset file in every iteration
+        hgDecompose.external_local_core(H, verbose=args.verbose)
+        entry['buffer'] = args.buffer
+        entry['bytes streamed'] = hgDecompose.bytes_streamed
+
+    elif(args.algo == "anytime_local_core"):
+        # Certified [lb, ub] per vertex after at most budget seconds
+        bounds = hgDecompose.anytime_local_core(H, time_budget=args.budget, verbose=args.verbose)
+        entry['budget'] = args.budget
+        entry['num certified'] = len(hgDecompose.certified)
+        entry['lower'] = hgDecompose.lower
+        entry['converged'] = hgDecompose.converged
+
+    elif(args.algo == "partitioned_local_core"):
+        # One worker process per part (num_threads parts), boundary values exchanged in rounds
+        hgDecompose.partitioned_local_core(H, num_parts=args.nthreads, verbose=args.verbose)
+        entry['num rounds'] = hgDecompose.num_rounds
+        entry['communication volume'] = hgDecompose.comm_volume
+        entry['num ghosts'] = hgDecompose.num_ghosts
+
+    elif(args.algo.startswith("comp_")):
+        # Decompose every connected component independently, e.g. comp_naiveNBR, comp_opt_local_core
+        hgDecompose.par_component_core(H, algo=args.algo[len("comp_"):], num_threads=args.nthreads, verbose=args.verbose)
+
+    elif(args.algo.startswith("twin_")):
+        # Decompose after collapsing twin vertices, e.g. twin_naiveNBR, twin_opt_local_core
+        hgDecompose.twin_compressed_core(H, algo=args.algo[len("twin_"):], verbose=args.verbose)
+
     else:
         raise RuntimeError(args.algo + " is not defined or implemented yet")
 
@@ -333,8 +472,34 @@ for iteration in range(args.iterations):
     entry['sum_core_correction_volume'] = hgDecompose.core_correction_volume  # For core_correction volume vs dataset plot
     entry['reduction_in_hhat']  = hgDecompose.reduction_hhat_n  # [ hhat^{n-1} - hhat^{n}, for n \in [1, tau] ] => Convergence plot.
 
+    if auto_stats is not None:
+        entry['auto'] = True
+        entry['predicted time'] = auto_predicted[args.algo][0]
+
+    if record_stats is not None:
+        # peak memory of the run on top of the interpreter. Not measured after the statistics of auto, whose in-memory
+        # hypergraph may have set the peak.
+        memory = peak_memory_usage() - baseline_memory if auto_stats is None else None
+        log_run(args.history, args.dataset, args.algo, hgDecompose.execution_time, memory, record_stats, predicted=auto_predicted)
+
+    if args.peel_order is not None and len(getattr(hgDecompose, "peel_order", [])):
+        # densest sub-hypergraph read off the recorded order (no second pass)
+        densest, density = hgDecompose.densest_subhypergraph(verbose=args.verbose)
+        entry['densest size'] = len(densest)
+        entry['densest density'] = density
+        if iteration == 0:
+            export_peel_order(args.peel_order, hgDecompose.peel_order, hgDecompose.peel_density, hgDecompose.core)
+
+    if args.edge_export is not None and iteration == 0:
+        # input_H still holds every hyperedge (H may have been consumed by the peeling)
+        e_ids, coreness, sizes = edge_coreness(input_H, hgDecompose.core, kind=args.edge_coreness)
+        export_edge_coreness(args.edge_export, e_ids, coreness, sizes)
+
     if(True):
         entry['memory taken'] = memory_usage_psutil()
+    if args.algo == "approx_local_core":
+        # errors of the estimated cores (after the memory is measured)
+        entry.update(core_error_stats(get_exact_core(args.dataset), hgDecompose.core))
     # print(entry)
     result = pd.DataFrame()
     result = result.append(entry, ignore_index=True)
@@ -0,0 +1,30 @@
+from hgDecompose.temporal import SlidingWindowCore
+from hgDecompose.utils import get_temporal_edges
+import argparse
+import pandas as pd
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-f", "--file", help="timestamped hypergraph (every line: timestamp,v1,v2,...)", type=str, required=True)
+parser.add_argument("-w", "--window", help="length of the sliding window", type=float, required=True)
+parser.add_argument("--step", help="the window advances by step time units", type=float, required=True)
+parser.add_argument("-v", "--verbose", action='store_true')
+
+args = parser.parse_args()
+
+temporal_edges = get_temporal_edges(args.file)
+print("#temporal edges: ", len(temporal_edges))
+sliding_window = SlidingWindowCore(args.window)
+for t, core in sliding_window.run(temporal_edges, args.step, verbose=args.verbose):
+    pass
+
+# per-step latency and touched-vertex counts
+result = pd.DataFrame(sliding_window.stats)
+result['file'] = args.file
+result['window'] = args.window
+result['step'] = args.step
+print(result[['time', 'latency', 'touched', 'num arrivals', 'num expirations']].describe())
+os.system("mkdir -p data/output")
+result.to_csv('data/output/temporal_result.csv', header=False, index=False, mode='a')
+print(", ".join(["\'" + column + "\'" for column in result.columns.tolist()]))
@@ -3,7 +3,7 @@ from hgDecompose.Hypergraph import Hypergraph
 sys.path.append("../")
 from hgDecompose.optimizedhgDecompose import HGDecompose
 from hgDecompose.IncidenceRep import HypergraphL
-from hgDecompose.utils import get_hg,get_localhg
+from hgDecompose.utils import get_hg,get_localhg,get_externalhg
 import argparse
 import pandas as pd
 import os
@@ -22,11 +22,15 @@ parser.add_argument("-s", "--param_s", help="parameter for improve2_nbr", defaul
 parser.add_argument("-nt", "--nthreads", help="number of threads for improve3_nbr", default=4, type=int)
 parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=0, type=int)
 parser.add_argument("--paramrand", "--parametric_randomtest", help="Number of Random Hypergraph to test", default=0, type=int)
+parser.add_argument("--max_n", help="Largest number of vertices of the random hypergraphs in --paramrand (nbr-core engines checked against naive_nbr, bipartitedist2core against the clique-graph core)", default=5, type=int)
+parser.add_argument("--giant", help="Size threshold of giant hyperedges (neighbour counts derived arithmetically), None => disabled", default=None, type=int)
+parser.add_argument("--buffer", help="external_local_core: #entries streamed from the binary dataset file at a time", default=1 << 20, type=int)
 
 args = parser.parse_args()
 print(args.paramrand)
 if (args.paramrand>0):
     from hgDecompose.utils import get_random_hg
+    from hgDecompose.ArrayRep import local_upper_bound
     import random
     N = int(args.paramrand) # Number of random tests to conduct per parameter.
     
@@ -83,8 +87,8 @@ if (args.paramrand>0):
 
     else:
         param_list = [] 
-        for n in range(5,6):
-            for m in range(3, 5):
+        for n in range(5,args.max_n+1):
+            for m in range(3, max(5, n//2)):
                 for card_max in range(3,n):
                     param_list.append(
                         {'n': n, 'm': m, 'card_max' : card_max}
@@ -102,34 +106,37 @@ if (args.paramrand>0):
                 print(i,' seed: ',seed)
                 Hg = get_random_hg(n = n, m = m, edge_size_ub = card_max, seed = seed)
                 # print(Hg)
-                Hg_cpy = deepcopy(Hg) 
+                nodes = list(Hg.init_node_iterator())
+                edgedict = dict(Hg.edge_eid_iterator())
 
-                # hgDecompose = HGDecompose()
-                # hgDecompose.improved2NBR(Hg, verbose=args.verbose)
-                # core_compared = hgDecompose.core
                 hgDecompose = HGDecompose()
-                hgDecompose.bipartitedist2core(Hg, verbose=args.verbose)
-                core_compared = hgDecompose.core
-
-                hgDecompose = HGDecompose()
-                hgDecompose.naiveNBR(Hg_cpy, verbose=args.verbose)
+                hgDecompose.naiveNBR(deepcopy(Hg), verbose=args.verbose)
                 core_base = hgDecompose.core
 
-                # print(core_base)
-                # print(core_compared)
-                if (len(core_base) != len(core_compared)):
-                    print(Hg)
-                assert len(core_base) == len(core_compared), "Two returned cores do not have same length: " + str(len(core_base)) + " != " + str(len(core_compared))
-                for v in core_base:
+                # nbr-core engines against naiveNBR (vertices without neighbours have core 0)
+                hgDecompose = HGDecompose()
+                hgDecompose.improvedNBR(deepcopy(Hg), verbose=args.verbose)
+                compared = {'improvedNBR': hgDecompose.core}
+                hgDecompose = HGDecompose()
+                hgDecompose.opt_local_core(HypergraphL(edgedict), verbose=args.verbose)
+                compared['opt_local_core'] = hgDecompose.core
+                for algo, core_compared in compared.items():
+                    for v in nodes:
+                        if (core_base.get(v, 0) != core_compared.get(v, 0)):
+                            print(Hg)
+                        assert core_base.get(v, 0) == core_compared.get(v, 0), algo + ": " + str(v)+" :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(core_compared.get(v, 0))
+
+                # distance-2 core of the bipartite incidence graph = core of the clique-expansion graph
+                core_graph = local_upper_bound(Hg.init_nodes, Hg.init_nbr)
+                hgDecompose = HGDecompose()
+                hgDecompose.bipartitedist2core(Hg, verbose=args.verbose)
+                core_compared = hgDecompose.core
+                assert len(core_graph) == len(core_compared), "Two returned cores do not have same length: " + str(len(core_graph)) + " != " + str(len(core_compared))
+                for v in core_graph:
                     assert v in core_compared, str(v) + " is not in core_compared"
-                    if (core_base[v] != core_compared[v]):
+                    if (core_graph[v] != core_compared[v]):
                         print(Hg)
-                    assert core_base[v] == core_compared[v], str(v)+" :Output core is different in " + str(core_base[v]) + " & " + str(core_compared[v])
-
-                # core_compared contains in core_base
-                for v in core_compared:
-                    assert v in core_base, str(v) + " is not in core_base"
-                    assert core_base[v] == core_compared[v], str(v)+" :Output core is different in " + str(core_base[v]) + " & " + str(core_compared[v])
+                    assert core_graph[v] == core_compared[v], str(v)+" :Output graph core is different in " + str(core_graph[v]) + " & " + str(core_compared[v])
 
                 print("\nAll tests passed")
     sys.exit(0)
@@ -216,10 +223,14 @@ else:
 
 
 # compared algo
-if args.algo.startswith('opt') and 'local' in args.algo:
+if (args.algo.startswith('opt') and 'local' in args.algo) or args.algo == "partitioned_local_core":
     H = get_localhg(args.dataset)
+elif args.algo == "external_local_core":
+    H = get_externalhg(args.dataset, buffer_size=args.buffer)
 else:
     H = get_hg(args.dataset)
+    if args.giant is not None:
+        H.set_giant_threshold(args.giant)
 H_copy = deepcopy(H)
 
 assert H is not None
@@ -335,6 +346,20 @@ elif(args.algo == "wlocal_core"):
 elif(args.algo == "par_local_core"):
     hgDecompose.par_local_core(H, verbose=args.verbose)
 
+elif(args.algo.startswith("comp_")):
+    # Decompose every connected component independently, e.g. comp_naiveNBR, comp_opt_local_core
+    hgDecompose.par_component_core(H, algo=args.algo[len("comp_"):], num_threads=args.nthreads, verbose=args.verbose)
+
+elif(args.algo.startswith("twin_")):
+    # Decompose after collapsing twin vertices, e.g. twin_naiveNBR, twin_opt_local_core
+    hgDecompose.twin_compressed_core(H, algo=args.algo[len("twin_"):], verbose=args.verbose)
+
+elif(args.algo == "external_local_core"):
+    hgDecompose.external_local_core(H, verbose=args.verbose)
+
+elif(args.algo == "partitioned_local_core"):
+    hgDecompose.partitioned_local_core(H, num_parts=args.nthreads, verbose=args.verbose)
+
 else:
     raise RuntimeError(args.algo + " is not defined or implemented yet")
 
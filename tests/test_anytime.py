@@ -0,0 +1,53 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_localhg, get_random_hg
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(H, make_local, verbose = False):
+    """
+    Intervals of anytime_local_core must contain the core numbers of naiveNBR when the time budget runs out, and be
+    exact once the lower-bound phase completes, for every iteration budget
+    """
+    nodes = list(H.node_iterator())
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(H, verbose=False)
+    core_base = {v: hgDecompose.core.get(v, 0) for v in nodes} # vertices without neighbours have core 0
+    hgDecompose = HGDecompose()
+    bounds = hgDecompose.anytime_local_core(make_local(), time_budget = 0, verbose = False)
+    for v in core_base:
+        lb, ub = bounds[v]
+        assert lb <= core_base[v] <= ub, str(v) + " :core " + str(core_base[v]) + " not in [" + str(lb) + "," + str(ub) + "]"
+        assert (v in hgDecompose.certified) == (lb == ub)
+    if verbose:
+        print('time budget 0: #certified: ', len(hgDecompose.certified), '/', len(bounds), 
+              ' mean width: ', sum(ub - lb for lb, ub in bounds.values()) / len(bounds))
+    for max_iterations in [1, 2, None]:
+        hgDecompose = HGDecompose()
+        bounds = hgDecompose.anytime_local_core(make_local(), max_iterations = max_iterations, verbose = False)
+        assert hgDecompose.converged and len(hgDecompose.certified) == len(core_base)
+        for v in core_base:
+            assert bounds[v] == (core_base[v], core_base[v]), str(v) + " :core " + str(core_base[v]) + " but " + str(bounds[v])
+            assert hgDecompose.core[v] == core_base[v]
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    for j in range(random.randint(0, 3)): # singleton hyperedges, on an existing vertex or on a new one
+        edgedict[max(edgedict) + 1] = (random.choice(edgedict[min(edgedict)]) if random.random() < 0.5 else 'isolated' + str(j),)
+    check(Hypergraph(edgedict), lambda: HypergraphL(edgedict), verbose = args.verbose)
+
+check(get_hg(args.dataset), lambda: get_localhg(args.dataset), verbose = True)
+print("All tests passed")
@@ -0,0 +1,72 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.ArrayRep import to_arrayhg
+from hgDecompose.autoselect import hg_statistics, select_algorithm, fit, log_run, engines, component_engines, default_models
+from hgDecompose.utils import get_arrayhg, get_random_hg
+import argparse
+import random
+import math
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(A, verbose = False):
+    """ Compares the vectorised statistics against loops over the hypergraph, and the selection against the predictions """
+    stats = hg_statistics(A)
+    edges = [list(A.get_edge_byindex(i)) for i in range(A.get_M())]
+    inc = {j: [edges[i] for i in A.inc_edge_indices(j)] for j in range(A.get_N())}
+    assert stats['N'] == A.get_N() and stats['M'] == len(edges) and stats['incidences'] == sum(len(e) for e in edges)
+    assert stats['max edge size'] == max(len(e) for e in edges)
+    glb = min(A.init_nbrsize)
+    llb = {j: max(max(len(e) for e in inc[j]) - 1, glb) for j in inc}
+    lub = A.lub.tolist()
+    assert math.isclose(stats['tight fraction'], sum(llb[j] >= lub[j] for j in inc) / len(inc))
+    vol = {j: sum(len(e) for e in inc[j]) for j in inc}
+    assert math.isclose(stats['naive_nbr work'], sum(vol[j] * len(inc[j]) for j in inc))
+    assert math.isclose(stats['top_down work'], sum(vol[j] * len(inc[j]) if llb[j] < lub[j] else vol[j] for j in inc))
+    assert stats['num lub values'] == len(set(lub))
+
+    algo, predicted = select_algorithm(stats)
+    assert set(predicted) == set(engines) and predicted[algo][0] == min(p[0] for p in predicted.values())
+    algo, predicted = select_algorithm(stats, num_threads = 4)
+    assert (len(predicted) > len(engines)) == (stats['num components'] > 1)
+    for engine, comp_algo in component_engines.items():
+        if comp_algo in predicted:
+            assert predicted[comp_algo][1] <= predicted[engine][1]
+    if verbose:
+        print(stats)
+        print(algo, predicted)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    A = to_arrayhg(Hypergraph({e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}))
+    A.compute_local_upperbound()
+    check(A, verbose = args.verbose)
+
+A = get_arrayhg(args.dataset)
+check(A, verbose = True)
+
+# fitting: a logged engine 10 times slower than predicted gets a 10 times larger cost per work
+history_file = "tests/tmp/auto_history.csv"
+if os.path.isfile(history_file):
+    os.remove(history_file)
+stats = hg_statistics(A)
+algo, predicted = select_algorithm(stats)
+for _ in range(2):
+    log_run(history_file, args.dataset, algo, 10 * predicted[algo][0], None, stats, predicted = predicted)
+assert fit(history_file) == default_models
+log_run(history_file, args.dataset, algo, 10 * predicted[algo][0], None, stats, predicted = predicted)
+models = fit(history_file)
+assert math.isclose(models[algo][0][1], 10 * default_models[algo][0][1])
+assert models[algo][1] == default_models[algo][1], "memory refitted without measurements"
+assert all(models[engine] == default_models[engine] for engine in default_models if engine != algo)
+os.remove(history_file)
+print("All tests passed")
@@ -0,0 +1,89 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_localhg, get_random_hg
+import argparse
+import random
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=30, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+checkpoint = "tests/tmp/test_checkpoint.pkl"
+os.system("mkdir -p tests/tmp")
+
+class Preempted(Exception):
+    pass
+
+class PreemptedDecompose(HGDecompose):
+    """ Stops improved2NBR after num_intervals intervals, as a preemption would """
+    def __init__(self, num_intervals):
+        super().__init__()
+        self.num_intervals = num_intervals
+
+    def Core_decomp(self, *args):
+        if self.num_intervals == 0:
+            raise Preempted()
+        self.num_intervals -= 1
+        super().Core_decomp(*args)
+
+def check(make_H, make_local, verbose = False):
+    """ Runs stopped after every possible point and resumed from their checkpoint must match uninterrupted runs """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(make_H(), verbose=False)
+    core_base = hgDecompose.core
+
+    # opt_local_core stopped after i iterations
+    i = 1
+    while True:
+        if os.path.isfile(checkpoint):
+            os.remove(checkpoint)
+        hgDecompose = HGDecompose()
+        hgDecompose.opt_local_core(make_local(), verbose=False, checkpoint=checkpoint, checkpoint_interval=0, max_iterations=i)
+        if hgDecompose.converged:
+            break
+        resumed = HGDecompose()
+        resumed.resume(make_local(), checkpoint, checkpoint_interval=0, verbose=False)
+        assert resumed.core == core_base, "opt_local_core resumed after " + str(i) + " iterations differs"
+        if verbose:
+            print('opt_local_core resumed after ', i, ' iterations, #checkpoints: ', hgDecompose.num_checkpoints + resumed.num_checkpoints, 
+                  ' checkpoint time: ', hgDecompose.checkpoint_time + resumed.checkpoint_time)
+        i += 1
+
+    # improved2NBR stopped after i intervals, compared against an uninterrupted run
+    hgDecompose = HGDecompose()
+    hgDecompose.improved2NBR(make_H(), s=1, verbose=False)
+    core_top_down = hgDecompose.core
+    i = 1
+    while True:
+        if os.path.isfile(checkpoint):
+            os.remove(checkpoint)
+        hgDecompose = PreemptedDecompose(i)
+        try:
+            hgDecompose.improved2NBR(make_H(), s=1, verbose=False, checkpoint=checkpoint, checkpoint_interval=0)
+            break
+        except Preempted:
+            pass
+        resumed = HGDecompose()
+        resumed.resume(make_H(), checkpoint, checkpoint_interval=0, verbose=False)
+        assert resumed.core == core_top_down, "improved2NBR resumed after " + str(i) + " intervals differs"
+        if verbose:
+            print('improved2NBR resumed after ', i, ' intervals, checkpoint time: ', hgDecompose.checkpoint_time + resumed.checkpoint_time)
+        i += 1
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = {e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}
+    check(lambda: Hypergraph(edgedict), lambda: HypergraphL(edgedict), verbose = args.verbose)
+
+check(lambda: get_hg(args.dataset), lambda: get_localhg(args.dataset), verbose = True)
+os.remove(checkpoint)
+print("All tests passed")
@@ -0,0 +1,70 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from copy import deepcopy
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=20, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def random_components(num_components):
+    """
+    Disjoint union of random connected hypergraphs, singleton components (one vertex, one hyperedge) and two-vertex
+    components. Returns: (edge dictionary, number of components)
+    """
+    edgedict = {}
+    num_comp = 0
+    for c in range(num_components):
+        kind = random.choice(['random', 'singleton', 'pair'])
+        if kind == 'singleton':
+            edgedict[len(edgedict)] = ('s' + str(c),)
+            num_comp += 1
+        elif kind == 'pair':
+            edgedict[len(edgedict)] = ('p' + str(c) + 'a', 'p' + str(c) + 'b')
+            num_comp += 1
+        else:
+            n = random.randint(3, 12)
+            # a path through all vertices keeps the component connected
+            edges = [(i, i + 1) for i in range(n - 1)]
+            Hg = get_random_hg(n = n, m = random.randint(1, n), edge_size_ub = random.randint(2, min(n, 5)), seed = random.randint(0, 1000000))
+            edges += [e for _, e in Hg.edge_eid_iterator()]
+            for e in edges:
+                edgedict[len(edgedict)] = tuple('r' + str(c) + '_' + str(v) for v in e)
+            num_comp += 1
+    return edgedict, num_comp
+
+def check(edgedict, num_comp = None, verbose = False):
+    """ par_component_core must match naiveNBR on the whole hypergraph, run in one process and in a Pool """
+    H = Hypergraph(edgedict)
+    nodes = list(H.init_node_iterator())
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(deepcopy(H), verbose=False)
+    core_base = hgDecompose.core
+    for algo in ['naiveNBR', 'opt_local_core']:
+        for num_threads in [1, 3]:
+            hgDecompose = HGDecompose()
+            # small batches => several batches, i.e. the Pool is used when num_threads > 1
+            hgDecompose.par_component_core(deepcopy(H), algo = algo, num_threads = num_threads, batch_size = 8, verbose = False)
+            if num_comp is not None:
+                assert hgDecompose.num_components == num_comp, "#components " + str(hgDecompose.num_components) + " != " + str(num_comp)
+            for v in nodes:
+                # vertices without neighbours have core 0
+                assert hgDecompose.core.get(v, 0) == core_base.get(v, 0), \
+                    algo + " (" + str(num_threads) + " threads): " + str(v) + " :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(hgDecompose.core.get(v, 0))
+            if verbose:
+                print(algo, num_threads, 'threads: #components ', hgDecompose.num_components, ' time ', hgDecompose.execution_time)
+
+for i in range(args.rand):
+    random.seed(i)
+    edgedict, num_comp = random_components(random.randint(1, 8))
+    check(edgedict, num_comp, verbose = args.verbose)
+
+check(dict(get_hg(args.dataset).edge_eid_iterator()), verbose = True)
+print("All tests passed")
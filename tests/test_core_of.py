@@ -0,0 +1,44 @@
+import sys
+sys.path.append("../")
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_localhg, get_random_hg
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-q", "--queries", help="Number of query vertices on the dataset", default=5, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(H, H_local, vertices, verbose = False):
+    """ Compares core_of on the query vertices against naiveNBR """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(H, verbose=False)
+    core_base = hgDecompose.core
+    hgDecompose = HGDecompose()
+    result = hgDecompose.core_of(H_local, vertices, verbose=False)
+    for v in vertices:
+        assert core_base[v] == result[v][0], str(v)+" :Output core is different in " + str(core_base[v]) + " & " + str(result[v][0])
+        if verbose:
+            print(v, ' core: ', result[v][0], ' touched: ', result[v][1])
+    if verbose:
+        print('core_of time: ', hgDecompose.execution_time)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    H_local = HypergraphL({e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1})
+    vertices = [v for v in H_local.init_node_iterator()]
+    check(Hg, H_local, random.sample(vertices, min(len(vertices), 3)), verbose = args.verbose)
+
+H_local = get_localhg(args.dataset)
+random.seed(0)
+vertices = [v for v in H_local.init_node_iterator()]
+check(get_hg(args.dataset), H_local, random.sample(vertices, min(len(vertices), args.queries)), verbose = True)
+print("All tests passed")
@@ -0,0 +1,54 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from tests.verify_kcore import construct_subgraph_from_core_number
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(H, verbose = False):
+    """ Compares the queries of CoreResult against scans of the core dict and of the hyperedges """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(H, verbose=False)
+    core = hgDecompose.core
+    start_time = time()
+    result = hgDecompose.get_result(H)
+    if verbose:
+        print('index time: ', time() - start_time)
+    assert len(result) == len(core) and all(result[v] == core[v] for v in core)
+    histogram = {}
+    for v in core:
+        histogram[core[v]] = histogram.get(core[v], 0) + 1
+    assert result.histogram() == histogram
+    assert list(result.histogram()) == sorted(histogram, reverse = True)
+    max_core, innermost = result.innermost()
+    assert max_core == max(core.values()) and set(innermost) == set(v for v in core if core[v] == max_core)
+    for k in range(-1, max_core + 2):
+        assert set(result.vertices_at_least(k)) == set(v for v in core if core[v] >= k), "vertices of the " + str(k) + "-core differ"
+        assert set(result.vertices_with_core(k)) == set(v for v in core if core[v] == k)
+        assert result.num_at_least(k) == len(result.vertices_at_least(k))
+        expected = set(e_id for e_id, e in H.edge_eid_iterator() if all(core.get(v, 0) >= k for v in e)) # vertices without neighbours have core 0
+        assert set(result.edges_at_least(k)) == expected, "hyperedges of the " + str(k) + "-core differ"
+        kcore = construct_subgraph_from_core_number(H, k, result)
+        assert set(kcore.e_indices) == expected
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    for j in range(random.randint(0, 3)): # singleton hyperedges, on an existing vertex or on a new one
+        edgedict[max(edgedict) + 1] = (random.choice(edgedict[min(edgedict)]) if random.random() < 0.5 else 'isolated' + str(j),)
+    check(Hypergraph(edgedict), verbose = args.verbose)
+
+check(get_hg(args.dataset), verbose = True)
+print("All tests passed")
@@ -0,0 +1,73 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.coreresult import export_peel_order
+from hgDecompose.utils import get_hg, get_random_hg
+from copy import deepcopy
+import pandas as pd
+import argparse
+import random
+import math
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+os.system("mkdir -p tests/tmp")
+
+def check(H, verbose = False):
+    """ Checks the recorded removal order and densities against the strongly induced sub-hypergraphs of its suffixes """
+    edges = [set(e) for _, e in H.edge_eid_iterator()]
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(deepcopy(H), verbose=False)
+    core = {v: hgDecompose.core.get(v, 0) for v in H.init_nodes} # vertices without neighbours have core 0
+    best = {}
+    for algo in ['naiveNBR', 'improvedNBR']:
+        hgDecompose = HGDecompose()
+        getattr(hgDecompose, algo)(deepcopy(H), verbose=False, record_order=True)
+        assert all(hgDecompose.core.get(v, 0) == core[v] for v in core), algo + ": recording changed the core numbers"
+        order = hgDecompose.peel_order
+        assert sorted(order) == sorted(H.init_nodes)
+        assert all(core[order[i]] <= core[order[i + 1]] for i in range(len(order) - 1))
+        for i in range(len(order)):
+            left = set(order[i:])
+            expected = sum(1 for e in edges if e <= left) / len(left)
+            assert math.isclose(hgDecompose.peel_density[i], expected), algo + ": density differs"
+        densest, density = hgDecompose.densest_subhypergraph(verbose=False)
+        assert math.isclose(density, max(hgDecompose.peel_density))
+        assert math.isclose(sum(1 for e in edges if e <= set(densest)) / len(densest), density)
+        best[algo] = density
+
+    # without a recorded order, naiveNBR is run
+    hgDecompose = HGDecompose()
+    densest, density = hgDecompose.densest_subhypergraph(deepcopy(H), verbose=False)
+    assert density == best['naiveNBR']
+
+    export_peel_order("tests/tmp/peel_order.csv", hgDecompose.peel_order, hgDecompose.peel_density, hgDecompose.core)
+    df = pd.read_csv("tests/tmp/peel_order.csv", dtype={'vertex': str})
+    assert df['vertex'].tolist() == [str(v) for v in hgDecompose.peel_order]
+    assert df['core'].tolist() == [core[v] for v in hgDecompose.peel_order]
+    if verbose:
+        print('densest sub-hypergraph: ', len(densest), ' vertices, density ', density)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    for j in range(random.randint(0, 3)): # singleton hyperedges, on an existing vertex or on a new one
+        edgedict[max(edgedict) + 1] = (random.choice(edgedict[min(edgedict)]) if random.random() < 0.5 else 'isolated' + str(j),)
+    check(Hypergraph(edgedict), verbose = args.verbose)
+
+# the vertex without neighbours is removed first: all 5 vertices have 3 hyperedges, {a, b, c, d} has 2
+hgDecompose = HGDecompose()
+hgDecompose.naiveNBR(Hypergraph({0: ('a', 'b', 'c'), 1: ('c', 'd'), 2: ('e',)}), verbose=False, record_order=True)
+assert hgDecompose.peel_order[0] == 'e' and hgDecompose.peel_density[:2] == [0.6, 0.5]
+check(get_hg(args.dataset), verbose = True)
+os.remove("tests/tmp/peel_order.csv")
+print("All tests passed")
@@ -0,0 +1,85 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.dynamic import DynamicCoreIndex
+from hgDecompose.temporal import SlidingWindowCore
+from hgDecompose.utils import get_random_hg
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("--updates", help="Number of edge insertions/deletions per hypergraph", default=30, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(index):
+    """ Compares the maintained cores against naiveNBR on a fresh copy of the current hypergraph """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph({e_id: e for e_id, e in index.H.edge_eid_iterator()}), verbose=False)
+    core_base = hgDecompose.core
+    for v in index.core:
+        assert core_base.get(v, 0) == index.core[v], str(v)+" :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(index.core[v])
+    for v in core_base:
+        assert v in index.core, str(v) + " is not in the index"
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 20)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    index = DynamicCoreIndex(Hg)
+    check(index)
+    next_eid = max(Hg.e_indices) + 1
+    for _ in range(args.updates):
+        if random.random() < 0.5 and Hg.get_M() > 1:
+            e_id = random.choice(sorted(Hg.e_indices))
+            if args.verbose:
+                print('delete ', e_id, Hg.get_edge_byindex(e_id))
+            index.delete_edge(e_id)
+        else:
+            e = [str(v) for v in random.sample(range(1, n + 4), random.randint(1, 6))]
+            if args.verbose:
+                print('insert ', next_eid, e)
+            index.insert_edge(next_eid, e)
+            next_eid += 1
+        check(index)
+        if args.verbose:
+            print('touched: ', index.last_touched, ' time: ', index.last_update_time)
+
+# Batches of deletions and insertions
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 20)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    index = DynamicCoreIndex(Hg)
+    next_eid = max(Hg.e_indices) + 1
+    for _ in range(args.updates // 5):
+        deletions = random.sample(sorted(Hg.e_indices), random.randint(0, Hg.get_M() - 1))
+        insertions = []
+        for _ in range(random.randint(0, 5)):
+            insertions.append((next_eid, [str(v) for v in random.sample(range(1, n + 4), random.randint(1, 6))]))
+            next_eid += 1
+        if args.verbose:
+            print('delete ', deletions, ' insert ', insertions)
+        index.apply_batch(deletions = deletions, insertions = insertions)
+        check(index)
+
+# Sliding window
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 20)
+    temporal_edges = sorted([(random.randint(0, 50), tuple(str(v) for v in random.sample(range(1, n + 1), random.randint(1, min(n, 5))))) for _ in range(random.randint(5, 60))])
+    window = random.randint(1, 15)
+    sliding_window = SlidingWindowCore(window)
+    for t, core in sliding_window.run(temporal_edges, random.randint(1, 5)):
+        alive = {e_id: e for e_id, (timestamp, e) in enumerate(temporal_edges) if t - window < timestamp <= t}
+        hgDecompose = HGDecompose()
+        hgDecompose.naiveNBR(Hypergraph(alive), verbose=False)
+        for v in core:
+            assert hgDecompose.core.get(v, 0) == core[v], str(v)+" :Output core is different in " + str(hgDecompose.core.get(v, 0)) + " & " + str(core[v])
+        for v in hgDecompose.core:
+            assert v in core, str(v) + " is not in the window"
+
+print("All tests passed")
@@ -0,0 +1,73 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import to_arrayhg
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.coreresult import edge_coreness, export_edge_coreness
+from hgDecompose.ExternalRep import mmap_npz
+from hgDecompose.utils import get_hg, get_random_hg
+from copy import deepcopy
+import numpy as np
+import pandas as pd
+import argparse
+import random
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+os.system("mkdir -p tests/tmp")
+
+def check(H, verbose = False):
+    """ Compares the hyperedge coreness arrays against a loop over the hyperedges, for every representation, and the exports """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(deepcopy(H), verbose=False)
+    core = {v: hgDecompose.core.get(v, 0) for v in H.node_iterator()} # vertices without neighbours have core 0
+    edges = dict(H.edge_eid_iterator())
+    e_ids, coreness, sizes = hgDecompose.get_edge_coreness(H)
+    assert e_ids.tolist() == list(edges)
+    assert coreness.tolist() == [min(core[v] for v in e) for e in edges.values()]
+    assert sizes.tolist() == [len(e) for e in edges.values()]
+    _, max_coreness, _ = edge_coreness(H, core, kind='max')
+    assert max_coreness.tolist() == [max(core[v] for v in e) for e in edges.values()]
+
+    # HypergraphL, and HypergraphA with the core numbers as an array of vertex indices
+    assert edge_coreness(HypergraphL(edges), hgDecompose.core)[1].tolist() == coreness.tolist()
+    A = to_arrayhg(H)
+    assert edge_coreness(A, np.array([core[v] for v in A.init_nodes]))[1].tolist() == coreness.tolist()
+
+    # candidate hyperedges of the intervention experiment
+    max_core = max(core.values())
+    expected = H.get_stronglyinduced_edgeIds([v for v in core if core[v] == max_core])
+    assert sorted(e_ids[coreness == max_core].tolist()) == sorted(expected)
+
+    export_edge_coreness("tests/tmp/edge_coreness.csv", e_ids, coreness, sizes, chunk_size=7)
+    df = pd.read_csv("tests/tmp/edge_coreness.csv")
+    assert df['edge_id'].tolist() == e_ids.tolist() and df['coreness'].tolist() == coreness.tolist() and df['size'].tolist() == sizes.tolist()
+    export_edge_coreness("tests/tmp/edge_coreness.npz", e_ids, coreness, sizes)
+    arrays = mmap_npz("tests/tmp/edge_coreness.npz")
+    assert arrays['edge_id'].tolist() == e_ids.tolist() and arrays['coreness'].tolist() == coreness.tolist()
+    if verbose:
+        print('#hyperedges: ', len(e_ids), ' max coreness: ', max(coreness))
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    # singleton hyperedges, on vertices with neighbours and on vertices without any
+    nodes = sorted(set(v for e in edgedict.values() for v in e))
+    e_id = max(edgedict) + 1
+    for j in range(random.randint(0, 3)):
+        edgedict[e_id + j] = (random.choice(nodes) if random.random() < 0.5 else 'isolated' + str(j),)
+    check(Hypergraph(edgedict), verbose = args.verbose)
+
+check(get_hg(args.dataset), verbose = True)
+os.remove("tests/tmp/edge_coreness.csv")
+os.remove("tests/tmp/edge_coreness.npz")
+print("All tests passed")
@@ -0,0 +1,79 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import to_arrayhg, save_arrayhg, load_arrayhg, local_upper_bound
+from hgDecompose.autoselect import summary_statistics, hg_statistics, model_statistics, estimate, fit, log_run, default_models
+from hgDecompose.utils import get_binary_file, get_random_hg
+import argparse
+import random
+import math
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+os.system("mkdir -p tests/tmp")
+
+def check(H, fname, verbose = False):
+    """ Compares the summary statistics read from the binary file against loops over the hypergraph """
+    stats = summary_statistics(fname, sample_size = H.get_N())
+    edges = [e for _, e in H.edge_eid_iterator()]
+    assert stats['N'] == H.get_N() and stats['M'] == len(edges)
+    assert stats['incidences'] == sum(len(e) for e in edges)
+    assert stats['sum sq edge size'] == sum(len(e) ** 2 for e in edges)
+    sizes = [len(e) for e in edges]
+    assert stats['edge size histogram'] == [sizes.count(k) for k in range(max(sizes) + 1)]
+    degrees = [H.degree(v) for v in H.init_nodes]
+    assert stats['degree histogram'] == [degrees.count(k) for k in range(max(degrees) + 1)]
+    vol = {v: sum(len(H.get_edge_byindex(e_id)) for e_id in H.inc_dict[v]) for v in H.init_nodes}
+    assert math.isclose(stats['naive_nbr work'], sum(vol[v] * H.degree(v) for v in H.init_nodes))
+    # every vertex sampled => exact sum of neighbourhood sizes
+    assert math.isclose(stats['sum nbrsize'], sum(H.init_nbrsize.values()))
+    lub = local_upper_bound(H.init_nodes, H.init_nbr)
+    assert stats['lub range'] == max(lub.values()) - min(lub.values())
+    # same model statistics as the in-memory statistics of auto
+    in_memory = hg_statistics(load_arrayhg(fname))
+    assert all(math.isclose(stats[key], in_memory[key]) for key in model_statistics), "model statistics differ"
+
+    result = estimate(stats, baseline_memory = 10)
+    assert set(result) == set(default_models) and all(time >= 0 and memory >= 10 for time, memory in result.values())
+    if verbose:
+        print({key: value for key, value in stats.items() if not isinstance(value, list)})
+        print(result)
+    return stats
+
+fname = "tests/tmp/estimator.npz"
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    _edgedict = {e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}
+    save_arrayhg(to_arrayhg(HypergraphL(_edgedict)), fname)
+    check(Hypergraph(_edgedict), fname, verbose = args.verbose)
+if os.path.isfile(fname):
+    os.remove(fname)
+
+from hgDecompose.utils import get_hg
+stats = check(get_hg(args.dataset), get_binary_file(args.dataset), verbose = True)
+
+# fitting: runs 3 times slower and using twice the memory of the defaults give 3 and 2 times larger costs per unit
+history_file = "tests/tmp/estimate_history.csv"
+if os.path.isfile(history_file):
+    os.remove(history_file)
+assert fit(history_file) == default_models
+predicted = estimate(stats, algos = ['naive_nbr'])['naive_nbr']
+for _ in range(3):
+    log_run(history_file, args.dataset, 'naive_nbr', 3 * predicted[0], 2 * predicted[1], stats)
+models = fit(history_file)
+assert math.isclose(models['naive_nbr'][0][1], 3 * default_models['naive_nbr'][0][1])
+assert math.isclose(models['naive_nbr'][1][1], 2 * default_models['naive_nbr'][1][1])
+assert all(models[algo] == default_models[algo] for algo in default_models if algo != 'naive_nbr')
+refit = estimate(stats, algos = ['naive_nbr'], models = models)['naive_nbr']
+assert math.isclose(refit[0], 3 * predicted[0]) and math.isclose(refit[1], 2 * predicted[1])
+os.remove(history_file)
+print("All tests passed")
@@ -0,0 +1,87 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.ArrayRep import HypergraphA, save_arrayhg, load_arrayhg
+from hgDecompose.ExternalRep import HypergraphE, build_binary_file, mmap_npz
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+import numpy as np
+import argparse
+import random
+import tempfile
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=30, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+arrays = ['init_nodes', 'e_ids', 'e_ptr', 'e_nodes', 'v_ptr', 'v_edges', 'nbr_ptr', 'nbr_idx', 'lub']
+
+def check(edgedict, tmp, verbose = False):
+    """
+    The binary dataset file streamed from the text file (build_binary_file) must equal save_arrayhg of the in-memory
+    HypergraphA for every chunk size, its memory-mapped reload must equal the in-memory CSRs and external_local_core
+    must match naiveNBR for every buffer size. Small sizes split rows and hyperedges across chunks and windows.
+    """
+    edgedict = {i: tuple(str(v) for v in e) for i, e in enumerate(edgedict.values())}
+    text_fname = os.path.join(tmp, 'hg.hyp')
+    with open(text_fname, 'w') as f:
+        for e in edgedict.values():
+            f.write(','.join(e) + '\n')
+    A = HypergraphA(edgedict)
+    save_arrayhg(A, os.path.join(tmp, 'memory.npz'))
+    expected = load_arrayhg(os.path.join(tmp, 'memory.npz'))
+
+    # memory-mapped reload of the file written from memory
+    mapped = mmap_npz(os.path.join(tmp, 'memory.npz'))
+    for name in ['e_ptr', 'e_nodes', 'v_ptr', 'v_edges', 'nbr_ptr', 'nbr_idx', 'lub']:
+        assert np.array_equal(np.asarray(mapped[name]), getattr(A, name)), "mmap_npz: " + name + " differs"
+    assert mapped['init_nodes'].tolist() == A.init_nodes
+    del mapped
+
+    total = int(A.e_ptr[-1])
+    for chunk_size in sorted(set([1, 2, 3, max(1, total // 2), total + 1])):
+        fname = os.path.join(tmp, 'stream' + str(chunk_size) + '.npz')
+        build_binary_file(text_fname, fname, chunk_size = chunk_size)
+        built = mmap_npz(fname)
+        for name in arrays:
+            assert np.array_equal(np.asarray(built[name]), np.load(os.path.join(tmp, 'memory.npz'))[name]), \
+                "build_binary_file (chunk size " + str(chunk_size) + "): " + name + " differs"
+        built = load_arrayhg(fname)
+        assert built.init_nodes == expected.init_nodes
+        assert np.array_equal(built.lub, expected.lub)
+        del built
+
+    hgDecompose = HGDecompose()
+    H = Hypergraph(edgedict)
+    nodes = list(H.init_node_iterator())
+    hgDecompose.naiveNBR(H, verbose=False)
+    core_base = hgDecompose.core
+    for buffer_size in sorted(set([1, 2, 3, max(1, total // 3), total + 1])):
+        X = HypergraphE(os.path.join(tmp, 'stream1.npz'), buffer_size = buffer_size)
+        assert np.array_equal(X.lub, A.lub)
+        hgDecompose = HGDecompose()
+        hgDecompose.external_local_core(X, verbose=False)
+        for v in nodes:
+            # vertices without neighbours have core 0
+            assert hgDecompose.core[v] == core_base.get(v, 0), \
+                "buffer size " + str(buffer_size) + ": " + str(v) + " :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(hgDecompose.core[v])
+        if verbose:
+            print('buffer size ', buffer_size, ': #iterations ', hgDecompose.max_n, ' bytes streamed ', hgDecompose.bytes_streamed)
+        del X
+
+with tempfile.TemporaryDirectory() as tmp:
+    for i in range(args.rand):
+        random.seed(i)
+        n = random.randint(5, 30)
+        Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+        edgedict = dict(Hg.edge_eid_iterator())
+        for j in range(random.randint(0, 2)):
+            edgedict[max(edgedict)+1] = (random.choice(edgedict[min(edgedict)]) if random.random()<0.5 else 'isolated'+str(j),)
+        check(edgedict, tmp, verbose = args.verbose)
+
+    check(dict(get_hg(args.dataset).edge_eid_iterator()), tmp, verbose = True)
+print("All tests passed")
@@ -0,0 +1,95 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.optimizedGDecompose import HDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from contextlib import redirect_stdout
+from time import time
+import io
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-g", "--giant", help="Size threshold of giant hyperedges", default=3, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=30, type=int)
+parser.add_argument("--bench", help="also time naiveNBR and improvedNBR_simplified with and without the threshold on a hypergraph with a few giant hyperedges", action='store_true')
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+algos = ['naiveNBR', 'improvedNBR', 'improvedNBR_simplified', 'improved2NBR', 'top_down']
+
+def run(algo, H):
+    # improved2NBR and top_down print their progress even when not verbose
+    with redirect_stdout(io.StringIO()):
+        if algo == 'top_down':
+            hgDecompose = HDecompose()
+            hgDecompose.top_down(H, verbose=False)
+        else:
+            hgDecompose = HGDecompose()
+            getattr(hgDecompose, algo)(H, verbose=False)
+    return hgDecompose
+
+def check(edgedict, giant_threshold, verbose = False):
+    """
+    Every peeling algorithm must give the same cores with giant hyperedges (set_giant_threshold) as without, and
+    get_number_of_nbrs_giant must equal the enumerated neighbourhood size while the vertices are removed one by one.
+    """
+    H = Hypergraph(edgedict)
+    nodes = list(H.init_node_iterator())
+    H.set_giant_threshold(giant_threshold)
+    order = list(nodes)
+    random.shuffle(order)
+    for v in order:
+        for u in H.node_iterator():
+            assert H.get_number_of_nbrs(u) == len(H.neighbors(u)), str(u) + ": #neighbours differ"
+        H.removeV_transform(v)
+
+    for algo in algos:
+        core_base = run(algo, Hypergraph(edgedict)).core
+        H = Hypergraph(edgedict)
+        H.set_giant_threshold(giant_threshold)
+        hgDecompose = run(algo, H)
+        for v in nodes:
+            assert hgDecompose.core.get(v, 0) == core_base.get(v, 0), \
+                algo + ": " + str(v) + " :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(hgDecompose.core.get(v, 0))
+        if verbose:
+            print(algo, ': ', hgDecompose.execution_time)
+
+def bench(num_nodes = 6000, num_giant = 4, giant_size = 1500, num_small = 8000, seed = 1):
+    """ naiveNBR and improvedNBR_simplified with and without the threshold, on num_giant giant and num_small 2-4 member hyperedges """
+    random.seed(seed)
+    nodes = list(range(num_nodes))
+    edgedict = {}
+    for _ in range(num_giant):
+        edgedict[len(edgedict)] = tuple(random.sample(nodes, giant_size))
+    for _ in range(num_small):
+        edgedict[len(edgedict)] = tuple(random.sample(nodes, random.randint(2, 4)))
+    for algo in ['naiveNBR', 'improvedNBR_simplified']:
+        H = Hypergraph(edgedict)
+        start_time = time()
+        core_base = run(algo, H).core
+        base_time = time() - start_time
+        H = Hypergraph(edgedict)
+        H.set_giant_threshold(giant_size)
+        start_time = time()
+        core = run(algo, H).core
+        giant_time = time() - start_time
+        assert core == core_base
+        print(algo, ': ', round(base_time, 2), 's without, ', round(giant_time, 2), 's with --giant ', giant_size)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 8)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    for j in range(random.randint(0, 2)):
+        edgedict[max(edgedict)+1] = (random.choice(edgedict[min(edgedict)]) if random.random()<0.5 else 'isolated'+str(j),)
+    check(edgedict, args.giant, verbose = args.verbose)
+
+check(dict(get_hg(args.dataset).edge_eid_iterator()), args.giant, verbose = True)
+if args.bench:
+    bench()
+print("All tests passed")
@@ -0,0 +1,75 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.hierarchy import CoreHierarchy
+from hgDecompose.utils import get_hg, get_random_hg
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def kcore_components(edgedict, core, k):
+    """ Connected components (vertex sets) of the strongly induced subhypergraph on {v: core(v) >= k}, by BFS """
+    V = set(v for v in core if core[v] >= k)
+    edges = [e for e in edgedict.values() if all(v in V for v in e)]
+    adj = {v: set() for v in V}
+    for e in edges:
+        for v in e:
+            adj[v].update(e)
+    components = []
+    visited = set()
+    for s in V:
+        if s in visited:
+            continue
+        visited.add(s)
+        comp = [s]
+        i = 0
+        while i < len(comp):
+            for u in adj[comp[i]]:
+                if u not in visited:
+                    visited.add(u)
+                    comp.append(u)
+            i += 1
+        components.append((frozenset(comp), sum(1 for e in edges if e[0] in comp)))
+    return components
+
+def check(edgedict, verbose = False):
+    """ Compares every level of CoreHierarchy against the components of the k-cores rebuilt per k """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(edgedict), verbose=False)
+    core = hgDecompose.core
+    start_time = time()
+    T = CoreHierarchy(Hypergraph(edgedict), core)
+    if verbose:
+        print('#nodes: ', T.get_num_nodes(), ' #roots: ', len(T.roots), ' time: ', time() - start_time)
+    for k in sorted(set(core.values())):
+        expected = set()
+        for comp, num_edges in kcore_components(edgedict, core, k):
+            expected.add((comp, num_edges))
+        found = set()
+        for v in core:
+            x = T.node_of(v, k)
+            if x is not None:
+                found.add((frozenset(T.members(x)), T.num_edges[x]))
+        assert expected == found, "components of the " + str(k) + "-core differ"
+    for x in range(T.get_num_nodes()):
+        assert T.size[x] == len(T.members(x))
+        assert all(core[v] == T.node_core[x] for v in T.representatives[x])
+        if T.parent[x] is not None:
+            assert T.node_core[T.parent[x]] < T.node_core[x]
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    check({e_id: list(e) for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}, verbose = args.verbose)
+
+check({e_id: list(e) for e_id, e in get_hg(args.dataset).edge_eid_iterator()}, verbose = True)
+print("All tests passed")
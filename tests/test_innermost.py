@@ -0,0 +1,57 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.optimizedGDecompose import HDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from copy import deepcopy
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-k", help="number of innermost cores", default=2, type=int)
+parser.add_argument("-s", "--param_s", help="parameter for top_down", default=1, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+args = parser.parse_args()
+
+def check(H, k, s, verbose = False):
+    """ Compares the innermost cores and the cores >= threshold against naiveNBR """
+    hgDecompose = HGDecompose()
+    start_time = time()
+    hgDecompose.naiveNBR(deepcopy(H), verbose=False)
+    base_time = time() - start_time
+    core_base = hgDecompose.core
+    members = {}
+    for v, c in core_base.items():
+        members.setdefault(c, set()).add(v)
+    expected = sorted(members, reverse = True)[:k]
+
+    hdecompose = HDecompose()
+    result = hdecompose.innermost_cores(deepcopy(H), k = k, s = s, verbose=False)
+    assert [c for c, _ in result] == expected, "Innermost cores are different in " + str(expected) + " & " + str([c for c, _ in result])
+    for c, vertices in result:
+        assert set(vertices) == members[c], str(c) + " :Members of the core are different"
+    if verbose:
+        print('innermost time: ', hdecompose.execution_time, ' naiveNBR time: ', base_time)
+
+    for threshold in expected:
+        hdecompose = HDecompose()
+        result = hdecompose.cores_at_least(deepcopy(H), threshold, verbose=False)
+        for v, c in core_base.items():
+            if c >= threshold:
+                assert result.get(v) == c, str(v)+" :Output core is different in " + str(c) + " & " + str(result.get(v))
+        for v in result:
+            assert core_base[v] >= threshold, str(v) + " is below the threshold"
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 20)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    for k in [1, 2, 3]:
+        check(Hg, k, random.randint(1, 3))
+
+check(get_hg(args.dataset), args.k, args.param_s, verbose = True)
+print("All tests passed")
@@ -0,0 +1,94 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.ArrayRep import local_upper_bound
+from hgDecompose.ExternalRep import HypergraphE, mmap_npz
+from hgDecompose import utils
+from hgDecompose.utils import get_binary_file, is_binary_file_current, load_binary_lub, get_random_hg
+import numpy as np
+import argparse
+import random
+import tempfile
+import os
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=20, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def write_text_file(edgedict, text_fname, mtime):
+    with open(text_fname, 'w') as f:
+        for e in edgedict.values():
+            f.write(','.join(e) + '\n')
+    os.utime(text_fname, (mtime, mtime))
+
+def expected_lub(edgedict):
+    H = Hypergraph(edgedict)
+    return local_upper_bound(H.init_nodes, H.init_nbr)
+
+def check(edgedict, dataset, verbose = False):
+    """
+    lub cache round trip: the lub read back from the binary dataset file (load_binary_lub) must equal the lub computed
+    in memory, and the file must be rebuilt when it is missing, older than the text dataset file or has no vertex CSR.
+    """
+    edgedict = {i: tuple(str(v) for v in e) for i, e in enumerate(edgedict.values())}
+    text_fname = utils.dataset_to_filename[dataset]
+    bin_fname = utils.get_binary_filename(dataset)
+    mtime = 1000000000
+    if os.path.isfile(bin_fname):
+        os.remove(bin_fname)
+    write_text_file(edgedict, text_fname, mtime)
+    assert not is_binary_file_current(dataset, text_fname), "missing binary file taken as current"
+
+    fname = get_binary_file(dataset)
+    assert fname == bin_fname and is_binary_file_current(dataset, text_fname)
+    lub = load_binary_lub(fname)
+    assert lub == expected_lub(edgedict), "cached lub differs"
+    assert HypergraphL(edgedict, lub = lub).lub == HypergraphL(edgedict).lub
+    H = Hypergraph(edgedict)
+    H.compute_Bounds()
+    assert Hypergraph(edgedict, lub = lub).lub == H.lub
+
+    # a current file is not rebuilt
+    os.utime(fname, (mtime + 10, mtime + 10))
+    get_binary_file(dataset)
+    assert os.path.getmtime(fname) == mtime + 10, "current binary file rebuilt"
+
+    # stale: the text file changed after the binary file was written
+    edgedict[len(edgedict)] = tuple(random.sample(sorted(expected_lub(edgedict)) + ['new'], 2))
+    write_text_file(edgedict, text_fname, mtime + 20)
+    assert not is_binary_file_current(dataset, text_fname), "stale binary file taken as current"
+    get_binary_file(dataset)
+    assert os.path.getmtime(fname) > mtime + 20 and is_binary_file_current(dataset, text_fname), "stale binary file not rebuilt"
+    assert load_binary_lub(fname) == expected_lub(edgedict), "rebuilt lub differs"
+
+    # older format without the vertex CSR
+    arrays = {name: np.array(a) for name, a in mmap_npz(fname).items() if name not in ['v_ptr', 'v_edges']}
+    np.savez(fname, **arrays)
+    assert not is_binary_file_current(dataset, text_fname), "binary file without vertex CSR taken as current"
+    try:
+        HypergraphE(fname)
+        assert False, "HypergraphE accepted a binary file without vertex CSR"
+    except RuntimeError:
+        pass
+    get_binary_file(dataset)
+    assert is_binary_file_current(dataset, text_fname)
+    assert load_binary_lub(fname) == expected_lub(edgedict)
+    if verbose:
+        print(len(lub), ' vertices, max lub ', max(lub.values()))
+
+with tempfile.TemporaryDirectory() as tmp:
+    # the binary dataset files of this test go to tmp
+    utils.binary_dataset_dir = os.path.join(tmp, '')
+    utils.dataset_to_filename['lub_cache_test'] = os.path.join(tmp, 'lub_cache_test.hyp')
+    for i in range(args.rand):
+        random.seed(i)
+        n = random.randint(5, 30)
+        Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+        edgedict = dict(Hg.edge_eid_iterator())
+        for j in range(random.randint(0, 2)):
+            edgedict[max(edgedict)+1] = (random.choice(edgedict[min(edgedict)]) if random.random()<0.5 else 'isolated'+str(j),)
+        check(edgedict, 'lub_cache_test', verbose = args.verbose)
+print("All tests passed")
@@ -0,0 +1,43 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from copy import deepcopy
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(H, verbose = False):
+    """ Compares the three cores of multi_core against naiveNBR, naiveDeg and naiveDeg on the clique graph """
+    hgDecompose = HGDecompose()
+    nbr_core, degree_core, graph_core = hgDecompose.multi_core(deepcopy(H), verbose=False)
+    if verbose:
+        print('variant time: ', hgDecompose.variant_time)
+
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(deepcopy(H), verbose=False)
+    assert nbr_core == hgDecompose.core, "nbr core differs"
+
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveDeg(deepcopy(H), verbose=False)
+    assert degree_core == hgDecompose.core, "degree core differs"
+
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveDeg(H.get_clique_graph(), verbose=False)
+    assert graph_core == hgDecompose.core, "graph core differs"
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    check(Hypergraph({e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}), verbose = args.verbose)
+
+check(get_hg(args.dataset), verbose = True)
+print("All tests passed")
@@ -0,0 +1,74 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.partitioned import partition_vertices, partition_edgedicts
+from hgDecompose.utils import get_hg, get_random_hg
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=20, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(edgedict, verbose = False):
+    """
+    partitioned_local_core must match naiveNBR for several part counts. The ghost copies (partition_edgedicts and
+    num_ghosts) are counted by brute force from the hyperedges, and comm_volume is bounded by the boundary vertices whose
+    value drops: at least one message per ghost copy of such a vertex, at most one per ghost copy and unit of drop.
+    """
+    H = Hypergraph(edgedict)
+    nodes = list(H.init_node_iterator())
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(H, verbose=False)
+    core_base = hgDecompose.core
+    for num_parts in [1, 2, 3, 4]:
+        L = HypergraphL(edgedict)
+        part = partition_vertices(L, num_parts)
+        assert sorted(part) == sorted(nodes) and set(part.values()) <= set(range(num_parts))
+        edgedicts, ghost_parts = partition_edgedicts(L, part, num_parts)
+
+        # brute force: hyperedge e is held by part p iff a member of e is owned by p, v has a ghost copy in every part
+        # holding one of its hyperedges without owning v
+        ghosts = {}
+        for p in range(num_parts):
+            held = {e_id: e for e_id, e in edgedict.items() if any(part[v] == p for v in e)}
+            assert edgedicts[p] == held, "part " + str(p) + ": hyperedges differ"
+            for e in held.values():
+                for v in e:
+                    if part[v] != p:
+                        ghosts.setdefault(v, set()).add(p)
+        assert ghost_parts == ghosts, "ghost copies differ"
+        num_ghosts = sum(len(parts) for parts in ghosts.values())
+
+        hgDecompose = HGDecompose()
+        hgDecompose.partitioned_local_core(HypergraphL(edgedict), num_parts = num_parts, verbose = False)
+        for v in nodes:
+            # vertices without neighbours have core 0
+            assert hgDecompose.core[v] == core_base.get(v, 0), \
+                str(num_parts) + " parts: " + str(v) + " :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(hgDecompose.core[v])
+        assert hgDecompose.num_ghosts == num_ghosts, "#ghost copies " + str(hgDecompose.num_ghosts) + " != " + str(num_ghosts)
+        lower = sum(len(ghosts[v]) for v in ghosts if L.lub[v] > core_base.get(v, 0))
+        upper = sum(len(ghosts[v]) * (L.lub[v] - core_base.get(v, 0)) for v in ghosts)
+        assert lower <= hgDecompose.comm_volume <= upper, \
+            "communication volume " + str(hgDecompose.comm_volume) + " not in [" + str(lower) + ", " + str(upper) + "]"
+        if num_parts == 1:
+            assert num_ghosts == 0 and hgDecompose.comm_volume == 0 and hgDecompose.num_rounds == 1
+        if verbose:
+            print(num_parts, ' parts: #ghost copies ', num_ghosts, ' #messages ', hgDecompose.comm_volume, ' #rounds ', hgDecompose.num_rounds)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    for j in range(random.randint(0, 2)):
+        edgedict[max(edgedict)+1] = (random.choice(edgedict[min(edgedict)]) if random.random()<0.5 else 'isolated'+str(j),)
+    check(edgedict, verbose = args.verbose)
+
+check(dict(get_hg(args.dataset).edge_eid_iterator()), verbose = True)
+print("All tests passed")
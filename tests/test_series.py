@@ -0,0 +1,52 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+import numpy as np
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-n", "--snapshots", help="Number of snapshots in the series", default=5, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def nested_masks(M, num_snapshots):
+    """ Snapshot i keeps all but the last i * M / num_snapshots hyperedges of a random order (as in gen_nested_hypergraph) """
+    order = list(range(M))
+    random.shuffle(order)
+    masks = []
+    for i in range(num_snapshots):
+        mask = np.zeros(M, dtype=bool)
+        mask[order[:M - (i * M) // num_snapshots]] = True
+        masks.append(mask)
+    return masks
+
+def check(edgedict, num_snapshots, verbose = False):
+    """ Compares snapshot_series_core on every snapshot against naiveNBR on that snapshot """
+    e_ids = list(edgedict)
+    masks = nested_masks(len(e_ids), num_snapshots)
+    hgDecompose = HGDecompose()
+    hgDecompose.snapshot_series_core(Hypergraph(edgedict), masks, verbose = verbose)
+    for i, mask in enumerate(masks):
+        base = HGDecompose()
+        base.naiveNBR(Hypergraph({e_ids[j]: edgedict[e_ids[j]] for j in np.flatnonzero(mask)}), verbose=False)
+        core = hgDecompose.series_core[i]
+        for v in base.core:
+            assert base.core[v] == core.get(v, 0), str(v)+" :Output core is different in " + str(base.core[v]) + " & " + str(core.get(v, 0))
+    if verbose:
+        print('series time: ', hgDecompose.series_time)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    check({e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}, random.randint(2, 6), verbose = args.verbose)
+
+random.seed(0)
+check(dict(get_hg(args.dataset).edge_eid_iterator()), args.snapshots, verbose = True)
+print("All tests passed")
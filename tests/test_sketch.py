@@ -0,0 +1,38 @@
+import sys
+sys.path.append("../")
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.ArrayRep import to_arrayhg
+from hgDecompose.sketch import HLLSketches
+from hgDecompose.utils import get_hg, get_arrayhg, get_random_hg, core_error_stats
+import numpy as np
+import argparse
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-p", "--precision", help="2^p registers per sketch", default=8, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=10, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+# Neighbourhood size estimates
+for i in range(args.rand):
+    A = to_arrayhg(get_random_hg(n = 1000, m = 100, edge_size_ub = 100, seed = i))
+    A.compute_nbr_csr()
+    sketches = HLLSketches(A, p = args.precision, seed = i)
+    rel_err = np.abs(sketches.nbrsize() - A.init_nbrsize) / np.maximum(A.init_nbrsize, 1)
+    if args.verbose:
+        print(i, ' mean rel error: ', rel_err.mean(), ' bound: ', sketches.relative_error)
+    assert rel_err.mean() <= sketches.relative_error, "Mean relative error " + str(rel_err.mean()) + " exceeds " + str(sketches.relative_error)
+
+# Approximate decomposition against naiveNBR
+hgDecompose = HGDecompose()
+hgDecompose.naiveNBR(get_hg(args.dataset), verbose=False)
+core_base = hgDecompose.core
+hgDecompose = HGDecompose()
+hgDecompose.approx_local_core(get_arrayhg(args.dataset), p = args.precision, verbose=args.verbose)
+stat = core_error_stats(core_base, hgDecompose.core)
+print(stat)
+print('time: ', hgDecompose.execution_time, ' #iterations: ', hgDecompose.max_n, ' error bound: ', hgDecompose.error_bound)
+assert stat['mean rel error'] <= 2 * hgDecompose.error_bound, "Mean relative error " + str(stat['mean rel error']) + " exceeds " + str(2 * hgDecompose.error_bound)
+print("All tests passed")
@@ -0,0 +1,57 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-b", "--batch", help="batch size of the stream", default=100, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check(edgedict, batch_size, verbose = False):
+    """ Streamed cores (generators and stream_cores) must match naiveNBR, in non-decreasing order; early stop must work """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(edgedict), verbose=False)
+    core_base = hgDecompose.core
+    for algo in ['naiveNBR', 'improvedNBR']:
+        hgDecompose = HGDecompose()
+        streams = [getattr(hgDecompose, algo + '_iter')(Hypergraph(edgedict), False), 
+                   HGDecompose().stream_cores(Hypergraph(edgedict), algo = algo, batch_size = batch_size, verbose = False)]
+        for stream in streams:
+            streamed = {}
+            prev = 0
+            for v, k in stream:
+                assert k >= prev, "cores are not streamed in non-decreasing order"
+                assert v not in streamed
+                prev = k
+                streamed[v] = k
+            assert streamed == core_base, algo + " streamed cores differ"
+
+    # early stop: only the cores below the median
+    threshold = sorted(core_base.values())[len(core_base) // 2]
+    hgDecompose = HGDecompose()
+    start_time = time()
+    stream = hgDecompose.stream_cores(Hypergraph(edgedict), batch_size = batch_size, verbose = False)
+    for v, k in stream:
+        if k >= threshold:
+            break
+        assert core_base[v] == k
+    stream.close()
+    if verbose:
+        print('early stop at core ', threshold, ' after ', len(hgDecompose.core), '/', len(core_base), ' vertices: ', time() - start_time)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    check({e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}, random.randint(1, 5), verbose = args.verbose)
+
+check(dict(get_hg(args.dataset).edge_eid_iterator()), args.batch, verbose = True)
+print("All tests passed")
@@ -0,0 +1,63 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.twins import compress_twins, twin_algos
+from hgDecompose.utils import get_hg, get_random_hg
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+args = parser.parse_args()
+
+def add_twins(edgedict, num_twins, num_singletons):
+    """
+    Adds num_twins copies of random vertices (a copy joins every hyperedge of its vertex) and num_singletons singleton
+    hyperedges, on random (possibly twin) vertices or on new vertices without neighbours.
+    """
+    edgedict = {e_id: list(e) for e_id, e in edgedict.items()}
+    nodes = sorted(set(v for e in edgedict.values() for v in e))
+    for i in range(num_twins):
+        v = random.choice(nodes)
+        for e in edgedict.values():
+            if v in e:
+                e.append(v + '_twin' + str(i))
+    e_id = max(edgedict) + 1
+    for i in range(num_singletons):
+        v = random.choice(nodes) if random.random() < 0.5 else 'isolated' + str(i)
+        edgedict[e_id] = [v]
+        e_id += 1
+    return {e_id: tuple(e) for e_id, e in edgedict.items()}
+
+def check(edgedict):
+    """ Twins must share incidences, and the twin-compressed cores of every algorithm must match naiveNBR """
+    H = Hypergraph(edgedict)
+    _edgedict, mult, rep = compress_twins(H)
+    assert sum(mult.values()) == len(rep) == H.get_N()
+    for v in rep:
+        assert set(H.inc_dict[v]) == set(H.inc_dict[rep[v]]), str(v) + " is not a twin of " + str(rep[v])
+    assert len(set(H.inc_dict[v] and tuple(sorted(H.inc_dict[v])) for v in mult)) == len(mult), "twins are not collapsed"
+
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(edgedict), verbose=False)
+    core_base = hgDecompose.core
+    for algo in twin_algos:
+        hgDecompose = HGDecompose()
+        hgDecompose.twin_compressed_core(Hypergraph(edgedict), algo = algo, verbose=False)
+        assert hgDecompose.num_twins_removed == len(rep) - len(mult)
+        for v in rep:
+            assert hgDecompose.core.get(v, 0) == core_base.get(v, 0), \
+                algo + ": " + str(v) + " :Output core is different in " + str(core_base.get(v, 0)) + " & " + str(hgDecompose.core.get(v, 0))
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 20)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    check(add_twins(dict(Hg.edge_eid_iterator()), random.randint(0, 4), random.randint(0, 3)))
+
+random.seed(0)
+check(add_twins(dict(get_hg(args.dataset).edge_eid_iterator()), 3, 2))
+print("All tests passed")
@@ -0,0 +1,70 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.utils import get_hg, get_random_hg
+from tests.verify_kcore import verify_cores
+from time import time
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-nt", "--nthreads", help="number of processes of the verifier", default=1, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def check_witness(H, cores, witness):
+    """ The witness must prove that cores is wrong """
+    v, k = witness['vertex'], witness['core']
+    assert cores[v] == k
+    if witness['property'] == 'lower bound':
+        assert len(witness['neighbours']) < k
+    else:
+        S = set(witness['subgraph']) | set(u for u in cores if cores[u] > k)
+        for u in witness['subgraph']:
+            nbrs = set()
+            for e in H.edge_iterator():
+                if u in e and all(w in S for w in e):
+                    nbrs.update(e)
+            assert len(nbrs) - 1 >= k + 1
+
+def check(edgedict, num_threads = 1, verbose = False):
+    """ Exact cores must pass, perturbed cores must fail with a valid witness """
+    H = Hypergraph(edgedict)
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(edgedict), verbose=False)
+    core = hgDecompose.core
+    start_time = time()
+    ok, witness = verify_cores(H, core, num_threads = num_threads)
+    assert ok, str(witness)
+    if verbose:
+        print('verification time: ', time() - start_time)
+    for v in random.sample(list(core), min(len(core), 3)):
+        for delta in [1, -1]:
+            if core[v] + delta < 0:
+                continue
+            wrong = dict(core)
+            wrong[v] += delta
+            ok, witness = verify_cores(H, wrong, num_threads = num_threads)
+            assert not ok, "wrong core of " + str(v) + " is not detected"
+            check_witness(H, wrong, witness)
+            if verbose:
+                print(v, ' ', core[v], ' -> ', wrong[v], ': ', witness['property'], ' violated at ', witness['vertex'])
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    edgedict = dict(Hg.edge_eid_iterator())
+    # singleton hyperedges, on vertices with neighbours and on vertices without any
+    nodes = sorted(set(v for e in edgedict.values() for v in e))
+    for j in range(random.randint(0, 3)):
+        edgedict['single' + str(j)] = (random.choice(nodes) if random.random() < 0.5 else 'isolated' + str(j),)
+    check(edgedict, verbose = args.verbose)
+
+random.seed(0)
+check(dict(get_hg(args.dataset).edge_eid_iterator()), num_threads = args.nthreads, verbose = True)
+print("All tests passed")
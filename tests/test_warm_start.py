@@ -0,0 +1,70 @@
+import sys
+sys.path.append("../")
+from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.IncidenceRep import HypergraphL
+from hgDecompose.optimizedhgDecompose import HGDecompose
+from hgDecompose.optimizedGDecompose import HDecompose
+from hgDecompose.utils import get_hg, get_random_hg, edge_diff
+import argparse
+import random
+
+# arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", "--dataset", type=str, default="default")
+parser.add_argument("-u", "--updates", help="Number of hyperedges deleted/inserted on the dataset", default=5, type=int)
+parser.add_argument("--rand", "--randomtest", help="Number of Random Hypergraph to test", default=50, type=int)
+parser.add_argument("-v", "--verbose", action='store_true')
+args = parser.parse_args()
+
+def perturb(edgedict, nodes, num_del, num_ins, max_size):
+    """ New version of edgedict with num_del random hyperedges deleted and num_ins random hyperedges inserted """
+    new_edgedict = dict(edgedict)
+    for e_id in random.sample(list(new_edgedict), min(num_del, len(new_edgedict) - 1)):
+        del new_edgedict[e_id]
+    for i in range(num_ins):
+        new_edgedict['ins' + str(i)] = random.sample(nodes, random.randint(2, max_size))
+    return new_edgedict
+
+def check(old_edgedict, new_edgedict, verbose = False):
+    """ Compares warm-started opt_local_core and top_down against naiveNBR on new_edgedict """
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(old_edgedict), verbose=False)
+    prior_core = hgDecompose.core
+    hgDecompose = HGDecompose()
+    hgDecompose.naiveNBR(Hypergraph(new_edgedict), verbose=False)
+    core_base = hgDecompose.core
+    deleted, inserted = edge_diff(old_edgedict, new_edgedict)
+
+    cold = HGDecompose()
+    cold.opt_local_core(HypergraphL(new_edgedict), verbose=False)
+    warm = HGDecompose()
+    warm.opt_local_core(HypergraphL(new_edgedict), verbose=False, prior_core=prior_core, deleted=deleted, inserted=inserted)
+    top_down = HDecompose()
+    top_down.top_down(Hypergraph(new_edgedict), verbose=False, prior_core=prior_core, deleted=deleted, inserted=inserted)
+    for v in core_base:
+        assert core_base[v] == warm.core[v], str(v)+" :Output core is different in " + str(core_base[v]) + " & " + str(warm.core[v])
+        assert core_base[v] == top_down.core[v], str(v)+" :Output core is different in " + str(core_base[v]) + " & " + str(top_down.core[v])
+    if verbose:
+        print('#deleted: ', len(deleted), ' #inserted: ', len(inserted))
+        print('opt_local_core iterations cold: ', cold.max_n, ' warm: ', warm.max_n)
+        print('opt_local_core time cold: ', cold.execution_time, ' warm: ', warm.execution_time)
+
+for i in range(args.rand):
+    random.seed(i)
+    n = random.randint(5, 30)
+    Hg = get_random_hg(n = n, m = random.randint(2, n), edge_size_ub = random.randint(2, min(n, 6)), seed = i)
+    old_edgedict = {e_id: e for e_id, e in Hg.edge_eid_iterator() if len(e) > 1}
+    nodes = sorted(set(v for e in old_edgedict.values() for v in e))
+    if len(nodes) < 2:
+        continue
+    # deletions only, insertions only, both
+    for num_del, num_ins in [(2, 0), (0, 2), (1, 1)]:
+        check(old_edgedict, perturb(old_edgedict, nodes, num_del, num_ins, min(len(nodes), 6)), verbose = args.verbose)
+
+H = get_hg(args.dataset)
+old_edgedict = dict(H.edge_eid_iterator())
+nodes = sorted(H.node_iterator())
+random.seed(0)
+for num_del, num_ins in [(args.updates, 0), (0, args.updates), (args.updates, args.updates)]:
+    check(old_edgedict, perturb(old_edgedict, nodes, num_del, num_ins, 4), verbose = True)
+print("All tests passed")
@@ -1,15 +1,20 @@
 from hgDecompose.Hypergraph import Hypergraph
+from hgDecompose.coreresult import CoreResult
 import math 
+from multiprocessing import Pool
 
 def construct_subgraph_from_core_number(H, k, cores):
     """ 
-    Construct subgraph k-core of H from threshold => k, given cores => dictionary of cores-computed
+    Construct subgraph k-core of H from threshold => k, given cores => dictionary of cores-computed (or a CoreResult 
+    indexed on H, then only the hyperedges of the k-core are visited)
     """
+    if isinstance(cores, CoreResult) and cores.H is H:
+        return cores.kcore(k)
     edges = {}
     for e_id, e in H.edge_eid_iterator():
         flag = True 
         for v in e:
-            if cores[v] < k:
+            if (cores[v] if v in cores else 0) < k:
                 flag = False 
                 break 
         if flag:
@@ -40,3 +45,120 @@ def verify_subgraph(H, threshold, cores):
             break 
     print(["Verification False","Verification True"][flag])
 
+
+# Shared by the worker processes of verify_cores (set once per process by _init_verifier)
+_verifier_state = {}
+
+def _init_verifier(edges, inc, edge_min, cores):
+    _verifier_state['edges'] = edges
+    _verifier_state['inc'] = inc
+    _verifier_state['edge_min'] = edge_min
+    _verifier_state['cores'] = cores
+
+def _check_lower_bound(vertices):
+    """ First vertex v of vertices with less than core(v) neighbours inside the core(v)-core, with a witness (None if none) """
+    edges, inc, edge_min, cores = _verifier_state['edges'], _verifier_state['inc'], _verifier_state['edge_min'], _verifier_state['cores']
+    for v in vertices:
+        k = cores[v]
+        if k == 0:
+            continue
+        nbrs = set()
+        for e_id in inc[v]:
+            if edge_min[e_id] >= k:
+                nbrs.update(edges[e_id])
+        nbrs.discard(v)
+        if len(nbrs) < k:
+            return {'vertex': v, 'property': 'lower bound', 'core': k, 'neighbours': sorted(nbrs, key=str)}
+    return None
+
+def _check_maximality(levels):
+    """ 
+    For every k in levels, peels the vertices with core k from the k-core with threshold k. A vertex can only be removed 
+    with at most k neighbours left, and only hyperedges with min core k can contain it, so nothing else is touched. 
+    Returns the first vertex that can not be removed, with the stuck vertices as witness (None if none).
+    """
+    edges, inc, edge_min, cores = _verifier_state['edges'], _verifier_state['inc'], _verifier_state['edge_min'], _verifier_state['cores']
+    for k, level in levels:
+        dead = set() # hyperedges containing a removed vertex
+
+        def num_nbrs(v):
+            nbrs = set()
+            for e_id in inc[v]:
+                if edge_min[e_id] == k and e_id not in dead:
+                    nbrs.update(edges[e_id])
+            return len(nbrs) - 1
+
+        remaining = set(level)
+        stack = [v for v in level if num_nbrs(v) <= k]
+        queued = set(stack)
+        while stack:
+            v = stack.pop()
+            remaining.remove(v)
+            for e_id in inc[v]:
+                if edge_min[e_id] == k and e_id not in dead:
+                    dead.add(e_id)
+                    for u in edges[e_id]:
+                        if u in remaining and u not in queued and num_nbrs(u) <= k:
+                            queued.add(u)
+                            stack.append(u)
+        if len(remaining):
+            stuck = [v for v in level if v in remaining]
+            return {'vertex': stuck[0], 'property': 'maximality', 'core': k, 'subgraph': stuck}
+    return None
+
+def verify_cores(H, cores, num_threads = 1, chunk_size = 10000):
+    """
+    Verifies a core-assignment for all thresholds in one sweep, using per-hyperedge minimum core values:
+        1) lower bound: every v has at least core(v) neighbours through hyperedges whose members all have core >= core(v),
+           so {v: core(v) >= k} is a k-subgraph for every k (cores <= true cores)
+        2) maximality: for every k, the vertices with core k are peeled away from the strongly induced subhypergraph on 
+           {v: core(v) >= k} with threshold k (cores >= true cores). Otherwise the stuck vertices have at least k + 1 
+           neighbours in it, so their core number is at least k + 1.
+    Vertex chunks (1) and groups of levels (2) are checked in num_threads processes.
+    Vertices missing from cores (e.g. vertices without neighbours, which the peeling algorithms do not assign) have core 0.
+    Returns (True, None) or (False, witness) => witness of the first violating vertex (vertex order, then increasing k).
+    """
+    assert isinstance(H, Hypergraph)
+    cores = {v: cores[v] if v in cores else 0 for v in H.node_iterator()}
+    edges = {}
+    edge_min = {}
+    for e_id, e in H.edge_eid_iterator():
+        edges[e_id] = e
+        edge_min[e_id] = min(cores[v] for v in e)
+    inc = {v: H.inc_dict[v] for v in H.node_iterator()}
+    vertices = [v for v in H.node_iterator()]
+    levels = {}
+    for v in vertices:
+        levels.setdefault(cores[v], []).append(v)
+
+    chunks = [vertices[i:i + chunk_size] for i in range(0, len(vertices), chunk_size)]
+    level_groups = []
+    group, group_size = [], 0
+    for k in sorted(levels):
+        group.append((k, levels[k]))
+        group_size += len(levels[k])
+        if group_size >= chunk_size:
+            level_groups.append(group)
+            group, group_size = [], 0
+    if len(group):
+        level_groups.append(group)
+
+    if num_threads > 1:
+        with Pool(num_threads, initializer=_init_verifier, initargs=(edges, inc, edge_min, cores)) as p:
+            for witness in p.imap(_check_lower_bound, chunks):
+                if witness is not None:
+                    return False, witness
+            for witness in p.imap(_check_maximality, level_groups):
+                if witness is not None:
+                    return False, witness
+    else:
+        _init_verifier(edges, inc, edge_min, cores)
+        for chunk in chunks:
+            witness = _check_lower_bound(chunk)
+            if witness is not None:
+                return False, witness
+        for group in level_groups:
+            witness = _check_maximality(group)
+            if witness is not None:
+                return False, witness
+    return True, None